@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+#
+# Net loading benchmark
+#
+# Usage:
+#   $ python -m benchmarks.bench_loading [amount of places]
+#
+
+
+"""Loading benchmark, times lexing, parsing and interpreting a big net"""
+
+
+# Standard packages
+import sys
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from benchmarks.common import generate_ring_annotation, measure
+from src.interpretation import Interpreter
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+def run_benchmark(size: int) -> None:
+    """Load a ring net with SIZE places and print timings of each phase"""
+    annotation = generate_ring_annotation(size)
+    tokens, lex_time = measure(Lexer().tokenize, annotation)
+    tree, parse_time = measure(Parser().parse, tokens)
+    interpreter = Interpreter()
+    _, interpret_time = measure(interpreter.interpret, tree)
+    print(f'places: {size}, transitions: {size}, awns: {2 * size}')
+    print(f'lex:       {lex_time:.3f} s')
+    print(f'parse:     {parse_time:.3f} s')
+    print(f'interpret: {interpret_time:.3f} s')
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
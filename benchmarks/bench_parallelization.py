@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+#
+# Parallelization benchmark
+#
+# Usage:
+#   $ python -m benchmarks.bench_parallelization [seconds per run]
+#
+
+
+"""Parallelization benchmark, speedup of ProcessPoolRunner with CPU bound transitions"""
+
+
+# Standard packages
+import sys
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from benchmarks.common import generate_ring_annotation
+from src.compilation import Compiler
+from src.parallelization import ProcessPoolRunner
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+# Constants
+PROCESSES = (1, 2, 4, 8)
+WORK_ITERATIONS = 20_000
+
+
+def busy_work(_: int) -> int:
+    """CPU bound transition work"""
+    return sum(range(WORK_ITERATIONS))
+
+
+def run_benchmark(seconds: float) -> None:
+    """Print firings per second and speedup per amount of processes"""
+    annotation = generate_ring_annotation(64, 32)
+    net = Compiler().compile(Parser().parse(Lexer().tokenize(annotation)))
+    print(f'{"processes":>10} {"firings/s":>12} {"speedup":>8}')
+    baseline = None
+    for processes in PROCESSES:
+        runner = ProcessPoolRunner(net, processes, busy_work)
+        rate = runner.run(duration=seconds) / seconds
+        baseline = baseline if baseline else rate
+        print(f'{processes:>10} {rate:>12.0f} {rate / baseline:>8.2f}')
+
+
+if __name__ == '__main__':
+    run_benchmark(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+# Scheduling benchmark
+#
+# Usage:
+#   $ python -m benchmarks.bench_scheduling [seconds per run]
+#
+
+
+"""Scheduling benchmark, thread per transition against a thread pool"""
+
+
+# Standard packages
+import itertools
+import sys
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from benchmarks.common import generate_ring_annotation
+from src.parsing import Parser
+from src.scheduling import ThreadPoolScheduler
+from src.tokenization import Lexer
+import src.interpretation as interpretation
+
+# Constants
+SIZES = (10, 100, 1000)
+WORKERS = (1, 2, 4, 8)
+
+
+def build_transitions(size: int) -> tuple:
+    """Return (transitions, threads) of a ring net with SIZE places, half marked"""
+    annotation = generate_ring_annotation(size, size // 2)
+    interpreter = interpretation.Interpreter()
+    threads = interpreter.interpret(Parser().parse(Lexer().tokenize(annotation)))
+    return interpreter.transitions_references, threads
+
+
+def count_firings(seconds: float, start, stop) -> int:
+    """Return firings done in SECONDS between START and STOP callbacks"""
+    counter = itertools.count()
+    original = interpretation.ThreadedTransition.critical_section
+    interpretation.ThreadedTransition.critical_section = lambda self: next(counter)
+    try:
+        start()
+        time.sleep(seconds)
+        fired = next(counter)
+        stop()
+    finally:
+        interpretation.ThreadedTransition.critical_section = original
+    return fired
+
+
+def run_threads(size: int, seconds: float) -> int:
+    """Return firings of thread per transition model"""
+    transitions, threads = build_transitions(size)
+    def start():
+        for thread in threads:
+            thread.start()
+    def stop():
+        for transition in transitions:
+            transition.stop()
+        for thread in threads:
+            thread.join()
+    return count_firings(seconds, start, stop)
+
+
+def run_pool(size: int, workers: int, seconds: float) -> int:
+    """Return firings of thread pool model"""
+    transitions, _ = build_transitions(size)
+    scheduler = ThreadPoolScheduler(transitions, workers)
+    return count_firings(seconds, scheduler.start, scheduler.stop)
+
+
+def run_benchmark(seconds: float) -> None:
+    """Print firings per second of each model running SECONDS"""
+    print(f'{"transitions":>12} {"model":<16} {"firings/s":>12}')
+    for size in SIZES:
+        fired = run_threads(size, seconds)
+        print(f'{size:>12} {"threads":<16} {fired / seconds:>12.0f}')
+        for workers in WORKERS:
+            fired = run_pool(size, workers, seconds)
+            print(f'{size:>12} {f"pool({workers})":<16} {fired / seconds:>12.0f}')
+
+
+if __name__ == '__main__':
+    run_benchmark(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
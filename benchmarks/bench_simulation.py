@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+#
+# Simulation benchmark
+#
+# Usage:
+#   $ python -m benchmarks.bench_simulation [amount of firings] [ring size]
+#
+
+
+"""Simulation benchmark, firings per second of TokenGameEngine"""
+
+
+# Standard packages
+import glob
+import sys
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from benchmarks.common import generate_ring_annotation, measure
+from src.compilation import Compiler
+from src.parsing import Parser
+from src.simulation import (
+    RandomPolicy, RoundRobinPolicy, TokenGameEngine,
+)
+from src.tokenization import Lexer
+
+
+def get_nets(ring_size: int):
+    """Yield (name, CompiledNet) of every example and a big ring net"""
+    for path in sorted(glob.glob('docs/examples/*.pn')):
+        with open(path, encoding='UTF-8') as f:
+            yield path, Compiler().compile(Parser().parse(Lexer().tokenize_stream(f)))
+    annotation = generate_ring_annotation(ring_size, tokens=10)
+    yield f'ring of {ring_size}', Compiler().compile(Parser().parse(Lexer().tokenize(annotation)))
+
+
+def run_benchmark(firings: int, ring_size: int) -> None:
+    """Run every net up to FIRINGS firings per policy"""
+    print(f'{"net":<40} {"policy":<12} {"firings":>10} {"firings/s":>12}')
+    for path, net in get_nets(ring_size):
+        for policy in (RandomPolicy(0), RoundRobinPolicy()):
+            engine = TokenGameEngine(net, policy)
+            fired, elapsed = measure(engine.run, firings)
+            print(
+                f'{path:<40} {type(policy).__name__:<12} {fired:>10} '
+                f'{fired / elapsed if elapsed else 0:>12.0f}'
+            )
+
+
+if __name__ == '__main__':
+    run_benchmark(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    )
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+#
+# Streaming tokenization benchmark
+#
+# Usage:
+#   $ python -m benchmarks.bench_streaming [max amount of places]
+#
+
+
+"""Streaming benchmark, shows Lexer memory peak does not grow with file size"""
+
+
+# Standard packages
+import os
+import sys
+import tempfile
+import tracemalloc
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from benchmarks.common import (
+    format_bytes, measure, write_ring_annotation,
+)
+from src.tokenization import Lexer
+
+# Constants
+SIZES = (1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def count_streamed_tokens(path: str) -> int:
+    """Return amount of tokens in file at PATH reading it by chunks"""
+    with open(path, encoding='UTF-8') as stream:
+        return sum(1 for _ in Lexer().tokenize_stream(stream))
+
+
+def run_benchmark(max_size: int) -> None:
+    """Stream nets up to MAX_SIZE places and print memory peaks"""
+    print(f'{"file":>10} {"tokens":>12} {"seconds":>10} {"peak":>10}')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'net.pn')
+        for size in SIZES:
+            if size > max_size:
+                break
+            with open(path, 'w', encoding='UTF-8') as stream:
+                write_ring_annotation(stream, size)
+            tokens, elapsed = measure(count_streamed_tokens, path)
+            # Traced separately, tracemalloc slows down allocations a lot
+            tracemalloc.start()
+            count_streamed_tokens(path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f'{format_bytes(os.path.getsize(path)):>10} {tokens:>12} '
+                f'{elapsed:>10.4f} {format_bytes(peak):>10}'
+            )
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+#
+# Tokenization benchmark
+#
+# Usage:
+#   $ python -m benchmarks.bench_tokenization [max size in bytes]
+#
+
+
+"""Tokenization benchmark, shows Lexer scales linearly with input size"""
+
+
+# Standard packages
+import sys
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from benchmarks.common import (
+    format_bytes, generate_annotation_of_bytes, measure,
+)
+from src.tokenization import Lexer
+
+# Constants
+SIZES = (
+    1024,
+    10 * 1024,
+    100 * 1024,
+    1024 ** 2,
+    10 * 1024 ** 2,
+    100 * 1024 ** 2,
+)
+
+
+def count_tokens(annotation: str) -> int:
+    """Return amount of tokens in ANNOTATION without keeping them"""
+    return sum(1 for _ in Lexer().generate_tokens(annotation))
+
+
+def run_benchmark(max_size: int) -> None:
+    """Tokenize inputs up to MAX_SIZE bytes and print timings"""
+    print(f'{"size":>10} {"tokens":>12} {"seconds":>10} {"ns/byte":>10}')
+    for size in SIZES:
+        if size > max_size:
+            break
+        annotation = generate_annotation_of_bytes(size)
+        tokens, elapsed = measure(count_tokens, annotation)
+        print(
+            f'{format_bytes(len(annotation)):>10} {tokens:>12} '
+            f'{elapsed:>10.4f} {elapsed * 1e9 / len(annotation):>10.1f}'
+        )
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1])
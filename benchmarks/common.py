@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+#
+# Benchmarks common module
+#
+
+
+"""Benchmarks common module"""
+
+
+# Standard packages
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src import generation
+
+
+def generate_ring_annotation(size: int, tokens: int=1) -> str:
+    """Return annotation of a ring net with SIZE places and transitions"""
+    return generation.generate_annotation(generation.ring(size, tokens))
+
+
+def write_ring_annotation(stream, size: int) -> None:
+    """Write to STREAM a ring net with SIZE places without building it in memory"""
+    generation.write_annotation(stream, generation.ring(size))
+
+
+def generate_annotation_of_bytes(target_bytes: int) -> str:
+    """Return ring net annotation with roughly TARGET_BYTES length"""
+    sample = generate_ring_annotation(1000)
+    size = max(1, target_bytes * 1000 // len(sample))
+    return generate_ring_annotation(size)
+
+
+def measure(function, *args) -> tuple:
+    """Return (result, elapsed seconds) of calling FUNCTION with ARGS"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def format_bytes(amount: int) -> str:
+    """Return human readable AMOUNT of bytes"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if amount < 1024 or unit == 'GB':
+            return f'{amount:.1f} {unit}'
+        amount /= 1024
+    return f'{amount:.1f} GB'
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
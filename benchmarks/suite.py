@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+#
+# Benchmark suite
+#
+# Usage:
+#   $ python -m benchmarks.suite [--output results.json] [--sizes 100,1000]
+#   $ python -m benchmarks.suite --compare old.json new.json
+#
+
+
+"""Benchmark suite, stores loading and firing throughput results as JSON"""
+
+
+# Standard packages
+import argparse
+import asyncio
+import datetime
+import glob
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Installed packages
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Local packages
+from benchmarks.common import generate_ring_annotation, measure
+from src.asynchronous import AsyncRunner
+from src.batching import BatchEngine
+from src.compilation import Compiler
+import src.interpretation as interpretation
+from src.parallelization import ProcessPoolRunner
+from src.parsing import Parser
+from src.scheduling import ThreadPoolScheduler
+from src.simulation import RandomPolicy, TokenGameEngine
+from src.tokenization import Lexer
+
+# Constants
+SIZES = (100, 1_000, 10_000, 100_000)
+FIRING_SIZES = (10, 100, 1_000)
+BATCH_MARKINGS = 1024
+# Relative change reported as regression by --compare
+TOLERANCE = 0.1
+
+
+def get_commit() -> str:
+    """Return current git commit hash, None outside a git repository"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_environment() -> dict:
+    """Return commit, interpreter and machine running the suite"""
+    return {
+        'commit': get_commit(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': numpy.__version__ if numpy else None,
+    }
+
+
+def get_peak_memory(function, *args) -> int:
+    """Return peak of bytes allocated while calling FUNCTION with ARGS"""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def load(annotation: str) -> tuple:
+    """Return (tokens, tree, interpreter) of ANNOTATION"""
+    tokens = Lexer().tokenize(annotation)
+    tree = Parser().parse(tokens)
+    interpreter = interpretation.Interpreter()
+    interpreter.interpret(tree)
+    return tokens, tree, interpreter
+
+
+def bench_loading(name: str, annotation: str) -> dict:
+    """Return wall time of each loading phase and memory peak of ANNOTATION"""
+    tokens, lex_time = measure(Lexer().tokenize, annotation)
+    tree, parse_time = measure(Parser().parse, tokens)
+    net, compile_time = measure(Compiler().compile, tree)
+    _, interpret_time = measure(interpretation.Interpreter().interpret, tree)
+    return {
+        'net': name,
+        'bytes': len(annotation.encode('UTF-8')),
+        'places': net.places_count,
+        'transitions': net.transitions_count,
+        'awns': len(net.pre_places) + len(net.post_places),
+        'lex_seconds': lex_time,
+        'parse_seconds': parse_time,
+        'compile_seconds': compile_time,
+        'interpret_seconds': interpret_time,
+        'peak_bytes': get_peak_memory(load, annotation),
+    }
+
+
+def count_threaded_firings(annotation: str, seconds: float, workers: int=None) -> int:
+    """Return firings of interpreted threads running SECONDS"""
+    counter = itertools.count()
+    interpreter = interpretation.Interpreter(
+        default_action=lambda transition: next(counter)
+    )
+    threads = interpreter.interpret(Parser().parse(Lexer().tokenize(annotation)))
+    scheduler = None
+    try:
+        if workers:
+            scheduler = ThreadPoolScheduler(interpreter.transitions_references, workers)
+            scheduler.start()
+        else:
+            for thread in threads:
+                thread.start()
+        time.sleep(seconds)
+        fired = next(counter)
+    finally:
+        interpreter.stop()
+        if scheduler:
+            scheduler.stop()
+        for thread in threads:
+            if thread.is_alive():
+                thread.join()
+    return fired
+
+
+def count_async_firings(annotation: str, seconds: float) -> int:
+    """Return firings of AsyncRunner running SECONDS"""
+    interpreter = interpretation.Interpreter()
+    interpreter.interpret(Parser().parse(Lexer().tokenize(annotation)))
+    runner = AsyncRunner(interpreter.transitions_references)
+
+    async def run() -> int:
+        simulation = asyncio.create_task(runner.run())
+        await asyncio.sleep(seconds)
+        runner.stop()
+        return await simulation
+    return asyncio.run(run())
+
+
+def count_simulation_firings(net, seconds: float) -> int:
+    """Return firings of TokenGameEngine running about SECONDS"""
+    engine = TokenGameEngine(net, RandomPolicy(0))
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline and engine.run(10_000) == 10_000:
+        pass
+    return engine.firings
+
+
+def count_batch_firings(net, seconds: float) -> int:
+    """Return firings of BatchEngine over BATCH_MARKINGS markings in about SECONDS"""
+    engine = BatchEngine(net)
+    markings = engine.get_initial_markings(BATCH_MARKINGS)
+    fired = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        enabled = engine.get_enabled_mask(markings)
+        transitions = numpy.where(enabled.any(axis=1), enabled.argmax(axis=1), -1)
+        if (transitions < 0).all():
+            break
+        markings = engine.fire(markings, transitions)
+        fired += int((transitions >= 0).sum())
+    return fired
+
+
+def bench_firings(size: int, seconds: float) -> list:
+    """Return firings per second of every execution mode on a ring of SIZE"""
+    annotation = generate_ring_annotation(size, max(1, size // 2))
+    net = Compiler().compile(Parser().parse(Lexer().tokenize(annotation)))
+    modes = {
+        'simulation': lambda: count_simulation_firings(net, seconds),
+        'threads': lambda: count_threaded_firings(annotation, seconds),
+        'pool(4)': lambda: count_threaded_firings(annotation, seconds, 4),
+        'async': lambda: count_async_firings(annotation, seconds),
+        'processes(2)': lambda: ProcessPoolRunner(net, 2).run(duration=seconds),
+    }
+    if numpy is not None:
+        modes['batch'] = lambda: count_batch_firings(net, seconds)
+    results = []
+    for mode, count in modes.items():
+        fired, elapsed = measure(count)
+        results.append({
+            'net': f'ring({size})',
+            'transitions': size,
+            'mode': mode,
+            'firings': fired,
+            'seconds': elapsed,
+            'firings_per_second': fired / elapsed if elapsed else 0,
+        })
+    return results
+
+
+def run_suite(sizes: tuple, firing_sizes: tuple, seconds: float) -> dict:
+    """Run every benchmark, printing progress, return results"""
+    loading = []
+    for path in sorted(glob.glob('docs/examples/*.pn')):
+        with open(path, encoding='UTF-8') as f:
+            loading.append(bench_loading(path, f.read()))
+    for size in sizes:
+        print(f'Loading ring({size})...', file=sys.stderr)
+        loading.append(bench_loading(f'ring({size})', generate_ring_annotation(size)))
+    firings = []
+    for size in firing_sizes:
+        print(f'Firing ring({size})...', file=sys.stderr)
+        firings.extend(bench_firings(size, seconds))
+    return {
+        'environment': get_environment(),
+        'loading': loading,
+        'firings': firings,
+    }
+
+
+def get_metrics(results: dict) -> dict:
+    """Return {benchmark name: (value, higher is better)} of RESULTS"""
+    metrics = {}
+    for entry in results['loading']:
+        for phase in ('lex', 'parse', 'compile', 'interpret'):
+            metrics[f'{entry["net"]} {phase}'] = (entry[f'{phase}_seconds'], False)
+        metrics[f'{entry["net"]} peak'] = (entry['peak_bytes'], False)
+    for entry in results['firings']:
+        metrics[f'{entry["net"]} {entry["mode"]}'] = (entry['firings_per_second'], True)
+    return metrics
+
+
+def compare(old: dict, new: dict, tolerance: float=TOLERANCE) -> list:
+    """Return (name, old, new, ratio, regressed) of benchmarks in OLD and NEW"""
+    old_metrics = get_metrics(old)
+    rows = []
+    for name, (value, higher_is_better) in get_metrics(new).items():
+        if name not in old_metrics or not old_metrics[name][0]:
+            continue
+        ratio = value / old_metrics[name][0]
+        regressed = ratio < 1 - tolerance if higher_is_better else ratio > 1 + tolerance
+        rows.append((name, old_metrics[name][0], value, ratio, regressed))
+    return rows
+
+
+def print_comparison(old_path: str, new_path: str) -> bool:
+    """Print comparison of results files, return if nothing regressed"""
+    with open(old_path, encoding='UTF-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='UTF-8') as f:
+        new = json.load(f)
+    print(f'{old["environment"]["commit"]} => {new["environment"]["commit"]}')
+    print(f'{"benchmark":<48} {"old":>12} {"new":>12} {"ratio":>7}')
+    rows = compare(old, new)
+    for name, old_value, new_value, ratio, regressed in rows:
+        mark = ' REGRESSION' if regressed else ''
+        print(f'{name:<48} {old_value:>12.4g} {new_value:>12.4g} {ratio:>7.2f}{mark}')
+    return not any(row[4] for row in rows)
+
+
+def parse_arguments(arguments: list) -> argparse.Namespace:
+    """Parse command line ARGUMENTS"""
+    parser = argparse.ArgumentParser(description='Run Petri nets benchmark suite')
+    parser.add_argument(
+        '--output', default=None,
+        help='JSON results file (default: benchmark_<commit>.json)',
+    )
+    parser.add_argument(
+        '--sizes', default=','.join(map(str, SIZES)),
+        help='places of generated ring nets loaded',
+    )
+    parser.add_argument(
+        '--firing-sizes', default=','.join(map(str, FIRING_SIZES)),
+        help='transitions of generated ring nets fired',
+    )
+    parser.add_argument(
+        '--seconds', type=float, default=1.0,
+        help='seconds each execution mode runs',
+    )
+    parser.add_argument(
+        '--compare', nargs=2, metavar=('OLD', 'NEW'), default=None,
+        help='compare two results files instead of running',
+    )
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list) -> int:
+    """Run suite or compare results following ARGUMENTS, return exit status"""
+    args = parse_arguments(arguments)
+    if args.compare:
+        return 0 if print_comparison(*args.compare) else 1
+    results = run_suite(
+        tuple(int(size) for size in args.sizes.split(',') if size),
+        tuple(int(size) for size in args.firing_sizes.split(',') if size),
+        args.seconds
+    )
+    commit = results['environment']['commit']
+    output = args.output if args.output else f'benchmark_{(commit or "unknown")[:12]}.json'
+    with open(output, 'w', encoding='UTF-8') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    for entry in results['firings']:
+        print(f'{entry["net"]:<12} {entry["mode"]:<14} {entry["firings_per_second"]:>12.0f} firings/s')
+    print(f'Results written to {output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
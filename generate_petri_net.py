@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+#
+# Generates synthetic Petri nets annotations for load testing
+#
+
+
+"""Generates synthetic Petri nets annotations for load testing"""
+
+
+# Standard packages
+from src import generation
+import argparse
+import sys
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+sys.path.insert(0, './src/')
+
+
+def build_net(args: argparse.Namespace) -> generation.GeneratedNet:
+    """Return net of topology chosen in parsed ARGS"""
+    if args.topology == 'ring':
+        return generation.ring(args.size, args.tokens)
+    if args.topology == 'fork-join':
+        return generation.fork_join(args.branches, args.length, args.tokens)
+    if args.topology == 'pipeline':
+        return generation.pipeline(args.stages, args.capacity, args.tokens)
+    if args.topology == 'producer-consumer':
+        return generation.producer_consumer(
+            args.producers, args.consumers, args.capacity, args.buffers
+        )
+    return generation.random_net(
+        args.places, args.transitions, args.inputs, args.outputs,
+        args.max_weight, args.max_tokens, args.seed
+    )
+
+
+def parse_arguments(arguments: list) -> argparse.Namespace:
+    """Parse command line ARGUMENTS"""
+    parser = argparse.ArgumentParser(
+        description='Generate Petri nets annotations',
+        epilog='Example: $ python ./generate_petri_net.py ring --size 1000 -o ring.pn',
+    )
+    parser.add_argument(
+        '-o', '--output', default=None,
+        help='annotation file, standard output by default',
+    )
+    topologies = parser.add_subparsers(dest='topology', required=True)
+
+    ring = topologies.add_parser('ring', help='places and transitions in a cycle')
+    ring.add_argument('--size', type=int, default=100)
+    ring.add_argument('--tokens', type=int, default=1)
+
+    fork_join = topologies.add_parser('fork-join', help='parallel branches joined back')
+    fork_join.add_argument('--branches', type=int, default=4)
+    fork_join.add_argument('--length', type=int, default=1)
+    fork_join.add_argument('--tokens', type=int, default=1)
+
+    pipeline = topologies.add_parser('pipeline', help='stages with bounded buffers')
+    pipeline.add_argument('--stages', type=int, default=4)
+    pipeline.add_argument('--capacity', type=int, default=1)
+    pipeline.add_argument('--tokens', type=int, default=1)
+
+    producer_consumer = topologies.add_parser(
+        'producer-consumer', help='producers and consumers sharing bounded buffers'
+    )
+    producer_consumer.add_argument('--producers', type=int, default=2)
+    producer_consumer.add_argument('--consumers', type=int, default=2)
+    producer_consumer.add_argument('--capacity', type=int, default=1)
+    producer_consumer.add_argument('--buffers', type=int, default=1)
+
+    random_net = topologies.add_parser('random', help='random sparse net')
+    random_net.add_argument('--places', type=int, default=100)
+    random_net.add_argument('--transitions', type=int, default=100)
+    random_net.add_argument('--inputs', type=int, default=2)
+    random_net.add_argument('--outputs', type=int, default=2)
+    random_net.add_argument('--max-weight', type=int, default=1)
+    random_net.add_argument('--max-tokens', type=int, default=1)
+    random_net.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(arguments)
+
+
+if __name__ == '__main__':
+    args = parse_arguments(sys.argv[1:])
+    net = build_net(args)
+    if args.output:
+        with open(args.output, 'w', encoding='UTF-8') as f:
+            generation.write_annotation(f, net)
+    else:
+        generation.write_annotation(sys.stdout, net)
@@ -15,12 +15,25 @@
 
 # Standard packages
 from src.tokenization import Lexer
+from src.caching import NetCache
+from src.checking import StubbornSetChecker, parse_target
+from src.controller import RunController
 from src.parsing import Parser
+from src.compilation import Compiler
+from src.coverability import CoverabilityExplorer
+from src.invariants import InvariantsAnalyzer
+from src.actions import DelayAction
+from src.logger import DETAILED, FiringLogger
+from src.tracing import Trace, TraceRecorder
+from src.metrics import MetricsCollector, MetricsDumper
+from src.reachability import ReachabilityExplorer
 import src.interpretation as interpretation
+import argparse
+import json
 import sys
 
 # Installed packages
-import keyboard
+## NOTE: this is empty for now
 
 # Local packages
 sys.path.insert(0, './src/')
@@ -34,34 +47,338 @@ DEBUG = False
 ###############################################
 
 
-def run_petri_net(annotation: str) -> None:
-    """Run concurrent threads using Petri net ANNOTATION"""
-    # Process
-    tokens = Lexer().tokenize(annotation)
+def debug_tokens(tokens):
+    """Print TOKENS while passing them through"""
+    for token in tokens:
+        print(f'> {token.ttype}\t\t{token.tvalue}')
+        yield token
+
+
+def parse_petri_net(annotation):
+    """
+    Return Petri net ast parsed from ANNOTATION
+
+    ANNOTATION can be a string or a file object, files are
+    tokenized and parsed by chunks
+    """
+    if isinstance(annotation, str):
+        tokens = Lexer().generate_tokens(annotation)
+    else:
+        tokens = Lexer().tokenize_stream(annotation)
     if DEBUG:
-        for token in tokens:
-            print(f'> {token.ttype}\t\t{token.tvalue}')
-    tree = Parser().parse(tokens)
-    threads = interpretation.Interpreter().interpret(tree)
-    # Start
-    for thread in threads:
-        thread.start()
-    # Stop
-    while True:
-        if keyboard.is_pressed('a'):
-            print('Pressed key, stopping threads...')
-            interpretation.KEEP_RUNNING = False # workaround to stop threads, join doesnt works
-            break
+        tokens = debug_tokens(tokens)
+    return Parser().parse(tokens)
+
+
+def compile_petri_net(annotation, cache_path: str=None):
+    """
+    Return CompiledNet of Petri net ANNOTATION, with CACHE_PATH it is
+    kept in that cache directory, so later runs skip parsing
+    """
+    if cache_path is None:
+        return Compiler().compile(parse_petri_net(annotation))
+    if not isinstance(annotation, str):
+        annotation = annotation.read()
+    return NetCache(cache_path).compile(annotation)
+
+
+def load_petri_net(annotation, cache_path: str=None):
+    """Return Petri net ast of ANNOTATION, built from cache at CACHE_PATH if given"""
+    if cache_path is None:
+        return parse_petri_net(annotation)
+    return compile_petri_net(annotation, cache_path).to_petri_net_node()
+
+
+def explore_petri_net(
+        annotation,
+        order: str='bfs',
+        max_states: int=None,
+        graph_path: str=None,
+        cache_path: str=None
+        ) -> None:
+    """
+    Print reachability statistics of Petri net ANNOTATION as JSON
+
+    With GRAPH_PATH the reachability graph is written there, as
+    Graphviz DOT if it ends with '.dot' otherwise as JSON
+    """
+    net = compile_petri_net(annotation, cache_path)
+    explorer = ReachabilityExplorer(
+        net, order, max_states,
+        keep_graph=graph_path is not None,
+        progress=lambda result: print(f'Explored {result.states} states...', file=sys.stderr)
+    )
+    result = explorer.explore()
+    result.export_statistics(sys.stdout)
+    if graph_path:
+        with open(graph_path, 'w', encoding='UTF-8') as f:
+            if graph_path.endswith('.dot'):
+                result.export_dot(f)
+            else:
+                result.export_json(f)
+
+
+def analyze_petri_net(annotation, cache_path: str=None) -> None:
+    """Print P-semiflows, T-semiflows and places bounds of Petri net ANNOTATION as JSON"""
+    result = InvariantsAnalyzer(compile_petri_net(annotation, cache_path)).analyze()
+    json.dump(result.get_statistics(), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+def check_petri_net(
+        annotation,
+        target: str=None,
+        reduction: bool=True,
+        max_states: int=None,
+        cache_path: str=None
+        ):
+    """
+    Print as JSON the first deadlock of Petri net ANNOTATION, or the
+    first marking with the tokens of TARGET 'p1=0,p4=1', with the
+    firing sequence reaching it, return CheckResult
+
+    Independent transitions are not interleaved unless REDUCTION is
+    unset, see StubbornSetChecker
+    """
+    net = compile_petri_net(annotation, cache_path)
+    checker = StubbornSetChecker(
+        net, parse_target(net, target) if target else None, reduction, max_states
+    )
+    result = checker.check()
+    json.dump(result.get_statistics(), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return result
+
+
+def check_boundedness(tree, refuse: bool=False) -> bool:
+    """
+    Warn about places of Petri net TREE without tokens limit,
+    return False if there are some and REFUSE is set
+    """
+    result = CoverabilityExplorer(Compiler().compile(tree)).explore()
+    unbounded = result.get_unbounded_places()
+    if not unbounded:
+        return True
+    print(f'Unbounded places: {", ".join(unbounded)}', file=sys.stderr)
+    if refuse:
+        print('Refusing to run a Petri net with unbounded places', file=sys.stderr)
+        return False
+    return True
+
+
+def replay_petri_net(annotation, trace_path: str, cache_path: str=None) -> None:
+    """
+    Replay firings traced at TRACE_PATH on Petri net ANNOTATION,
+    printing one JSON line per firing with the marking it reached
+    """
+    net = compile_petri_net(annotation, cache_path)
+    trace = Trace(trace_path)
+    try:
+        for (timestamp, transition, thread), marking in trace.replay(net):
+            print(json.dumps({
+                'timestamp': timestamp,
+                'transition': net.get_transition_name(transition),
+                'thread': thread,
+                'marking': net.get_marking_dict(marking),
+            }))
+    finally:
+        trace.close()
+
+
+def save_trace(recorder, trace_path: str, tree, interpreter) -> None:
+    """
+    Save firings of RECORDER at TRACE_PATH with the marking before
+    the first one kept, taken back from places of INTERPRETER running
+    Petri net TREE, so runs longer than the recorder are replayable
+    """
+    net = Compiler().compile(tree)
+    marking = [0] * net.places_count
+    for place in interpreter.places_references:
+        marking[net.get_place_index(place.name)] = place.count()
+    recorder.save(trace_path, recorder.get_first_marking(net, marking))
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def run_petri_net(
+        annotation,
+        workers: int=None,
+        boundedness: str=None,
+        delay: float=0.5,
+        verbosity: int=DETAILED,
+        trace_path: str=None,
+        metrics_path: str=None,
+        metrics_interval: float=1.0,
+        cache_path: str=None,
+        max_firings: int=None,
+        seconds: float=None,
+        until_deadlock: bool=False
+        ):
+    """
+    Run concurrent threads using Petri net ANNOTATION, a string
+    or a file object
+
+    Each transition runs in its own thread, unless WORKERS is given,
+    then transitions are fired by a pool of WORKERS threads
+
+    BOUNDEDNESS 'warn' or 'refuse' checks that no place grows without
+    limit before running
+
+    Every firing holds its resources DELAY seconds and is logged
+    following VERBOSITY, with TRACE_PATH firings are traced there
+
+    With METRICS_PATH a metrics snapshot is appended there as a JSON
+    line every METRICS_INTERVAL seconds, with CACHE_PATH the compiled
+    net is cached there
+
+    Runs until MAX_FIRINGS firings, SECONDS seconds, a deadlock if
+    UNTIL_DEADLOCK or Ctrl+C, return RunResult, see RunController
+    """
+    # Process
+    tree = load_petri_net(annotation, cache_path)
+    if boundedness and not check_boundedness(tree, boundedness == 'refuse'):
+        sys.exit(1)
+    logger = FiringLogger(verbosity)
+    recorder = TraceRecorder() if trace_path else None
+    metrics = MetricsCollector() if metrics_path else None
+    interpreter = interpretation.Interpreter(
+        default_action=DelayAction(delay) if delay else None,
+        logger=logger,
+        recorder=recorder,
+        metrics=metrics
+    )
+    threads = interpreter.interpret(tree)
+    controller = RunController(interpreter, workers, max_firings, seconds, until_deadlock)
+    dumper = MetricsDumper(metrics, metrics_path, metrics_interval) if metrics else None
+    # Run
+    logger.start()
+    if dumper:
+        dumper.start()
+    try:
+        return controller.run(threads)
+    finally:
+        logger.stop()
+        if recorder:
+            save_trace(recorder, trace_path, tree, interpreter)
+        if dumper:
+            dumper.stop()
+
+
+def parse_arguments(arguments: list) -> argparse.Namespace:
+    """Parse command line ARGUMENTS"""
+    parser = argparse.ArgumentParser(
+        description='Run threads using Petri nets',
+        epilog='Example: $ python ./run_petri_net.py ./example_petri_net.pn '
+               '(Ctrl+C stops running)',
+    )
+    parser.add_argument('path', help='Petri net annotation file')
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help='fire transitions using a pool of WORKERS threads '
+             'instead of one thread per transition',
+    )
+    parser.add_argument(
+        '--delay', type=float, default=0.5,
+        help='seconds each firing holds its resources (default: 0.5)',
+    )
+    parser.add_argument(
+        '--verbosity', type=int, choices=(0, 1, 2), default=DETAILED,
+        help='0 logs nothing, 1 logs fired transitions, '
+             '2 logs moved tokens too (default: 2)',
+    )
+    parser.add_argument(
+        '--firings', type=int, default=None,
+        help='stop after FIRINGS firings',
+    )
+    parser.add_argument(
+        '--seconds', type=float, default=None,
+        help='stop after SECONDS seconds',
+    )
+    parser.add_argument(
+        '--until-deadlock', action='store_true',
+        help='stop once no transition is enabled nor firing',
+    )
+    parser.add_argument(
+        '--trace', default=None,
+        help='record last firings into binary trace file TRACE',
+    )
+    parser.add_argument(
+        '--metrics-file', default=None,
+        help='append runtime metrics as JSON lines to METRICS_FILE',
+    )
+    parser.add_argument(
+        '--metrics-interval', type=float, default=1.0,
+        help='seconds between metrics snapshots (default: 1.0)',
+    )
+    parser.add_argument(
+        '--cache', default=None,
+        help='keep compiled nets in directory CACHE, later runs of '
+             'the same annotation skip parsing',
+    )
+    parser.add_argument(
+        '--replay', default=None,
+        help='replay trace file REPLAY instead of running, '
+             'printing reached markings as JSON lines',
+    )
+    parser.add_argument(
+        '--boundedness', choices=('warn', 'refuse'), default=None,
+        help='build coverability tree before running, warn about '
+             'unbounded places or refuse to run',
+    )
+    parser.add_argument(
+        '--reachability', choices=('bfs', 'dfs'), default=None,
+        help='explore reachable markings instead of running, '
+             'printing statistics as JSON',
+    )
+    parser.add_argument(
+        '--invariants', action='store_true',
+        help='compute P and T semiflows and places bounds instead '
+             'of running, printing them as JSON',
+    )
+    parser.add_argument(
+        '--check', action='store_true',
+        help='search depth first for a deadlock instead of running, '
+             'printing the firing sequence reaching it as JSON',
+    )
+    parser.add_argument(
+        '--target', default=None,
+        help='with --check, search a marking with tokens TARGET '
+             'instead, e.g. p1=0,p4=1',
+    )
+    parser.add_argument(
+        '--no-reduction', action='store_true',
+        help='with --check, interleave independent transitions too, '
+             'to compare explored states',
+    )
+    parser.add_argument(
+        '--max-states', type=int, default=None,
+        help='stop reachability exploration or check after MAX_STATES markings',
+    )
+    parser.add_argument(
+        '--graph', default=None,
+        help='write reachability graph to GRAPH (.dot or JSON)',
+    )
+    return parser.parse_args(arguments)
 
 
 if __name__ == '__main__':
-    if len(sys.argv) <= 1:
-        print(
-            '\nRun threads using Petri nets\n\n'
-            'Usage:\n'
-            '- $ python ./run_petri_net.py ./example_petri_net.pn\n'
-        )
-    else:
-        with open(sys.argv[1], encoding='UTF-8') as f:
-            content = f.read()
-        run_petri_net(content)
+    args = parse_arguments(sys.argv[1:])
+    with open(args.path, encoding='UTF-8') as f:
+        if args.reachability:
+            explore_petri_net(
+                f, args.reachability, args.max_states, args.graph, args.cache
+            )
+        elif args.check or args.target:
+            check_petri_net(
+                f, args.target, not args.no_reduction, args.max_states, args.cache
+            )
+        elif args.invariants:
+            analyze_petri_net(f, args.cache)
+        elif args.replay:
+            replay_petri_net(f, args.replay, args.cache)
+        else:
+            result = run_petri_net(
+                f, args.workers, args.boundedness, args.delay, args.verbosity,
+                args.trace, args.metrics_file, args.metrics_interval, args.cache,
+                args.firings, args.seconds, args.until_deadlock
+            )
+            print(json.dumps(result.get_statistics(), indent=2))
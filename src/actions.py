@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+#
+# Actions module
+#
+
+
+"""Actions module"""
+
+
+# Standard packages
+import asyncio
+import random
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+## NOTE: this is empty for now
+
+
+def constant_duration(seconds: float):
+    """Return duration distribution always giving SECONDS"""
+    return lambda: seconds
+
+
+def uniform_duration(low: float, high: float, seed=None):
+    """Return duration distribution uniform between LOW and HIGH seconds"""
+    generator = random.Random(seed)
+    return lambda: generator.uniform(low, high)
+
+
+def exponential_duration(mean: float, seed=None):
+    """Return duration distribution exponential with MEAN seconds"""
+    generator = random.Random(seed)
+    return lambda: generator.expovariate(1 / mean)
+
+
+class DelayAction:
+    """
+    Transition action that keeps resources during a duration
+
+    DURATION is an amount of seconds or a distribution, a callable
+    without arguments returning seconds, sampled on every firing
+    """
+
+    def __init__(self, duration) -> None:
+        self.duration = duration if callable(duration) else constant_duration(duration)
+
+    def __call__(self, transition) -> None:
+        """Sleep a DURATION sample while TRANSITION fires"""
+        time.sleep(self.duration())
+
+
+class AsyncDelayAction(DelayAction):
+    """DelayAction for AsyncRunner, awaits instead of blocking the loop"""
+
+    async def __call__(self, transition) -> None:
+        """Await a DURATION sample while TRANSITION fires"""
+        await asyncio.sleep(self.duration())
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
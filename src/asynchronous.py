@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+#
+# Asynchronous module
+#
+
+
+"""Asynchronous module"""
+
+
+# Standard packages
+import asyncio
+import inspect
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+## NOTE: this is empty for now
+
+
+class AsyncRunner:
+    """
+    Runs Petri net transitions as coroutines of a single event loop
+
+    TRANSITIONS are the ThreadedTransition built by Interpreter, each
+    one becomes a task awaiting its input places to receive tokens,
+    so a single process can host a huge amount of transitions
+
+    Transition actions returning awaitables, like coroutine functions
+    or AsyncDelayAction, are awaited while resources are held
+    """
+
+    def __init__(self, transitions: list, firing_delay: float=0.0) -> None:
+        self.transitions = transitions
+        self.firing_delay = firing_delay
+        self.firings = 0
+        # Firings started, some may still be awaiting its delay
+        self.started = 0
+        self.max_firings = None
+        self.stop_on_deadlock = True
+        self.deadlocked = False
+        # Transitions blocked waiting for tokens and not woken up yet
+        self.blocked = set()
+        self.stopped = False
+        self.wakeups = {transition: asyncio.Event() for transition in transitions}
+        for transition in transitions:
+            for place in transition.input_places:
+                place.add_listener(self.get_wakeup_callback(transition))
+
+    def get_wakeup_callback(self, transition):
+        """Return callback that wakes up TRANSITION"""
+        return lambda: self.wake_up(transition)
+
+    def wake_up(self, transition) -> None:
+        """Unblock TRANSITION, its input places received tokens"""
+        self.blocked.discard(transition)
+        self.wakeups[transition].set()
+
+    def stop(self) -> None:
+        """Ask every transition coroutine to finish"""
+        self.stopped = True
+        for wakeup in self.wakeups.values():
+            wakeup.set()
+
+    async def run_transition(self, transition) -> None:
+        """Fire TRANSITION every time it is enabled until stopped"""
+        wakeup = self.wakeups[transition]
+        while not self.stopped:
+            if self.max_firings is not None and self.started >= self.max_firings:
+                break
+            wakeup.clear()
+            resources = transition.acquire_all_resources()
+            if resources is None:
+                self.blocked.add(transition)
+                # Single thread: nobody is firing if everybody is blocked
+                if len(self.blocked) == len(self.transitions) and self.stop_on_deadlock:
+                    self.deadlocked = True
+                    self.stop()
+                await wakeup.wait()
+                continue
+            self.started += 1
+            result = transition.critical_section()
+            if inspect.isawaitable(result):
+                await result
+            # Always yield, so other transitions get their turn
+            await asyncio.sleep(self.firing_delay)
+            transition.pass_all_resources(resources)
+            self.firings += 1
+            if self.max_firings is not None and self.firings >= self.max_firings:
+                self.stop()
+
+    async def run(self, max_firings: int=None, stop_on_deadlock: bool=True) -> int:
+        """
+        Run transitions until MAX_FIRINGS, deadlock or stop is called,
+        return amount of firings
+
+        Cancelling this coroutine stops every transition cleanly
+        """
+        self.max_firings = None if max_firings is None else self.firings + max_firings
+        self.stop_on_deadlock = stop_on_deadlock
+        self.stopped = False
+        self.deadlocked = False
+        self.started = self.firings
+        self.blocked.clear()
+        tasks = [
+            asyncio.create_task(self.run_transition(transition))
+            for transition in self.transitions
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self.stop()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self.firings
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
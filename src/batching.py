@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+#
+# Batching module
+#
+
+
+"""Batching module"""
+
+
+# Standard packages
+## NOTE: this is empty for now
+
+# Installed packages
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Local packages
+from src.compilation import CompiledNet
+
+
+class BatchEngine:
+    """
+    Fires Petri net transitions over many markings at once
+
+    Markings are numpy arrays of shape (N markings, P places), every
+    operation is vectorized over the N rows using the sparse pre and
+    post rows of the CompiledNet
+    """
+
+    def __init__(self, net: CompiledNet) -> None:
+        if numpy is None:
+            raise ImportError('numpy is required to use BatchEngine')
+        self.net = net
+        self.pre = self.load_sparse(net.pre_offsets, net.pre_places, net.pre_weights)
+        self.post = self.load_sparse(net.post_offsets, net.post_places, net.post_weights)
+        # Transitions without input places are always enabled
+        pre_offsets = self.pre[0]
+        lengths = numpy.diff(pre_offsets)
+        self.unconditional = lengths == 0
+        self.pre_starts = pre_offsets[:-1][~self.unconditional]
+
+    @staticmethod
+    def load_sparse(offsets, places, weights) -> tuple:
+        """Return sparse rows as numpy arrays"""
+        return (
+            numpy.asarray(offsets, dtype=numpy.int64),
+            numpy.asarray(places, dtype=numpy.int64),
+            numpy.asarray(weights, dtype=numpy.int64),
+        )
+
+    def get_initial_markings(self, amount: int):
+        """Return AMOUNT copies of the initial marking"""
+        marking = numpy.asarray(self.net.initial_marking, dtype=numpy.int64)
+        return numpy.tile(marking, (amount, 1))
+
+    def check_markings(self, markings):
+        """Return MARKINGS as a 2D int64 array, raise exception on wrong shape"""
+        markings = numpy.asarray(markings, dtype=numpy.int64)
+        if markings.ndim != 2 or markings.shape[1] != self.net.places_count:
+            raise Exception(
+                f'Markings must have shape (N, {self.net.places_count}), '
+                f'got {markings.shape}'
+            )
+        return markings
+
+    def get_enabled_mask(self, markings):
+        """Return boolean array (N markings, T transitions) of enabled transitions"""
+        markings = self.check_markings(markings)
+        _, places, weights = self.pre
+        result = numpy.ones(
+            (markings.shape[0], self.net.transitions_count), dtype=bool
+        )
+        if len(places):
+            # One column per input awn, then AND of columns of each transition
+            satisfied = markings[:, places] >= weights
+            result[:, ~self.unconditional] = numpy.logical_and.reduceat(
+                satisfied, self.pre_starts, axis=1
+            )
+        return result
+
+    @staticmethod
+    def apply_rows(markings, rows, transitions, sparse: tuple, sign: int) -> None:
+        """Add SIGN times the sparse rows of TRANSITIONS to MARKINGS ROWS in place"""
+        offsets, places, weights = sparse
+        starts = offsets[transitions]
+        lengths = offsets[transitions + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return
+        first_entry = numpy.cumsum(lengths) - lengths
+        entries = numpy.arange(total) + numpy.repeat(starts - first_entry, lengths)
+        # Places are unique inside each sparse row, no repeated (row, place)
+        markings[numpy.repeat(rows, lengths), places[entries]] += sign * weights[entries]
+
+    def fire(self, markings, transitions):
+        """
+        Return new markings firing TRANSITIONS[i] on MARKINGS[i]
+
+        TRANSITIONS holds one transition index per row, negative
+        values leave the row unchanged, raise exception if some
+        chosen transition is not enabled on its row
+        """
+        markings = self.check_markings(markings)
+        transitions = numpy.asarray(transitions, dtype=numpy.int64)
+        if transitions.shape != (markings.shape[0],):
+            raise Exception('Expected one transition per marking')
+        rows = numpy.flatnonzero(transitions >= 0)
+        chosen = transitions[rows]
+        enabled = self.get_enabled_mask(markings[rows])
+        if not enabled[numpy.arange(len(rows)), chosen].all():
+            raise Exception('Resources not available')
+        result = markings.copy()
+        self.apply_rows(result, rows, chosen, self.pre, -1)
+        self.apply_rows(result, rows, chosen, self.post, 1)
+        return result
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+#
+# Caching module
+#
+
+
+"""Caching module"""
+
+
+# Standard packages
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.compilation import INDEX_TYPECODE, CompiledNet, Compiler
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+# Bumped on every change of the compiled net file layout, so old
+# files are never loaded since their keys no longer match
+FORMAT_VERSION = 1
+
+# Compiled net file header: magic, version, places, transitions,
+# pre awns, post awns, names bytes, padded to keep arrays aligned
+HEADER = struct.Struct('<4sHxxqqqqq')
+MAGIC = b'PNCN'
+SUFFIX = '.pnc'
+
+# Default size limit of a cache directory, in bytes
+MAX_BYTES = 256 << 20
+
+# Bytes of every integer, arrays are stored as INDEX_TYPECODE
+ITEM_SIZE = struct.calcsize(INDEX_TYPECODE)
+
+
+def get_key(annotation: str) -> str:
+    """Return cache key of Petri net ANNOTATION, changes with FORMAT_VERSION too"""
+    digest = hashlib.sha256(f'{FORMAT_VERSION}\n'.encode('UTF-8'))
+    digest.update(annotation.encode('UTF-8'))
+    return digest.hexdigest()
+
+
+def write_compiled_net(stream, net: CompiledNet) -> None:
+    """
+    Write NET into binary STREAM: header, initial marking, pre and
+    post sparse rows as integer arrays and then names, one per line
+    """
+    names = '\n'.join(net.place_names + net.transition_names).encode('UTF-8')
+    stream.write(HEADER.pack(
+        MAGIC, FORMAT_VERSION, net.places_count, net.transitions_count,
+        len(net.pre_places), len(net.post_places), len(names)
+    ))
+    for values in (
+            net.initial_marking,
+            net.pre_offsets, net.pre_places, net.pre_weights,
+            net.post_offsets, net.post_places, net.post_weights):
+        stream.write(struct.pack(f'<{len(values)}{INDEX_TYPECODE}', *values))
+    stream.write(names)
+
+
+def load_compiled_net(path: str) -> CompiledNet:
+    """
+    Return compiled net stored at PATH by write_compiled_net, its
+    arrays are views of a memory map so nothing is copied
+
+    Raise exception if PATH is not a compiled net of FORMAT_VERSION
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise Exception(f'{path}: not a compiled net file')
+        magic, version, places, transitions, pre, post, names_size = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise Exception(f'{path}: not a compiled net file of version {FORMAT_VERSION}')
+        memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    lengths = (places, transitions + 1, pre, pre, transitions + 1, post, post)
+    if len(memory) != HEADER.size + sum(lengths) * ITEM_SIZE + names_size:
+        memory.close()
+        raise Exception(f'{path}: truncated compiled net file')
+    view = memoryview(memory)
+    arrays = []
+    offset = HEADER.size
+    for length in lengths:
+        arrays.append(view[offset:offset + length * ITEM_SIZE].cast(INDEX_TYPECODE))
+        offset += length * ITEM_SIZE
+    names = bytes(view[offset:]).decode('UTF-8').split('\n') if names_size else []
+    return CompiledNet(
+        names[:places], names[places:], arrays[0],
+        tuple(arrays[1:4]), tuple(arrays[4:7])
+    )
+
+
+def compile_annotation(annotation: str) -> CompiledNet:
+    """Return ANNOTATION lexed, parsed and compiled"""
+    return Compiler().compile(Parser().parse(Lexer().generate_tokens(annotation)))
+
+
+class NetCache:
+    """
+    Directory of compiled nets named by the key of their annotation
+
+    Changing an annotation changes its key, so stale entries are never
+    loaded, they are evicted least recently used first once the
+    directory holds more than MAX_BYTES
+    """
+
+    def __init__(self, directory: str, max_bytes: int=MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        """Return path of entry KEY"""
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, annotation: str) -> CompiledNet:
+        """Return cached compiled net of ANNOTATION, None if it is missing"""
+        path = self.get_path(get_key(annotation))
+        try:
+            net = load_compiled_net(path)
+        except FileNotFoundError:
+            return None
+        except Exception: # pylint: disable=broad-except
+            # Broken entries are dropped and compiled again
+            self.remove(path)
+            return None
+        # Modification time is the last use, see evict
+        os.utime(path)
+        return net
+
+    def store(self, annotation: str, net: CompiledNet) -> str:
+        """Store NET compiled from ANNOTATION, return its path"""
+        path = self.get_path(get_key(annotation))
+        # Written aside and renamed, so readers never see partial files
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                write_compiled_net(f, net)
+            os.replace(temporary, path)
+        except BaseException:
+            self.remove(temporary)
+            raise
+        self.evict()
+        return path
+
+    def compile(self, annotation: str) -> CompiledNet:
+        """Return compiled net of ANNOTATION, compiling and storing it on misses"""
+        net = self.load(annotation)
+        if net is None:
+            net = compile_annotation(annotation)
+            self.store(annotation, net)
+        return net
+
+    def get_entries(self) -> list:
+        """Return (last use, size, path) of every entry, least recently used first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self) -> list:
+        """Remove least recently used entries above MAX_BYTES, return their paths"""
+        entries = self.get_entries()
+        size = sum(entry[1] for entry in entries)
+        removed = []
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            self.remove(path)
+            size -= entry_size
+            removed.append(path)
+        return removed
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """Remove file at PATH if it still exists"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+#
+# Checking module
+#
+
+
+"""Checking module"""
+
+
+# Standard packages
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.compilation import CompiledNet
+from src.reachability import pack_marking
+
+
+# Properties searched by a check
+DEADLOCK = 'deadlock'
+TARGET = 'target'
+
+
+def parse_target(net: CompiledNet, text: str) -> dict:
+    """
+    Return {place index: tokens} of TEXT 'p1=0,p4=1', places not
+    listed may have any tokens, raise exception on unknown places
+    """
+    target = {}
+    for item in text.split(','):
+        name, _, tokens = item.partition('=')
+        name = name.strip()
+        if name not in net.place_indexes:
+            raise Exception(f'Unknown place {name} in target marking')
+        try:
+            target[net.get_place_index(name)] = int(tokens)
+        except ValueError as error:
+            raise Exception(f'Invalid tokens of place {name} in target marking') from error
+    return target
+
+
+class CheckResult:
+    """Outcome of a check, with the firing sequence reaching what was found"""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, net: CompiledNet, prop: str, reduction: bool) -> None:
+        self.net = net
+        self.prop = prop
+        self.reduction = reduction
+        self.found = False
+        self.sequence = []
+        self.marking = None
+        self.states = 0
+        self.edges = 0
+        # States fully expanded because of the cycle proviso
+        self.expanded = 0
+        self.complete = False
+        self.stop_reason = None
+        self.elapsed = 0.0
+
+    def get_sequence_names(self) -> list:
+        """Return names of transitions of the firing sequence"""
+        return [self.net.get_transition_name(transition) for transition in self.sequence]
+
+    def get_statistics(self) -> dict:
+        """Return JSON serializable statistics"""
+        return {
+            'property': self.prop,
+            'found': self.found,
+            'sequence': self.get_sequence_names(),
+            'marking': self.net.get_marking_dict(self.marking) if self.found else None,
+            'reduction': self.reduction,
+            'states': self.states,
+            'edges': self.edges,
+            'expanded': self.expanded,
+            'complete': self.complete,
+            'stop_reason': self.stop_reason,
+            'seconds': round(self.elapsed, 6),
+        }
+
+
+class StubbornSetChecker:
+    """
+    Searches markings of a CompiledNet depth first for a deadlock, or
+    for a marking with the tokens of TARGET {place index: tokens},
+    stopping at the first one found
+
+    With REDUCTION only the enabled transitions of a stubborn set are
+    fired from each marking, transitions outside it cannot disable nor
+    enable it, so their interleavings are not explored again:
+
+    - an enabled member brings every transition consuming from its
+      input places, the ones able to disable it or be disabled by it
+    - a disabled member brings the transitions producing into one of
+      its input places lacking tokens, the only ones able to enable it
+
+    Every deadlock is kept this way, searching TARGET the transitions
+    changing target places join the set together, and markings whose
+    set leads back into the search stack fire every enabled transition,
+    so no transition is postponed forever along a cycle (proviso C3)
+
+    Search stops after MAX_STATES states
+    """
+
+    def __init__(
+            self,
+            net: CompiledNet,
+            target: dict=None,
+            reduction: bool=True,
+            max_states: int=None
+            ) -> None:
+        self.net = net
+        self.target = target
+        self.reduction = reduction
+        self.max_states = max_states
+        transitions = range(net.transitions_count)
+        self.presets = [tuple(net.get_preset(t)) for t in transitions]
+        self.changes = [net.get_changes(t) for t in transitions]
+        self.conflicts = [
+            tuple(sorted({
+                consumer for place, _ in preset for consumer in net.get_consumers(place)
+            }))
+            for preset in self.presets
+        ]
+        self.producers = [[] for _ in range(net.places_count)]
+        for transition, changes in enumerate(self.changes):
+            for place, delta in changes:
+                if delta > 0:
+                    self.producers[place].append(transition)
+        # Transitions changing tokens of target places
+        self.visible = {
+            transition for transition, changes in enumerate(self.changes)
+            if target and any(place in target for place, _ in changes)
+        }
+
+    def is_enabled(self, marking: list, transition: int) -> bool:
+        """Check that MARKING has enough tokens to fire TRANSITION"""
+        for place, weight in self.presets[transition]:
+            if marking[place] < weight:
+                return False
+        return True
+
+    def fire(self, marking: list, transition: int) -> list:
+        """Return marking reached firing TRANSITION from MARKING"""
+        successor = marking.copy()
+        for place, delta in self.changes[transition]:
+            successor[place] += delta
+        return successor
+
+    def is_found(self, marking: list, enabled: list) -> bool:
+        """Check that MARKING, where ENABLED transitions are enabled, is searched"""
+        if self.target is None:
+            return not enabled
+        return all(marking[place] == tokens for place, tokens in self.target.items())
+
+    def get_stubborn_set(self, marking: list, seeds) -> set:
+        """Return stubborn set of MARKING grown from SEEDS, some of them enabled"""
+        stubborn = set(seeds)
+        pending = list(stubborn)
+        while pending:
+            transition = pending.pop()
+            if self.is_enabled(marking, transition):
+                added = self.conflicts[transition]
+            else:
+                # Input place lacking tokens with fewest producers
+                added = min(
+                    (self.producers[place] for place, weight in self.presets[transition]
+                     if marking[place] < weight),
+                    key=len
+                )
+            for other in added:
+                if other not in stubborn:
+                    stubborn.add(other)
+                    pending.append(other)
+        return stubborn
+
+    def get_fired(self, marking: list, enabled: list) -> list:
+        """
+        Return transitions of ENABLED fired from MARKING, the enabled
+        ones of the stubborn set firing fewest
+        """
+        if not self.reduction or len(enabled) < 2:
+            return enabled
+        fired = enabled
+        for seed in enabled:
+            stubborn = self.get_stubborn_set(marking, (seed,))
+            candidate = [transition for transition in enabled if transition in stubborn]
+            if not self.visible.isdisjoint(candidate):
+                # Visible transitions never fire out of their order
+                stubborn = self.get_stubborn_set(marking, (seed, *self.visible))
+                candidate = [transition for transition in enabled if transition in stubborn]
+            if len(candidate) < len(fired):
+                fired = candidate
+                if len(fired) == 1:
+                    break
+        return fired
+
+    def get_successors(self, marking: list, enabled: list, on_stack: set) -> tuple:
+        """
+        Return (transition, successor, key) fired from MARKING and if
+        every ENABLED transition fired, which happens searching a
+        target when some successor key is in ON_STACK (proviso C3)
+        """
+        fired = self.get_fired(marking, enabled)
+        successors = []
+        for transition in fired:
+            successor = self.fire(marking, transition)
+            successors.append((transition, successor, pack_marking(successor)))
+        if self.target is None or len(fired) == len(enabled) \
+                or not any(key in on_stack for _, _, key in successors):
+            return successors, False
+        for transition in enabled:
+            if transition not in fired:
+                successor = self.fire(marking, transition)
+                successors.append((transition, successor, pack_marking(successor)))
+        return successors, True
+
+    def check(self, marking: list=None) -> CheckResult:
+        """Search markings reachable from MARKING, initial one by default"""
+        start = time.perf_counter()
+        result = CheckResult(
+            self.net, DEADLOCK if self.target is None else TARGET, self.reduction
+        )
+        initial = list(marking if marking is not None else self.net.initial_marking)
+        visiting = (initial, pack_marking(initial))
+        visited = {visiting[1]}
+        result.states = 1
+        # Frames of (marking key, successors iterator), sequence has
+        # the transition reaching every frame but the first one
+        stack = []
+        on_stack = set()
+        sequence = []
+        while visiting or stack:
+            if visiting:
+                current, key = visiting
+                visiting = None
+                enabled = [
+                    transition for transition in range(self.net.transitions_count)
+                    if self.is_enabled(current, transition)
+                ]
+                if self.is_found(current, enabled):
+                    result.found = True
+                    result.sequence = sequence
+                    result.marking = current
+                    break
+                on_stack.add(key)
+                successors, expanded = self.get_successors(current, enabled, on_stack)
+                result.expanded += expanded
+                stack.append((key, iter(successors)))
+                continue
+            key, successors = stack[-1]
+            for transition, successor, successor_key in successors:
+                result.edges += 1
+                if successor_key not in visited:
+                    break
+            else:
+                stack.pop()
+                on_stack.discard(key)
+                if sequence:
+                    sequence.pop()
+                continue
+            if self.max_states is not None and result.states >= self.max_states:
+                result.stop_reason = 'max_states'
+                break
+            visited.add(successor_key)
+            result.states += 1
+            sequence.append(transition)
+            visiting = (successor, successor_key)
+        else:
+            result.complete = True
+        result.elapsed = time.perf_counter() - start
+        return result
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+#
+# Compilation module
+#
+
+
+"""Compilation module"""
+
+
+# Standard packages
+from array import array
+
+# Installed packages
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Local packages
+from src.interpretation import NodeVisitor
+from src.node import (
+    AwnNode, PetriNetNode,
+    PlaceNode, TransitionNode,
+)
+from src.symbols import SymbolTable
+
+
+# Typecode of every compiled integer array, signed 64 bits
+INDEX_TYPECODE = 'q'
+
+
+class CompiledNet:
+    """
+    Petri net compiled into integer indexes
+
+    Places and transitions are numbered following declaration order,
+    pre and post incidence are stored as sparse rows (one per transition)
+    where row T spans OFFSETS[T]:OFFSETS[T + 1] of PLACES and WEIGHTS
+
+    Consumers of each place (transitions with it in their preset) are
+    indexed the same way, built on first use
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(
+            self,
+            place_names: list,
+            transition_names: list,
+            initial_marking,
+            pre: tuple,
+            post: tuple
+            ) -> None:
+        self.place_names = place_names
+        self.transition_names = transition_names
+        self.place_indexes = {name: index for index, name in enumerate(place_names)}
+        self.transition_indexes = {
+            name: index for index, name in enumerate(transition_names)
+        }
+        self.initial_marking = initial_marking
+        self.pre_offsets, self.pre_places, self.pre_weights = pre
+        self.post_offsets, self.post_places, self.post_weights = post
+        self.consumer_offsets = None
+        self.consumer_transitions = None
+
+    @property
+    def places_count(self) -> int:
+        """Return amount of places"""
+        return len(self.place_names)
+
+    @property
+    def transitions_count(self) -> int:
+        """Return amount of transitions"""
+        return len(self.transition_names)
+
+    def get_place_index(self, name: str) -> int:
+        """Return index of place NAME"""
+        return self.place_indexes[name]
+
+    def get_place_name(self, index: int) -> str:
+        """Return name of place at INDEX"""
+        return self.place_names[index]
+
+    def get_transition_index(self, name: str) -> int:
+        """Return index of transition NAME"""
+        return self.transition_indexes[name]
+
+    def get_transition_name(self, index: int) -> str:
+        """Return name of transition at INDEX"""
+        return self.transition_names[index]
+
+    def get_preset(self, transition: int) -> list:
+        """Return (place, weight) pairs consumed by TRANSITION"""
+        start, end = self.pre_offsets[transition], self.pre_offsets[transition + 1]
+        return list(zip(self.pre_places[start:end], self.pre_weights[start:end]))
+
+    def get_postset(self, transition: int) -> list:
+        """Return (place, weight) pairs produced by TRANSITION"""
+        start, end = self.post_offsets[transition], self.post_offsets[transition + 1]
+        return list(zip(self.post_places[start:end], self.post_weights[start:end]))
+
+    def get_changes(self, transition: int) -> tuple:
+        """Return (place, delta) pairs applied to marking when TRANSITION fires"""
+        deltas = {}
+        for place, weight in self.get_preset(transition):
+            deltas[place] = deltas.get(place, 0) - weight
+        for place, weight in self.get_postset(transition):
+            deltas[place] = deltas.get(place, 0) + weight
+        return tuple((place, delta) for place, delta in deltas.items() if delta)
+
+    def build_consumers(self) -> None:
+        """Build place => consuming transitions sparse index from pre rows"""
+        counts = [0] * (self.places_count + 1)
+        for place in self.pre_places:
+            counts[place + 1] += 1
+        offsets = array(INDEX_TYPECODE, counts)
+        for place in range(self.places_count):
+            offsets[place + 1] += offsets[place]
+        transitions = array(INDEX_TYPECODE, bytes(8 * len(self.pre_places)))
+        positions = offsets[:-1]
+        for transition in range(self.transitions_count):
+            for index in range(self.pre_offsets[transition], self.pre_offsets[transition + 1]):
+                place = self.pre_places[index]
+                transitions[positions[place]] = transition
+                positions[place] += 1
+        self.consumer_offsets = offsets
+        self.consumer_transitions = transitions
+
+    def get_consumers(self, place: int) -> list:
+        """Return transitions consuming tokens of PLACE, sorted"""
+        if self.consumer_offsets is None:
+            self.build_consumers()
+        start, end = self.consumer_offsets[place], self.consumer_offsets[place + 1]
+        return self.consumer_transitions[start:end].tolist()
+
+    def get_dependents(self, transition: int) -> tuple:
+        """
+        Return transitions whose enabling may change when TRANSITION
+        fires, the consumers of places it changes
+        """
+        dependents = set()
+        for place, _ in self.get_changes(transition):
+            dependents.update(self.get_consumers(place))
+        return tuple(sorted(dependents))
+
+    def is_enabled(self, marking, transition: int) -> bool:
+        """Check that MARKING has enough tokens to fire TRANSITION"""
+        return all(marking[place] >= weight for place, weight in self.get_preset(transition))
+
+    def get_enabled_transitions(self, marking) -> list:
+        """Return indexes of transitions enabled in MARKING"""
+        return [
+            transition for transition in range(self.transitions_count)
+            if self.is_enabled(marking, transition)
+        ]
+
+    def fire(self, marking, transition: int) -> list:
+        """Return marking reached firing enabled TRANSITION from MARKING"""
+        result = list(marking)
+        for place, weight in self.get_preset(transition):
+            result[place] -= weight
+        for place, weight in self.get_postset(transition):
+            result[place] += weight
+        return result
+
+    def get_marking_dict(self, marking) -> dict:
+        """Return MARKING as {place name: tokens}"""
+        return dict(zip(self.place_names, marking))
+
+    def build_dense(self, offsets, places, weights) -> list:
+        """Return dense rows, one array per transition, from sparse rows"""
+        rows = []
+        for transition in range(self.transitions_count):
+            row = array(INDEX_TYPECODE, bytes(8 * self.places_count))
+            for index in range(offsets[transition], offsets[transition + 1]):
+                row[places[index]] = weights[index]
+            rows.append(row)
+        return rows
+
+    def get_dense_pre(self) -> list:
+        """Return dense pre incidence, TRANSITIONS x PLACES"""
+        return self.build_dense(self.pre_offsets, self.pre_places, self.pre_weights)
+
+    def get_dense_post(self) -> list:
+        """Return dense post incidence, TRANSITIONS x PLACES"""
+        return self.build_dense(self.post_offsets, self.post_places, self.post_weights)
+
+    def get_dense_incidence(self) -> list:
+        """Return dense incidence (post - pre), TRANSITIONS x PLACES"""
+        return [
+            array(INDEX_TYPECODE, (b - a for a, b in zip(pre_row, post_row)))
+            for pre_row, post_row in zip(self.get_dense_pre(), self.get_dense_post())
+        ]
+
+    def to_petri_net_node(self) -> PetriNetNode:
+        """
+        Return Petri net ast equivalent to this net, to interpret it
+        without parsing, repeated awns are already merged
+        """
+        symbols = SymbolTable()
+        places = [
+            PlaceNode(name, tokens) for name, tokens in zip(self.place_names, self.initial_marking)
+        ]
+        for place in places:
+            symbols.define(place)
+        transitions = []
+        for transition, name in enumerate(self.transition_names):
+            node = TransitionNode(name)
+            for place, weight in self.get_preset(transition):
+                node.input_awns.append(
+                    AwnNode(f'{places[place].name}->{name}', weight, places[place], node)
+                )
+            for place, weight in self.get_postset(transition):
+                node.output_awns.append(
+                    AwnNode(f'{name}->{places[place].name}', weight, node, places[place])
+                )
+            symbols.define(node)
+            transitions.append(node)
+        return PetriNetNode(transitions, places, symbols)
+
+    def to_numpy(self) -> tuple:
+        """Return (pre, post, initial marking) as numpy arrays"""
+        if numpy is None:
+            raise ImportError('numpy is required to export compiled nets as arrays')
+        shape = (self.transitions_count, self.places_count)
+        pre = numpy.zeros(shape, dtype=numpy.int64)
+        post = numpy.zeros(shape, dtype=numpy.int64)
+        for matrix, offsets, places, weights in (
+                (pre, self.pre_offsets, self.pre_places, self.pre_weights),
+                (post, self.post_offsets, self.post_places, self.post_weights)):
+            rows = numpy.repeat(
+                numpy.arange(self.transitions_count),
+                numpy.diff(numpy.asarray(offsets, dtype=numpy.int64))
+            )
+            matrix[rows, numpy.asarray(places, dtype=numpy.int64)] = numpy.asarray(weights)
+        marking = numpy.asarray(self.initial_marking, dtype=numpy.int64)
+        return pre, post, marking
+
+
+class Compiler(NodeVisitor):
+    """This is responsive for compile Petri ast nodes into a CompiledNet"""
+
+    def __init__(self) -> None:
+        self.place_names = []
+        self.place_indexes = {}
+        self.initial_marking = array(INDEX_TYPECODE)
+        self.transition_names = []
+        self.pre = (array(INDEX_TYPECODE, [0]), array(INDEX_TYPECODE), array(INDEX_TYPECODE))
+        self.post = (array(INDEX_TYPECODE, [0]), array(INDEX_TYPECODE), array(INDEX_TYPECODE))
+
+    # pylint: disable=invalid-name
+    def visit_PetriNetNode(self, node: PetriNetNode) -> None:
+        """Visit PetriNetNode NODE"""
+        for place in node.places:
+            self.visit(place)
+        for transition in node.transitions:
+            self.visit(transition)
+
+    # pylint: disable=invalid-name
+    def visit_PlaceNode(self, node: PlaceNode) -> int:
+        """Visit PlaceNode NODE, return its index"""
+        index = self.place_indexes.get(node.name)
+        if index is None:
+            index = len(self.place_names)
+            self.place_indexes[node.name] = index
+            self.place_names.append(node.name)
+            self.initial_marking.append(node.starting_amount)
+        return index
+
+    # pylint: disable=invalid-name
+    def visit_TransitionNode(self, node: TransitionNode) -> None:
+        """Visit TransitionNode NODE"""
+        self.transition_names.append(node.name)
+        self.append_row(self.pre, [self.visit(awn) for awn in node.input_awns])
+        self.append_row(self.post, [self.visit(awn) for awn in node.output_awns])
+
+    # pylint: disable=invalid-name
+    def visit_AwnNode(self, node: AwnNode) -> tuple:
+        """Visit AwnNode NODE, return (place index, weight)"""
+        place = node.input if isinstance(node.input, PlaceNode) else node.output
+        return self.visit(place), node.weight
+
+    @staticmethod
+    def append_row(sparse: tuple, entries: list) -> None:
+        """Append (place, weight) ENTRIES as a new row of SPARSE, merging repeated places"""
+        offsets, places, weights = sparse
+        merged = {}
+        for place, weight in entries:
+            merged[place] = merged.get(place, 0) + weight
+        for place in sorted(merged):
+            if merged[place]:
+                places.append(place)
+                weights.append(merged[place])
+        offsets.append(len(places))
+
+    def compile(self, petri_ast: PetriNetNode) -> CompiledNet:
+        """Compiles PETRI_AST nodes into a CompiledNet"""
+        assert petri_ast
+        self.visit(petri_ast)
+        return CompiledNet(
+            self.place_names,
+            self.transition_names,
+            self.initial_marking,
+            self.pre,
+            self.post
+        )
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
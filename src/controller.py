@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+#
+# Controller module
+#
+
+
+"""Controller module"""
+
+
+# Standard packages
+import threading
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.interpretation import QuiescenceDetector
+from src.scheduling import ThreadPoolScheduler
+
+
+# Reasons a run stops
+FIRINGS = 'firings'
+SECONDS = 'seconds'
+DEADLOCK = 'deadlock'
+INTERRUPTED = 'interrupted'
+
+
+class RunResult:
+    """
+    Statistics and final marking of a run of interpreted transitions,
+    on deadlock BLOCKED has the input places lacking tokens of every
+    transition, see Quiescence
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            reason: str,
+            firings: int,
+            elapsed: float,
+            marking: dict,
+            firing_counts: dict,
+            blocked: dict=None
+            ) -> None:
+        self.reason = reason
+        self.firings = firings
+        self.elapsed = elapsed
+        self.marking = marking
+        self.firing_counts = firing_counts
+        self.blocked = blocked
+
+    def get_statistics(self) -> dict:
+        """Return JSON serializable statistics"""
+        return {
+            'reason': self.reason,
+            'firings': self.firings,
+            'seconds': self.elapsed,
+            'firings_per_second': self.firings / self.elapsed if self.elapsed else 0,
+            'marking': self.marking,
+            'firing_counts': self.firing_counts,
+            'blocked': self.blocked,
+        }
+
+
+class RunController:
+    """
+    Runs transitions of INTERPRETER until MAX_FIRINGS firings, SECONDS
+    seconds, a deadlock if UNTIL_DEADLOCK, or an interruption (Ctrl+C)
+
+    Transitions run in their own threads, or in a pool of WORKERS
+    threads, the caller waits on an event set by the first bound
+    reached, then every thread is stopped and joined, deadlocks are
+    reported by the QuiescenceDetector of INTERPRETER, bound to it
+    here if it has none
+
+    Transitions already firing when the run stops finish their firing,
+    so a run may exceed MAX_FIRINGS by up to one firing per thread
+    """
+
+    # pylint: disable=too-many-arguments,too-many-instance-attributes
+    def __init__(
+            self,
+            interpreter,
+            workers: int=None,
+            max_firings: int=None,
+            seconds: float=None,
+            until_deadlock: bool=False
+            ) -> None:
+        assert max_firings is None or max_firings > 0
+        self.interpreter = interpreter
+        self.workers = workers
+        self.max_firings = max_firings
+        self.seconds = seconds
+        self.until_deadlock = until_deadlock
+        self.transitions = interpreter.transitions_references
+        self.lock = threading.Lock()
+        self.firings = 0
+        self.firing_counts = [0] * len(self.transitions)
+        self.reason = None
+        self.quiescence = None
+        self.done = threading.Event()
+        for transition in self.transitions:
+            transition.monitor = self
+        if until_deadlock:
+            if interpreter.detector is None:
+                interpreter.detector = QuiescenceDetector()
+                interpreter.detector.bind(self.transitions, interpreter.places_references)
+            interpreter.detector.add_listener(self.quiesced)
+
+    def finish(self, reason: str) -> None:
+        """Stop run because of REASON, only the first reason is kept"""
+        with self.lock:
+            if self.reason is None:
+                self.reason = reason
+        self.done.set()
+
+    def fired(self, transition) -> None:
+        """TRANSITION produced its resources"""
+        with self.lock:
+            self.firings += 1
+            self.firing_counts[transition.index] += 1
+            reached = self.max_firings is not None and self.firings >= self.max_firings
+        if reached:
+            self.finish(FIRINGS)
+
+    def quiesced(self, quiescence) -> None:
+        """Finish on QUIESCENCE reached, see QuiescenceDetector"""
+        self.quiescence = quiescence
+        self.finish(DEADLOCK)
+
+    def get_marking(self) -> dict:
+        """Return {place name: tokens}"""
+        return {
+            place.name: place.count() for place in self.interpreter.places_references
+        }
+
+    def run(self, threads: list) -> RunResult:
+        """
+        Run transitions, THREADS returned by the interpreter unless
+        using workers, until a bound is reached, return RunResult
+        """
+        scheduler = None
+        start = time.perf_counter()
+        try:
+            if self.workers:
+                scheduler = ThreadPoolScheduler(self.transitions, self.workers)
+                scheduler.start()
+            else:
+                for thread in threads:
+                    thread.start()
+            if not self.done.wait(self.seconds):
+                self.finish(SECONDS)
+        except KeyboardInterrupt:
+            self.finish(INTERRUPTED)
+        finally:
+            self.interpreter.stop()
+            if scheduler:
+                scheduler.stop()
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+        elapsed = time.perf_counter() - start
+        return RunResult(
+            self.reason,
+            self.firings,
+            elapsed,
+            self.get_marking(),
+            {
+                transition.name: self.firing_counts[transition.index]
+                for transition in self.transitions
+            },
+            self.quiescence.blocked if self.reason == DEADLOCK else None
+        )
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+#
+# Coverability module
+#
+
+
+"""Coverability module"""
+
+
+# Standard packages
+import operator
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.compilation import CompiledNet
+
+
+# Tokens of a place that can grow without limit
+OMEGA = float('inf')
+
+
+def is_covered(marking: tuple, other: tuple) -> bool:
+    """Check that MARKING is less than or equal to OTHER in every place"""
+    return all(map(operator.le, marking, other))
+
+
+class CoverabilityResult:
+    """Coverability set of a net, with its unbounded places"""
+
+    def __init__(self, net: CompiledNet) -> None:
+        self.net = net
+        self.nodes = 0
+        self.pruned = 0
+        self.complete = False
+        # Maximal markings found, OMEGA where places are unbounded
+        self.markings = []
+        self.elapsed = 0.0
+
+    def get_bounds(self) -> list:
+        """Return maximum tokens of each place, OMEGA if unbounded"""
+        bounds = [0] * self.net.places_count
+        for marking in self.markings:
+            for place, tokens in enumerate(marking):
+                if tokens > bounds[place]:
+                    bounds[place] = tokens
+        return bounds
+
+    def get_unbounded_places(self) -> list:
+        """Return names of places without tokens limit"""
+        return [
+            self.net.get_place_name(place)
+            for place, tokens in enumerate(self.get_bounds())
+            if tokens == OMEGA
+        ]
+
+    def is_bounded(self) -> bool:
+        """Check that every place has a tokens limit"""
+        return OMEGA not in self.get_bounds()
+
+    def get_statistics(self) -> dict:
+        """Return JSON serializable statistics, 'omega' for unbounded places"""
+        return {
+            'nodes': self.nodes,
+            'pruned': self.pruned,
+            'complete': self.complete,
+            'bounded': self.is_bounded(),
+            'bounds': {
+                self.net.get_place_name(place): 'omega' if tokens == OMEGA else tokens
+                for place, tokens in enumerate(self.get_bounds())
+            },
+            'seconds': round(self.elapsed, 6),
+        }
+
+
+class CoverabilityExplorer:
+    """
+    Builds the Karp-Miller coverability tree of a CompiledNet
+
+    When a new marking covers one of its ancestors, places that grew
+    are accelerated to OMEGA, new markings covered by an already found
+    marking are pruned since everything they reach is covered too, so
+    the tree stays small even for nets with infinite state spaces
+
+    Exploration stops after MAX_NODES nodes, then the result is not
+    complete and unbounded places may be missing
+    """
+
+    def __init__(self, net: CompiledNet, max_nodes: int=None) -> None:
+        self.net = net
+        self.max_nodes = max_nodes
+        self.presets = [tuple(net.get_preset(t)) for t in range(net.transitions_count)]
+        self.changes = [net.get_changes(t) for t in range(net.transitions_count)]
+
+    def get_successors(self, marking: tuple):
+        """Yield successor markings of MARKING, OMEGA places stay OMEGA"""
+        for transition, preset in enumerate(self.presets):
+            for place, weight in preset:
+                if marking[place] < weight:
+                    break
+            else:
+                successor = list(marking)
+                for place, delta in self.changes[transition]:
+                    successor[place] += delta
+                yield successor
+
+    @staticmethod
+    def accelerate(marking: list, ancestors) -> None:
+        """Set to OMEGA places of MARKING that grew from covered ANCESTORS"""
+        for ancestor in ancestors:
+            if ancestor != marking and is_covered(ancestor, marking):
+                for place, tokens in enumerate(ancestor):
+                    if tokens < marking[place]:
+                        marking[place] = OMEGA
+
+    @staticmethod
+    def get_ancestors(node: tuple):
+        """Yield markings from NODE up to the tree root"""
+        while node is not None:
+            yield node[0]
+            node = node[1]
+
+    def explore(self, marking: list=None) -> CoverabilityResult:
+        """Build coverability tree from MARKING, initial one by default"""
+        start = time.perf_counter()
+        result = CoverabilityResult(self.net)
+        initial = tuple(marking if marking is not None else self.net.initial_marking)
+        # Node is (marking, parent node), followed to get ancestors
+        stack = [(initial, None)]
+        # Maximal markings found, the rest are covered by them
+        maximal = {initial}
+        result.nodes = 1
+
+        while stack:
+            if self.max_nodes is not None and result.nodes >= self.max_nodes:
+                break
+            node = stack.pop()
+            current = node[0]
+            if current not in maximal:
+                # Covered by a marking found after it was stacked
+                result.pruned += 1
+                continue
+            for successor in self.get_successors(current):
+                self.accelerate(successor, self.get_ancestors(node))
+                successor = tuple(successor)
+                if any(is_covered(successor, other) for other in maximal):
+                    result.pruned += 1
+                    continue
+                maximal.difference_update([
+                    other for other in maximal if is_covered(other, successor)
+                ])
+                maximal.add(successor)
+                stack.append((successor, node))
+                result.nodes += 1
+
+        result.complete = not stack
+        result.markings = list(maximal)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+#
+# Generation module
+#
+
+
+"""Generation module"""
+
+
+# Standard packages
+import io
+import random
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+## NOTE: this is empty for now
+
+
+# Items joined together before each write
+WRITE_BATCH = 1024
+
+
+class GeneratedNet:
+    """
+    Synthetic Petri net described without keeping it in memory
+
+    Places are p1..pPLACES and transitions t1..tTRANSITIONS, AWNS is
+    a callable returning an iterator of (source, target, weight) names
+    and MARKING a callable returning an iterator of tokens per place
+    """
+
+    def __init__(
+            self,
+            title: str,
+            places: int,
+            transitions: int,
+            awns,
+            marking
+            ) -> None:
+        self.title = title
+        self.places = places
+        self.transitions = transitions
+        self.awns = awns
+        self.marking = marking
+
+
+def write_items(stream, header: str, items) -> None:
+    """
+    Write 'HEADER = {item, ...}' with one item per line into STREAM,
+    raise exception without ITEMS, empty sets are not valid annotations
+    """
+    batch = []
+    written = 0
+    for item in items:
+        batch.append(item)
+        if len(batch) == WRITE_BATCH:
+            stream.write(f'{header} = {{' if not written else ',\n')
+            stream.write(',\n'.join(batch))
+            written += len(batch)
+            batch = []
+    if batch:
+        stream.write(f'{header} = {{' if not written else ',\n')
+        stream.write(',\n'.join(batch))
+        written += len(batch)
+    if not written:
+        raise Exception(f'Cannot write {header} without items')
+    stream.write('}\n')
+
+
+def format_awn(source: str, target: str, weight: int) -> str:
+    """Return annotation of awn from SOURCE to TARGET with WEIGHT"""
+    return f'{{{source}, {target}}}' if weight == 1 else f'{{{source}, {target}}}={weight}'
+
+
+def write_annotation(stream, net: GeneratedNet) -> None:
+    """Write annotation of NET into STREAM, item by item"""
+    stream.write(f'# {net.title}\n')
+    write_items(stream, 'P', (f'p{place}' for place in range(1, net.places + 1)))
+    write_items(stream, 'T', (f't{transition}' for transition in range(1, net.transitions + 1)))
+    write_items(stream, 'A', (format_awn(*awn) for awn in net.awns()))
+    write_items(stream, 'm0', (
+        f'm0(p{place})={tokens}' for place, tokens in enumerate(net.marking(), start=1)
+    ))
+
+
+def generate_annotation(net: GeneratedNet) -> str:
+    """Return annotation of NET"""
+    stream = io.StringIO()
+    write_annotation(stream, net)
+    return stream.getvalue()
+
+
+def ring(size: int, tokens: int=1) -> GeneratedNet:
+    """Return ring of SIZE places and transitions, TOKENS first places marked"""
+    def awns():
+        for index in range(1, size + 1):
+            yield f'p{index}', f't{index}', 1
+            yield f't{index}', f'p{index % size + 1}', 1
+    return GeneratedNet(
+        f'Ring of {size} places with {tokens} tokens', size, size, awns,
+        lambda: (1 if index < tokens else 0 for index in range(size))
+    )
+
+
+def fork_join(branches: int, length: int=1, tokens: int=1) -> GeneratedNet:
+    """
+    Return net where t1 forks TOKENS of p1 into BRANCHES chains of
+    LENGTH places, and t2 joins them back into p1
+    """
+    assert branches > 0 and length > 0
+
+    def place(branch: int, step: int) -> str:
+        return f'p{2 + branch * length + step}'
+
+    def awns():
+        yield 'p1', 't1', 1
+        yield 't2', 'p1', 1
+        transition = 3
+        for branch in range(branches):
+            yield 't1', place(branch, 0), 1
+            for step in range(length - 1):
+                yield place(branch, step), f't{transition}', 1
+                yield f't{transition}', place(branch, step + 1), 1
+                transition += 1
+            yield place(branch, length - 1), 't2', 1
+    return GeneratedNet(
+        f'Fork join of {branches} branches of {length} places',
+        1 + branches * length, 2 + branches * (length - 1), awns,
+        lambda: (tokens if index == 0 else 0 for index in range(1 + branches * length))
+    )
+
+
+def pipeline(stages: int, capacity: int=1, tokens: int=1) -> GeneratedNet:
+    """
+    Return pipeline of STAGES transitions moving TOKENS items through
+    buffers of CAPACITY items, t(STAGES + 1) recycles finished items
+
+    Buffers are p1..p(STAGES + 1), free slots of inner buffers are
+    p(STAGES + 2)..p(2 * STAGES)
+    """
+    assert stages > 0
+
+    def awns():
+        for stage in range(1, stages + 1):
+            yield f'p{stage}', f't{stage}', 1
+            yield f't{stage}', f'p{stage + 1}', 1
+            if stage < stages:
+                # Take a free slot of the next buffer
+                yield f'p{stages + 1 + stage}', f't{stage}', 1
+            if stage > 1:
+                # Free a slot of the previous buffer
+                yield f't{stage}', f'p{stages + stage}', 1
+        yield f'p{stages + 1}', f't{stages + 1}', 1
+        yield f't{stages + 1}', 'p1', 1
+
+    def marking():
+        yield tokens
+        for _ in range(stages):
+            yield 0
+        for _ in range(stages - 1):
+            yield capacity
+    return GeneratedNet(
+        f'Pipeline of {stages} stages with buffers of {capacity} items',
+        2 * stages, stages + 1, awns, marking
+    )
+
+
+def producer_consumer(
+        producers: int,
+        consumers: int,
+        capacity: int=1,
+        buffers: int=1
+        ) -> GeneratedNet:
+    """
+    Return PRODUCERS and CONSUMERS sharing BUFFERS bounded buffers of
+    CAPACITY items, producer and consumer I use buffer I % BUFFERS
+
+    Every producer and consumer has a ready and a busy place and two
+    transitions, then every buffer has an items and a free slots place
+    """
+    assert producers > 0 and consumers > 0 and buffers > 0
+    agents = producers + consumers
+
+    def awns():
+        for agent in range(agents):
+            ready, busy = f'p{2 * agent + 1}', f'p{2 * agent + 2}'
+            first, second = f't{2 * agent + 1}', f't{2 * agent + 2}'
+            buffer = agent % buffers if agent < producers else (agent - producers) % buffers
+            items, free = f'p{2 * agents + 2 * buffer + 1}', f'p{2 * agents + 2 * buffer + 2}'
+            yield ready, first, 1
+            yield first, busy, 1
+            yield busy, second, 1
+            yield second, ready, 1
+            if agent < producers:
+                # Producer deposits an item into a free slot
+                yield free, second, 1
+                yield second, items, 1
+            else:
+                # Consumer removes an item freeing its slot
+                yield items, first, 1
+                yield first, free, 1
+
+    def marking():
+        for _ in range(agents):
+            yield 1
+            yield 0
+        for _ in range(buffers):
+            yield 0
+            yield capacity
+    return GeneratedNet(
+        f'{producers} producers and {consumers} consumers with '
+        f'{buffers} buffers of {capacity} items',
+        2 * agents + 2 * buffers, 2 * agents, awns, marking
+    )
+
+
+# pylint: disable=too-many-arguments
+def random_net(
+        places: int,
+        transitions: int,
+        inputs: int=2,
+        outputs: int=2,
+        max_weight: int=1,
+        max_tokens: int=1,
+        seed: int=0
+        ) -> GeneratedNet:
+    """
+    Return random sparse net, every transition has INPUTS and OUTPUTS
+    distinct places with weights up to MAX_WEIGHT, places start with
+    up to MAX_TOKENS tokens, same SEED gives the same net
+    """
+    assert 0 < inputs <= places and 0 < outputs <= places
+
+    def awns():
+        generator = random.Random(f'{seed}-awns')
+        for transition in range(1, transitions + 1):
+            for place in generator.sample(range(1, places + 1), inputs):
+                yield f'p{place}', f't{transition}', generator.randint(1, max_weight)
+            for place in generator.sample(range(1, places + 1), outputs):
+                yield f't{transition}', f'p{place}', generator.randint(1, max_weight)
+
+    def marking():
+        generator = random.Random(f'{seed}-marking')
+        for _ in range(places):
+            yield generator.randint(0, max_tokens)
+    return GeneratedNet(
+        f'Random net of {places} places and {transitions} transitions, seed {seed}',
+        places, transitions, awns, marking
+    )
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
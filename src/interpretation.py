@@ -8,8 +8,9 @@
 
 
 # Standard packages
+from collections import deque
+import itertools
 import threading
-import time
 
 # Installed packages
 ## NOTE: this is empty for now
@@ -19,10 +20,11 @@ from src.node import (
     AwnNode, PetriNetNode,
     PlaceNode, TransitionNode,
 )
+from src.symbols import SymbolTable
 
 
-# Global state
-KEEP_RUNNING = True
+# Global order of places, locks are always taken following it
+PLACES_ORDER = itertools.count()
 
 
 class ResourceToken:
@@ -30,29 +32,93 @@ class ResourceToken:
 
 
 class ThreadedPlace:
-    """Place with useful methods to run Petri net threads"""
+    """
+    Place with useful methods to run Petri net threads
+
+    Tokens are uncoloured, the place only keeps a counter so
+    consume and produce are O(1), see TracedThreadedPlace
+    """
 
     def __init__(self, name: str, starting_tokens_count:int) -> None:
         self.name = name
-        self.tokens_stack = []
+        self.tokens_count = 0
+        # Callbacks called when tokens are produced, see add_listener
+        self.listeners = []
+        # Guards tokens, must be taken following ORDER with other places
+        self.lock = threading.Lock()
+        self.order = next(PLACES_ORDER)
+        # Declaration order and MetricsCollector, set by Interpreter
+        self.index = None
+        self.metrics = None
+        # Told about every change of tokens, see QuiescenceDetector
+        self.detector = None
         self.create(starting_tokens_count)
 
+    def add_listener(self, callback) -> None:
+        """Call CALLBACK without arguments every time tokens are produced"""
+        self.listeners.append(callback)
+
+    def create(self, amount: int) -> None:
+        """Create AMOUNT of new resource tokens"""
+        self.tokens_count += amount
+
+    def consume(self, amount:int) -> list:
+        """
+        Take AMOUNT of resource tokens and return their identities,
+        none for uncoloured tokens, caller must hold lock
+        """
+        if self.tokens_count >= amount:
+            self.tokens_count -= amount
+            return []
+        raise Exception('Resources not available')
+
+    def store(self, amount: int, tokens: list) -> None:
+        """Add AMOUNT of resource tokens, caller must hold lock"""
+        self.tokens_count += amount
+
+    def produce(self, amount: int, tokens: list=None) -> None:
+        """Add AMOUNT of resource tokens to this place, reusing TOKENS identities"""
+        if self.metrics is None:
+            self.lock.acquire()
+        else:
+            self.metrics.acquire_lock(self)
+        try:
+            before = self.count()
+            self.store(amount, tokens if tokens else [])
+            if self.detector is not None:
+                self.detector.changed(self, before, self.count())
+        finally:
+            self.lock.release()
+        for callback in self.listeners:
+            callback()
+
+    def count(self) -> int:
+        """Return count of resource tokens"""
+        return self.tokens_count
+
+
+class TracedThreadedPlace(ThreadedPlace):
+    """Place keeping one ResourceToken per token, to trace token identities"""
+
+    def __init__(self, name: str, starting_tokens_count:int) -> None:
+        self.tokens_stack = deque()
+        super().__init__(name, starting_tokens_count)
+
     def create(self, amount: int) -> None:
         """Create AMOUNT of new resource tokens"""
         for _ in range(amount):
             self.tokens_stack.append(ResourceToken())
 
     def consume(self, amount:int) -> list:
-        """Return AMOUNT of resource tokens"""
+        """Return AMOUNT of resource tokens, caller must hold lock"""
         if self.count() >= amount:
-            result = self.tokens_stack[:amount]
-            self.tokens_stack = self.tokens_stack[amount:]
-            return result
+            return [self.tokens_stack.popleft() for _ in range(amount)]
         raise Exception('Resources not available')
 
-    def produce(self, tokens: list) -> None:
-        """Add resources TOKENS to this place"""
-        self.tokens_stack += tokens
+    def store(self, amount: int, tokens: list) -> None:
+        """Add AMOUNT of resource tokens from TOKENS, creating missing ones"""
+        self.tokens_stack.extend(tokens[:amount])
+        self.create(amount - min(amount, len(tokens)))
 
     def count(self) -> int:
         """Return count of resource tokens"""
@@ -60,59 +126,143 @@ class ThreadedPlace:
 
 
 class ThreadedTransition:
-    """Transition with useful methods to run Petri net threads"""
+    """
+    Transition with useful methods to run Petri net threads
+
+    ACTION is called with the transition on every firing while its
+    resources are held, LOGGER receives every firing, see FiringLogger,
+    and RECORDER its INDEX, see TraceRecorder, METRICS counts firings
+    and lock waits, see MetricsCollector, MONITOR is told about every
+    firing once tokens are produced, see RunController, and DETECTOR
+    about firings in flight, see QuiescenceDetector, without them
+    firing only moves tokens
+    """
 
     def __init__(self, name: str, input_awns: list, output_awns: list) -> None:
         self.name = name
         self.input_awns = input_awns
         self.output_awns = output_awns
-        self.resources_token_stack = []
+        self.action = None
+        self.logger = None
+        self.recorder = None
+        self.metrics = None
+        self.monitor = None
+        self.detector = None
+        # Declaration order, same index as in CompiledNet
+        self.index = None
+        # Set by input places when they receive tokens, and by stop
+        self.wakeup = threading.Event()
+        self.running = True
+        # Distinct input places following global locks order
+        self.input_places = []
+
+    def listen_input_places(self) -> None:
+        """Wake up this transition when any input place receives tokens"""
+        places = {input_awn.input for input_awn in self.input_awns}
+        self.input_places = sorted(places, key=lambda place: place.order)
+        for place in self.input_places:
+            place.add_listener(self.wakeup.set)
 
     def are_all_inputs_enabled(self) -> bool:
-        """Check that all input awns are enabled"""
+        """
+        Check that all input awns are enabled, awns repeated from the
+        same place need the sum of their weights, as in CompiledNet
+        """
         result = True
         for input_awn in self.input_awns:
             if not input_awn.is_enabled():
                 result = False
-        return result
-
-    def get_all_resources(self) -> None:
-        """Get all resources from awns to resources stack"""
+        if not result or len(self.input_places) == len(self.input_awns):
+            return result
+        needs = {}
         for input_awn in self.input_awns:
-            self.resources_token_stack += input_awn.get_resources()
+            needs[input_awn.input] = needs.get(input_awn.input, 0) + input_awn.weight
+        return all(place.count() >= weight for place, weight in needs.items())
 
-    def pass_all_resources(self) -> None:
-        """Pass all resources to output awns"""
+    def get_all_resources(self) -> list:
+        """Get all resources from awns, caller must hold input places locks"""
+        resources = []
+        for input_awn in self.input_awns:
+            resources += input_awn.get_resources()
+        return resources
+
+    def acquire_all_resources(self):
+        """
+        Atomically get all resources if all input awns are enabled,
+        otherwise return None
+
+        Input places locks are taken in global order, so transitions
+        sharing places never deadlock and disjoint ones run in parallel
+        """
+        if self.metrics is None:
+            for place in self.input_places:
+                place.lock.acquire()
+        else:
+            for place in self.input_places:
+                self.metrics.acquire_lock(place)
+        try:
+            if not self.are_all_inputs_enabled():
+                return None
+            if self.detector is not None:
+                # Counted before tokens leave, so they are never missed
+                self.detector.taken()
+            return self.get_all_resources()
+        finally:
+            for place in reversed(self.input_places):
+                place.lock.release()
+
+    def pass_all_resources(self, resources: list) -> None:
+        """
+        Pass RESOURCES to output awns, each one takes the next tokens,
+        so no token reaches two places, missing ones are created
+        """
+        start = 0
         for output_awns in self.output_awns:
-            tokens_to_pass = self.resources_token_stack[:output_awns.weight]
-            output_awns.pass_resources(tokens_to_pass)
-        self.resources_token_stack = []
-
-    def critical_section(self) -> None:
-        """Thread critical section"""
-        # NOTE: this print is not critical, but is useful as example
-        self.get_all_resources()
-        input_names = [awn.get_input_name() for awn in self.input_awns]
-        output_names = [awn.get_output_name() for awn in self.output_awns]
-        tokens_input = [ str(awn.get_weight()) for awn in self.input_awns]
-        message_input =  [place + " releases " + token + " tokens" for place, token in zip(input_names,tokens_input)]
-        tokens_output = [ str(awn.get_weight()) for awn in self.output_awns]
-        message_output = [ place + " received " + token + " tokens" for place, token in zip(output_names,tokens_output)]
-        print(
-            '\033[;32m running:'
-            f'\t \033[;35m [{",".join(input_names)}] => \033[;33m {self.name} \033[;34m => [{",".join(output_names)}]'
-            f'\t \033[;35m {message_input}'
-            f'\t \033[;34m {message_output} \033[;37m'
-        )
-        time.sleep(0.5)
-        self.pass_all_resources()
+            output_awns.pass_resources(resources[start:start + output_awns.weight])
+            start += output_awns.weight
+        if self.detector is not None:
+            self.detector.fired()
+
+    def critical_section(self):
+        """
+        Thread critical section, runs after resources are acquired,
+        return result of action, awaited by AsyncRunner if awaitable
+        """
+        if self.recorder is not None:
+            self.recorder.record(self.index)
+        if self.metrics is not None:
+            self.metrics.count_firing(self.index)
+        if self.logger is not None:
+            self.logger.log(self)
+        if self.action is not None:
+            return self.action(self)
+        return None
+
+    def fire(self) -> bool:
+        """Fire transition if it is enabled, return if it was fired"""
+        resources = self.acquire_all_resources()
+        if resources is None:
+            return False
+        self.critical_section()
+        self.pass_all_resources(resources)
+        if self.monitor is not None:
+            self.monitor.fired(self)
+        return True
 
     def run(self) -> None:
-        """Run transition infinite loop"""
-        while KEEP_RUNNING:
-            if self.are_all_inputs_enabled():
-                self.critical_section()
-                
+        """Run transition loop until stopped, blocking while it is not enabled"""
+        while True:
+            # Clear before checking, tokens produced or stop meanwhile set it again
+            self.wakeup.clear()
+            if not self.running:
+                break
+            if not self.fire():
+                self.wakeup.wait()
+
+    def stop(self) -> None:
+        """Stop run loop, waking it up if it is blocked"""
+        self.running = False
+        self.wakeup.set()
 
 
 class ThreadedAwn:
@@ -144,16 +294,138 @@ class ThreadedAwn:
         """Pass resources to output"""
         if not isinstance(self.output, ThreadedPlace):
             raise Exception(f'{self.name}: cannot pass resources to {self.output.name}, must be a Place')
-        # Create new tokens
-        while len(tokens) < self.weight:
-            tokens.append(ResourceToken())
-        self.output.produce(tokens)
+        # Traced places create missing tokens
+        self.output.produce(self.weight, tokens)
 
     def get_resources(self) -> list:
         """Get resources from input"""
         if not isinstance(self.input, ThreadedPlace):
             raise Exception(f'{self.name}: cannot extract resources from Transition {self.input.name}')
-        return self.input.consume(self.weight)
+        if self.input.detector is None:
+            return self.input.consume(self.weight)
+        before = self.input.count()
+        tokens = self.input.consume(self.weight)
+        self.input.detector.changed(self.input, before, self.input.count())
+        return tokens
+
+
+class Quiescence:
+    """
+    Dead marking reached by interpreted transitions, MARKING is
+    {place name: tokens} and BLOCKED {transition name: [names of input
+    places without enough tokens]}
+    """
+
+    def __init__(self, marking: dict, blocked: dict) -> None:
+        self.marking = marking
+        self.blocked = blocked
+
+
+class QuiescenceDetector:
+    """
+    Detects the moment interpreted transitions can no longer fire,
+    without scanning the net
+
+    Places tell every change of tokens, so for each transition the
+    amount of input places without enough tokens is kept, and with
+    it the amount of enabled transitions, transitions tell when they
+    take tokens and when they finish producing them, so the amount of
+    firings in flight is kept too
+
+    Quiescence is reached when both amounts are zero, that marking
+    never changes again, listeners are called once with a Quiescence
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.places = []
+        self.transitions = []
+        # (place, weight) consumed by each transition, repeated awns merged
+        self.needs = []
+        # (transition index, weight) consuming from each place
+        self.consumers = []
+        # Input places without enough tokens of each transition
+        self.missing = []
+        self.enabled = 0
+        self.in_flight = 0
+        self.listeners = []
+        self.quiescence = None
+        self.quiescent = threading.Event()
+
+    def bind(self, transitions: list, places: list) -> None:
+        """Detect quiescence of interpreted TRANSITIONS and PLACES, not running yet"""
+        self.places = places
+        self.transitions = transitions
+        self.consumers = [[] for _ in places]
+        self.needs = []
+        self.missing = []
+        for transition in transitions:
+            needs = {}
+            for awn in transition.input_awns:
+                needs[awn.input] = needs.get(awn.input, 0) + awn.weight
+            for place, weight in needs.items():
+                self.consumers[place.index].append((transition.index, weight))
+            self.needs.append(list(needs.items()))
+            self.missing.append(sum(1 for place, weight in needs.items() if place.count() < weight))
+            transition.detector = self
+        for place in places:
+            place.detector = self
+        self.enabled = self.missing.count(0)
+        self.check()
+
+    def add_listener(self, callback) -> None:
+        """Call CALLBACK with the Quiescence once reached, now if it already was"""
+        with self.lock:
+            self.listeners.append(callback)
+            quiescence = self.quiescence
+        if quiescence is not None:
+            callback(quiescence)
+
+    def changed(self, place, before: int, after: int) -> None:
+        """PLACE tokens went from BEFORE to AFTER, caller holds its lock"""
+        with self.lock:
+            for transition, weight in self.consumers[place.index]:
+                if (before >= weight) == (after >= weight):
+                    continue
+                if after >= weight:
+                    self.missing[transition] -= 1
+                    if not self.missing[transition]:
+                        self.enabled += 1
+                else:
+                    if not self.missing[transition]:
+                        self.enabled -= 1
+                    self.missing[transition] += 1
+
+    def taken(self) -> None:
+        """A transition is about to take its tokens"""
+        with self.lock:
+            self.in_flight += 1
+
+    def fired(self) -> None:
+        """A transition finished producing its tokens"""
+        with self.lock:
+            self.in_flight -= 1
+        self.check()
+
+    def check(self) -> None:
+        """Report quiescence if nothing is enabled nor in flight"""
+        with self.lock:
+            if self.enabled or self.in_flight or self.quiescence is not None:
+                return
+            # Nothing fires anymore, so places can be read without locks
+            self.quiescence = Quiescence(
+                {place.name: place.count() for place in self.places},
+                {
+                    transition.name: [
+                        place.name for place, weight in needs if place.count() < weight
+                    ]
+                    for transition, needs in zip(self.transitions, self.needs)
+                }
+            )
+            listeners = list(self.listeners)
+        self.quiescent.set()
+        for callback in listeners:
+            callback(self.quiescence)
 
 
 class NodeVisitor:
@@ -173,20 +445,47 @@ class NodeVisitor:
 class Interpreter(NodeVisitor):
     """This is responsive for interpret Petri ast nodes into threads"""
 
-    def __init__(self) -> None:
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            traced_tokens: bool=False,
+            actions: dict=None,
+            default_action=None,
+            logger=None,
+            recorder=None,
+            metrics=None,
+            monitor=None,
+            detector=None
+            ) -> None:
+        # Places keep token identities only if TRACED_TOKENS
+        self.place_class = TracedThreadedPlace if traced_tokens else ThreadedPlace
+        # Transition name => action, others use DEFAULT_ACTION
+        self.actions = actions if actions else {}
+        self.default_action = default_action
+        self.logger = logger
+        self.recorder = recorder
+        self.metrics = metrics
+        self.monitor = monitor
+        self.detector = detector
         # Global states used to reference
         self.transitions_references = []
         self.places_references = []
+        self.symbols = SymbolTable()
 
     # pylint: disable=invalid-name
     def visit_PetriNetNode(self, node: PetriNetNode) -> list:
         """Visit PetriNetNode NODE"""
+        for place in node.places:
+            self.visit(place)
         return [self.visit(transition) for transition in node.transitions]
 
     # pylint: disable=invalid-name
     def visit_PlaceNode(self, node: PlaceNode):
         """Visit PlaceNode NODE"""
-        new_place = ThreadedPlace(node.name, node.starting_amount)
+        new_place = self.place_class(node.name, node.starting_amount)
+        new_place.index = len(self.places_references)
+        new_place.metrics = self.metrics
+        self.symbols.define(new_place)
         self.places_references.append(new_place)
         return new_place
 
@@ -194,9 +493,17 @@ class Interpreter(NodeVisitor):
     def visit_TransitionNode(self, node: TransitionNode):
         """Visit TransitionNode NODE"""
         transition = ThreadedTransition(node.name, None, None)
+        transition.action = self.actions.get(node.name, self.default_action)
+        transition.logger = self.logger
+        transition.recorder = self.recorder
+        transition.metrics = self.metrics
+        transition.monitor = self.monitor
+        transition.index = len(self.transitions_references)
+        self.symbols.define(transition)
         self.transitions_references.append(transition)
         transition.input_awns = [self.visit(awn) for awn in node.input_awns]
         transition.output_awns = [self.visit(awn) for awn in node.output_awns]
+        transition.listen_input_places()
         return threading.Thread(target=transition.run)
 
     # pylint: disable=invalid-name
@@ -215,16 +522,26 @@ class Interpreter(NodeVisitor):
 
     def search_by_name(self, name):
         """Search threaded node by name"""
-        result = None
-        for node in (self.transitions_references + self.places_references):
-            if node.name == name:
-                result = node
-        return result
+        return self.symbols.get(name)
 
     def interpret(self, petri_ast: PetriNetNode) -> list:
         """Interprets PETRI_AST nodes into threads"""
         assert petri_ast
-        return self.visit(petri_ast)
+        # Names resolved in the tree symbols, before creating any node
+        for name in self.actions:
+            if not isinstance(petri_ast.symbols.get(name), TransitionNode):
+                raise Exception(f'Action given for {name}, which is not a transition')
+        threads = self.visit(petri_ast)
+        if self.metrics is not None:
+            self.metrics.bind(self.transitions_references, self.places_references)
+        if self.detector is not None:
+            self.detector.bind(self.transitions_references, self.places_references)
+        return threads
+
+    def stop(self) -> None:
+        """Stop run loops of every interpreted transition"""
+        for transition in self.transitions_references:
+            transition.stop()
 
 
 if __name__ == '__main__':
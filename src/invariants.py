@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+#
+# Invariants module
+#
+
+
+"""Invariants module"""
+
+
+# Standard packages
+import heapq
+import math
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.compilation import CompiledNet
+
+
+# Array typecodes able to hold place counters, smallest first
+COUNTER_TYPECODES = (('B', 0xFF), ('H', 0xFFFF), ('I', 0xFFFF_FFFF), ('Q', 0xFFFF_FFFF_FFFF_FFFF))
+
+
+def get_counter_typecode(bounds: list) -> str:
+    """
+    Return smallest unsigned array typecode holding tokens up to
+    BOUNDS of every place, None if some place has no bound
+    """
+    if any(bound is None for bound in bounds):
+        return None
+    highest = max(bounds, default=0)
+    for typecode, limit in COUNTER_TYPECODES:
+        if highest <= limit:
+            return typecode
+    return None
+
+
+def combine(positive: tuple, negative: tuple, column: int) -> tuple:
+    """
+    Return row of nonnegative combination of POSITIVE and NEGATIVE
+    rows cancelling COLUMN, divided by the gcd of its entries
+
+    Rows are (incidence {column: value}, combination {row: coefficient},
+    support bitmask of combination rows)
+    """
+    positive_factor = -negative[0][column]
+    negative_factor = positive[0][column]
+    divisor = math.gcd(positive_factor, negative_factor)
+    positive_factor //= divisor
+    negative_factor //= divisor
+    rows = []
+    for position in (0, 1):
+        merged = {key: value * positive_factor for key, value in positive[position].items()}
+        for key, value in negative[position].items():
+            merged[key] = merged.get(key, 0) + value * negative_factor
+        rows.append({key: value for key, value in merged.items() if value})
+    incidence, combination = rows
+    divisor = math.gcd(*incidence.values(), *combination.values())
+    if divisor > 1:
+        incidence = {key: value // divisor for key, value in incidence.items()}
+        combination = {key: value // divisor for key, value in combination.items()}
+    return incidence, combination, positive[2] | negative[2]
+
+
+def is_redundant(row: tuple, other: tuple) -> bool:
+    """Check that OTHER makes ROW useless, its support is smaller or it is the same row"""
+    if other[2] | row[2] != row[2]:
+        return False
+    return other[2] != row[2] or other[:2] == row[:2]
+
+
+class SemiflowsTable:
+    """
+    Rows of the Farkas algorithm, indexed by sign of their incidence
+    columns, so the next column to cancel is found without scanning
+    every row
+    """
+
+    def __init__(self, rows: list) -> None:
+        self.rows = {}
+        self.positives = {}
+        self.negatives = {}
+        # Rows by lowest index of their support, see get_subsets
+        self.lowest = {}
+        # Lazy heap of (combinations created, column), see get_column
+        self.heap = []
+        self.next_id = 0
+        for index, row in enumerate(rows):
+            self.add(({key: value for key, value in row.items() if value}, {index: 1}, 1 << index))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get_cost(self, column: int) -> int:
+        """Return rows added minus rows removed cancelling COLUMN"""
+        positives = len(self.positives.get(column, ()))
+        negatives = len(self.negatives.get(column, ()))
+        return positives * negatives - positives - negatives
+
+    def update(self, column: int) -> None:
+        """Push current cost of COLUMN into heap, old entries are skipped later"""
+        heapq.heappush(self.heap, (self.get_cost(column), column))
+
+    def add(self, row: tuple) -> None:
+        """Add ROW"""
+        row_id = self.next_id
+        self.next_id += 1
+        self.rows[row_id] = row
+        self.lowest.setdefault(min(row[1]), set()).add(row_id)
+        for column, value in row[0].items():
+            index = self.positives if value > 0 else self.negatives
+            index.setdefault(column, set()).add(row_id)
+            self.update(column)
+
+    def remove(self, row_id: int) -> tuple:
+        """Remove and return row ROW_ID"""
+        row = self.rows.pop(row_id)
+        self.lowest[min(row[1])].discard(row_id)
+        for column, value in row[0].items():
+            index = self.positives if value > 0 else self.negatives
+            index[column].discard(row_id)
+            if not index[column]:
+                del index[column]
+            self.update(column)
+        return row
+
+    def get_subsets(self, row: tuple):
+        """Yield rows that may have support included in support of ROW"""
+        if len(row[1]) >= len(self.rows):
+            yield from self.rows.values()
+            return
+        for index in row[1]:
+            for row_id in self.lowest.get(index, ()):
+                yield self.rows[row_id]
+
+    def get_column(self) -> int:
+        """Return column creating fewest rows once cancelled, None if all are zero"""
+        while self.heap:
+            cost, column = self.heap[0]
+            if (column in self.positives or column in self.negatives) \
+                    and cost == self.get_cost(column):
+                return column
+            heapq.heappop(self.heap)
+        return None
+
+    def cancel(self, column: int) -> None:
+        """
+        Replace rows with COLUMN by combinations of them cancelling it,
+        keeping only rows that may lead to minimal supports
+        """
+        positive_rows = [self.remove(row_id) for row_id in self.positives.get(column, set()).copy()]
+        negative_rows = [self.remove(row_id) for row_id in self.negatives.get(column, set()).copy()]
+        combined = sorted(
+            (combine(positive, negative, column)
+             for positive in positive_rows for negative in negative_rows),
+            key=lambda row: row[2].bit_count()
+        )
+        kept = []
+        for row in combined:
+            # Remaining rows never contain these supports, they would
+            # have made the combined rows redundant before
+            if not any(is_redundant(row, other) for other in kept) \
+                    and not any(is_redundant(row, other) for other in self.get_subsets(row)):
+                kept.append(row)
+        for row in kept:
+            self.add(row)
+
+
+def get_semiflows(rows: list, max_rows: int=None) -> list:
+    """
+    Return minimal support semiflows of sparse ROWS {column: value},
+    as {row: coefficient} of nonnegative combinations adding up to
+    zero in every column
+
+    Columns are cancelled one by one (Farkas algorithm), each time
+    the one creating fewest combinations, with exact integers, rows
+    whose support contains the support of another are dropped, raise
+    exception if more than MAX_ROWS rows would be kept
+    """
+    table = SemiflowsTable(rows)
+    column = table.get_column()
+    while column is not None:
+        table.cancel(column)
+        if max_rows is not None and len(table) > max_rows:
+            raise Exception(f'Semiflows computation needs more than {max_rows} rows')
+        column = table.get_column()
+    return sorted(
+        (dict(sorted(row[1].items())) for row in table.rows.values()),
+        key=sorted
+    )
+
+
+class InvariantsResult:
+    """
+    Minimal P-semiflows and T-semiflows of a net
+
+    P-semiflows are place weights keeping the weighted sum of tokens
+    constant whatever fires, T-semiflows are firing counts going back
+    to the same marking, both are {index: coefficient}
+    """
+
+    def __init__(self, net: CompiledNet) -> None:
+        self.net = net
+        self.p_semiflows = []
+        self.t_semiflows = []
+        self.elapsed = 0.0
+
+    def get_bounds(self, marking=None) -> list:
+        """
+        Return maximum tokens of each place reachable from MARKING,
+        initial one by default, derived from P-semiflows, None for
+        places not covered by any
+        """
+        marking = self.net.initial_marking if marking is None else marking
+        bounds = [None] * self.net.places_count
+        for semiflow in self.p_semiflows:
+            total = sum(coefficient * marking[place] for place, coefficient in semiflow.items())
+            for place, coefficient in semiflow.items():
+                bound = total // coefficient
+                if bounds[place] is None or bound < bounds[place]:
+                    bounds[place] = bound
+        return bounds
+
+    def is_conservative(self) -> bool:
+        """Check that P-semiflows cover every place, so tokens are bounded from any marking"""
+        covered = set()
+        for semiflow in self.p_semiflows:
+            covered.update(semiflow)
+        return len(covered) == self.net.places_count
+
+    def is_consistent(self) -> bool:
+        """Check that T-semiflows cover every transition"""
+        covered = set()
+        for semiflow in self.t_semiflows:
+            covered.update(semiflow)
+        return len(covered) == self.net.transitions_count
+
+    def get_counter_typecode(self) -> str:
+        """Return array typecode able to hold every place counter, None if unbounded"""
+        return get_counter_typecode(self.get_bounds())
+
+    def get_statistics(self) -> dict:
+        """Return JSON serializable semiflows and bounds, naming places and transitions"""
+        return {
+            'p_semiflows': [
+                {self.net.get_place_name(place): value for place, value in semiflow.items()}
+                for semiflow in self.p_semiflows
+            ],
+            't_semiflows': [
+                {self.net.get_transition_name(transition): value
+                 for transition, value in semiflow.items()}
+                for semiflow in self.t_semiflows
+            ],
+            'conservative': self.is_conservative(),
+            'consistent': self.is_consistent(),
+            'bounds': {
+                self.net.get_place_name(place): bound
+                for place, bound in enumerate(self.get_bounds())
+            },
+            'counter_typecode': self.get_counter_typecode(),
+            'seconds': round(self.elapsed, 6),
+        }
+
+
+class InvariantsAnalyzer:
+    """
+    Computes minimal P-semiflows and T-semiflows of a CompiledNet
+    from its incidence, without exploring any marking
+
+    Incidence is taken as sparse rows of changes of each transition,
+    the same values as CompiledNet.get_dense_incidence, so nets with
+    thousands of places never build a dense matrix
+    """
+
+    def __init__(self, net: CompiledNet, max_rows: int=None) -> None:
+        self.net = net
+        self.max_rows = max_rows
+
+    def get_place_rows(self) -> list:
+        """Return incidence rows of every place, {transition: change}"""
+        rows = [{} for _ in range(self.net.places_count)]
+        for transition in range(self.net.transitions_count):
+            for place, delta in self.net.get_changes(transition):
+                rows[place][transition] = delta
+        return rows
+
+    def get_transition_rows(self) -> list:
+        """Return incidence rows of every transition, {place: change}"""
+        return [
+            dict(self.net.get_changes(transition))
+            for transition in range(self.net.transitions_count)
+        ]
+
+    def analyze(self) -> InvariantsResult:
+        """Return InvariantsResult of the net"""
+        start = time.perf_counter()
+        result = InvariantsResult(self.net)
+        result.p_semiflows = get_semiflows(self.get_place_rows(), self.max_rows)
+        result.t_semiflows = get_semiflows(self.get_transition_rows(), self.max_rows)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
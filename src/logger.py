@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+#
+# Logger module
+#
+
+
+"""Logger module"""
+
+
+# Standard packages
+import queue
+import sys
+import threading
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+## NOTE: this is empty for now
+
+
+# Verbosity levels
+QUIET = 0
+FIRINGS = 1
+DETAILED = 2
+
+# Maximum records written together
+BATCH_SIZE = 1024
+
+
+def format_firing(transition) -> str:
+    """Return one line naming fired TRANSITION"""
+    return f'fired: {transition.name}\n'
+
+
+def format_detailed_firing(transition) -> str:
+    """Return coloured line with places and tokens moved by TRANSITION"""
+    input_names = [awn.get_input_name() for awn in transition.input_awns]
+    output_names = [awn.get_output_name() for awn in transition.output_awns]
+    message_input = [
+        f'{awn.get_input_name()} releases {awn.get_weight()} tokens'
+        for awn in transition.input_awns
+    ]
+    message_output = [
+        f'{awn.get_output_name()} received {awn.get_weight()} tokens'
+        for awn in transition.output_awns
+    ]
+    return (
+        '\033[;32m running:'
+        f'\t \033[;35m [{",".join(input_names)}] => \033[;33m {transition.name} '
+        f'\033[;34m => [{",".join(output_names)}]'
+        f'\t \033[;35m {message_input}'
+        f'\t \033[;34m {message_output} \033[;37m\n'
+    )
+
+
+class FiringLogger:
+    """
+    Logs transition firings from a background thread
+
+    Firing threads only put the transition into a queue, the logger
+    thread formats records and writes them to STREAM in batches, so
+    firings never wait for I/O, VERBOSITY is QUIET, FIRINGS or DETAILED
+    """
+
+    def __init__(self, verbosity: int=FIRINGS, stream=None) -> None:
+        self.verbosity = verbosity
+        self.stream = stream if stream else sys.stdout
+        self.formatter = format_detailed_firing if verbosity >= DETAILED else format_firing
+        self.records = queue.SimpleQueue()
+        self.thread = None
+
+    def log(self, transition) -> None:
+        """Log firing of TRANSITION, never blocks"""
+        if self.verbosity > QUIET:
+            self.records.put(transition)
+
+    def write_batches(self) -> None:
+        """Logger thread loop, write records until None is received"""
+        running = True
+        while running:
+            batch = [self.records.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = batch[:batch.index(None)]
+            if batch:
+                self.stream.write(''.join(self.formatter(record) for record in batch))
+                self.stream.flush()
+
+    def start(self) -> None:
+        """Start logger thread"""
+        self.thread = threading.Thread(target=self.write_batches, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Write pending records and stop logger thread"""
+        if self.thread:
+            self.records.put(None)
+            self.thread.join()
+            self.thread = None
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+#
+# Metrics module
+#
+
+
+"""Metrics module"""
+
+
+# Standard packages
+import json
+import threading
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+## NOTE: this is empty for now
+
+
+# Latency histogram buckets, bucket B counts latencies below 2 ** B ns
+LATENCY_BUCKETS = 48
+
+
+class ThreadMetrics:
+    """Counters updated by a single thread, so they need no locks"""
+
+    def __init__(self, transitions_count: int, places_count: int) -> None:
+        self.firings = [0] * transitions_count
+        # Row of LATENCY_BUCKETS counters per transition
+        self.latencies = [0] * (transitions_count * LATENCY_BUCKETS)
+        self.lock_waits = [0] * places_count
+        self.contentions = [0] * places_count
+
+
+class MetricsCollector:
+    """
+    Collects runtime metrics of interpreted transitions and places
+
+    Every thread updates its own ThreadMetrics, they are only summed
+    when a snapshot is taken, so threads never contend on counters
+
+    Enable to fire latency is measured from tokens arriving at an
+    input place of a transition up to its next firing, lock wait is
+    only measured when a place lock is already taken
+    """
+
+    def __init__(self) -> None:
+        self.transitions = []
+        self.places = []
+        self.local = threading.local()
+        self.threads_metrics = []
+        self.threads_lock = threading.Lock()
+        # Nanoseconds since transitions are waiting to fire, 0 if not waiting
+        self.enabled_at = []
+
+    def bind(self, transitions: list, places: list) -> None:
+        """Collect metrics of interpreted TRANSITIONS and PLACES"""
+        self.transitions = transitions
+        self.places = places
+        self.enabled_at = [0] * len(transitions)
+        for transition in transitions:
+            for place in transition.input_places:
+                place.add_listener(self.get_wakeup_callback(transition.index))
+
+    def get_wakeup_callback(self, transition: int):
+        """Return callback marking TRANSITION index as waiting to fire"""
+        enabled_at = self.enabled_at
+
+        def wakeup() -> None:
+            if not enabled_at[transition]:
+                enabled_at[transition] = time.perf_counter_ns()
+        return wakeup
+
+    def get_thread_metrics(self) -> ThreadMetrics:
+        """Return counters of current thread, creating them on first use"""
+        try:
+            return self.local.metrics
+        except AttributeError:
+            metrics = ThreadMetrics(len(self.transitions), len(self.places))
+            with self.threads_lock:
+                self.threads_metrics.append(metrics)
+            self.local.metrics = metrics
+            return metrics
+
+    def count_firing(self, transition: int) -> None:
+        """Count firing of TRANSITION index and its enable to fire latency"""
+        metrics = self.get_thread_metrics()
+        metrics.firings[transition] += 1
+        enabled_at = self.enabled_at[transition]
+        if enabled_at:
+            self.enabled_at[transition] = 0
+            latency = time.perf_counter_ns() - enabled_at
+            bucket = min(latency.bit_length(), LATENCY_BUCKETS - 1)
+            metrics.latencies[transition * LATENCY_BUCKETS + bucket] += 1
+
+    def acquire_lock(self, place) -> None:
+        """Acquire lock of PLACE, measuring time waited if it is taken"""
+        if place.lock.acquire(False):
+            return
+        start = time.perf_counter_ns()
+        place.lock.acquire()
+        metrics = self.get_thread_metrics()
+        metrics.lock_waits[place.index] += time.perf_counter_ns() - start
+        metrics.contentions[place.index] += 1
+
+    @staticmethod
+    def get_latency_summary(histogram: list) -> dict:
+        """Return count, percentiles upper bounds and HISTOGRAM in ns"""
+        count = sum(histogram)
+        summary = {'count': count}
+        for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+            accumulated = 0
+            for bucket, amount in enumerate(histogram):
+                accumulated += amount
+                if count and accumulated >= fraction * count:
+                    summary[name] = 1 << bucket
+                    break
+            else:
+                summary[name] = None
+        summary['histogram'] = {
+            str(1 << bucket): amount for bucket, amount in enumerate(histogram) if amount
+        }
+        return summary
+
+    def snapshot(self) -> dict:
+        """Return JSON serializable sum of every thread metrics"""
+        with self.threads_lock:
+            threads_metrics = list(self.threads_metrics)
+        transitions = {}
+        for index, transition in enumerate(self.transitions):
+            start = index * LATENCY_BUCKETS
+            histogram = [0] * LATENCY_BUCKETS
+            for metrics in threads_metrics:
+                for bucket, amount in enumerate(metrics.latencies[start:start + LATENCY_BUCKETS]):
+                    histogram[bucket] += amount
+            transitions[transition.name] = {
+                'firings': sum(metrics.firings[index] for metrics in threads_metrics),
+                'latency_ns': self.get_latency_summary(histogram),
+            }
+        places = {
+            place.name: {
+                'tokens': place.count(),
+                'lock_wait_ns': sum(metrics.lock_waits[index] for metrics in threads_metrics),
+                'contentions': sum(metrics.contentions[index] for metrics in threads_metrics),
+            }
+            for index, place in enumerate(self.places)
+        }
+        return {
+            'timestamp': time.time(),
+            'threads': len(threads_metrics),
+            'transitions': transitions,
+            'places': places,
+        }
+
+
+class MetricsDumper:
+    """
+    Appends a snapshot of COLLECTOR as a JSON line to file at PATH
+    every INTERVAL seconds, places tokens of successive lines are the
+    occupancy time series
+    """
+
+    def __init__(self, collector: MetricsCollector, path: str, interval: float=1.0) -> None:
+        self.collector = collector
+        self.path = path
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def dump(self) -> None:
+        """Append one snapshot line"""
+        with open(self.path, 'a', encoding='UTF-8') as f:
+            f.write(json.dumps(self.collector.snapshot()))
+            f.write('\n')
+
+    def work(self) -> None:
+        """Dumper thread loop, dump until stopped"""
+        while not self.stop_event.wait(self.interval):
+            self.dump()
+
+    def start(self) -> None:
+        """Start dumper thread"""
+        self.thread = threading.Thread(target=self.work, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop dumper thread and dump a last snapshot"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.dump()
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -14,14 +14,27 @@
 ## NOTE: this is empty for now
 
 # Local packages
-## NOTE: this is empty for now
+from src.symbols import SymbolTable
 
 
 class PetriNetNode:
     """Petri net node class"""
 
-    def __init__(self, transitions: list) -> None:
+    def __init__(
+            self,
+            transitions: list,
+            places: list = None,
+            symbols = None
+            ) -> None:
         self.transitions = transitions
+        self.places = places if places else []
+        # Symbols table filled while parsing, see src.symbols, built
+        # from PLACES and TRANSITIONS when not given
+        if symbols is None:
+            symbols = SymbolTable()
+            for node in self.places + self.transitions:
+                symbols.define(node)
+        self.symbols = symbols
 
 
 class PlaceNode:
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+#
+# Parallelization module
+#
+
+
+"""Parallelization module"""
+
+
+# Standard packages
+import multiprocessing
+from multiprocessing import shared_memory
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.compilation import CompiledNet
+
+
+# Seconds a worker without enabled transitions sleeps before trying again
+IDLE_SLEEP = 0.001
+
+# Seconds between checks of the coordinator
+POLL_INTERVAL = 0.01
+
+
+def lock_stripes(locks: list, stripes: tuple) -> None:
+    """Acquire LOCKS of STRIPES, which must be sorted"""
+    for stripe in stripes:
+        locks[stripe].acquire()
+
+
+def unlock_stripes(locks: list, stripes: tuple) -> None:
+    """Release LOCKS of STRIPES"""
+    for stripe in reversed(stripes):
+        locks[stripe].release()
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def work_process(
+        memory_name: str,
+        places_count: int,
+        locks: list,
+        partition: list,
+        work,
+        stop,
+        counters,
+        in_flight,
+        slot: int
+        ) -> None:
+    """
+    Worker process loop, fire transitions of PARTITION until STOP
+
+    PARTITION holds (transition, preset, postset, preset stripes,
+    postset stripes), firings are counted in COUNTERS[SLOT] and
+    IN_FLIGHT[SLOT] is 1 while tokens are consumed but not produced
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    view = memory.buf[:8 * places_count]
+    marking = view.cast('q')
+    fired = 0
+    try:
+        while not stop.is_set():
+            progress = False
+            for transition, preset, postset, pre_stripes, post_stripes in partition:
+                lock_stripes(locks, pre_stripes)
+                enabled = True
+                for place, weight in preset:
+                    if marking[place] < weight:
+                        enabled = False
+                        break
+                if enabled:
+                    for place, weight in preset:
+                        marking[place] -= weight
+                    in_flight[slot] = 1
+                unlock_stripes(locks, pre_stripes)
+                if not enabled:
+                    continue
+                if work is not None:
+                    work(transition)
+                lock_stripes(locks, post_stripes)
+                for place, weight in postset:
+                    marking[place] += weight
+                in_flight[slot] = 0
+                unlock_stripes(locks, post_stripes)
+                fired += 1
+                counters[slot] = fired
+                progress = True
+            if not progress:
+                time.sleep(IDLE_SLEEP)
+    finally:
+        marking.release()
+        view.release()
+        memory.close()
+
+
+class ProcessPoolRunner:
+    """
+    Runs transitions of a CompiledNet on a pool of worker processes
+
+    The marking lives in a shared memory array of 64 bits integers,
+    places are guarded by STRIPES shared locks (place P uses lock
+    P % STRIPES) taken in ascending order, so every firing is atomic
+    and transitions are partitioned round robin between processes
+
+    WORK is called with the transition index between consuming and
+    producing tokens, it must be picklable when processes are spawned
+    """
+
+    def __init__(
+            self,
+            net: CompiledNet,
+            processes: int=4,
+            work=None,
+            stripes: int=64,
+            context=None
+            ) -> None:
+        assert processes > 0
+        self.net = net
+        self.processes_count = processes
+        self.work = work
+        self.stripes = max(1, min(stripes, net.places_count))
+        self.context = context if context else multiprocessing.get_context()
+        self.marking = list(net.initial_marking)
+        self.firings = 0
+        self.deadlocked = False
+
+    def get_stripes(self, entries: list) -> tuple:
+        """Return sorted lock stripes of (place, weight) ENTRIES"""
+        return tuple(sorted({place % self.stripes for place, _ in entries}))
+
+    def get_partitions(self) -> list:
+        """Return transitions split round robin between processes"""
+        partitions = [[] for _ in range(self.processes_count)]
+        for transition in range(self.net.transitions_count):
+            preset = tuple(self.net.get_preset(transition))
+            postset = tuple(self.net.get_postset(transition))
+            partitions[transition % self.processes_count].append((
+                transition, preset, postset,
+                self.get_stripes(preset), self.get_stripes(postset)
+            ))
+        return partitions
+
+    def is_deadlocked(self, marking, locks: list, in_flight) -> bool:
+        """Check under every lock that nothing is firing nor enabled"""
+        every_stripe = tuple(range(self.stripes))
+        lock_stripes(locks, every_stripe)
+        try:
+            return not any(in_flight) and not self.net.get_enabled_transitions(marking)
+        finally:
+            unlock_stripes(locks, every_stripe)
+
+    # pylint: disable=too-many-locals
+    def run(
+            self,
+            max_firings: int=None,
+            duration: float=None,
+            stop_on_deadlock: bool=True
+            ) -> int:
+        """
+        Run workers until at least MAX_FIRINGS, DURATION seconds or
+        deadlock, return amount of firings
+
+        Final marking is kept in MARKING
+        """
+        size = 8 * self.net.places_count
+        memory = shared_memory.SharedMemory(create=True, size=max(8, size))
+        view = memory.buf[:size]
+        marking = view.cast('q')
+        for place, tokens in enumerate(self.marking):
+            marking[place] = tokens
+        locks = [self.context.Lock() for _ in range(self.stripes)]
+        stop = self.context.Event()
+        counters = self.context.Array('q', self.processes_count, lock=False)
+        in_flight = self.context.Array('b', self.processes_count, lock=False)
+        workers = [
+            self.context.Process(
+                target=work_process,
+                args=(
+                    memory.name, self.net.places_count, locks, partition, self.work,
+                    stop, counters, in_flight, slot
+                ),
+                daemon=True
+            )
+            for slot, partition in enumerate(self.get_partitions())
+        ]
+        start = time.monotonic()
+        self.deadlocked = False
+        try:
+            for worker in workers:
+                worker.start()
+            while True:
+                time.sleep(POLL_INTERVAL)
+                if max_firings is not None and sum(counters) >= max_firings:
+                    break
+                if duration is not None and time.monotonic() - start >= duration:
+                    break
+                if stop_on_deadlock and self.is_deadlocked(marking, locks, in_flight):
+                    self.deadlocked = True
+                    break
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+            self.marking = list(marking)
+            self.firings += sum(counters)
+            marking.release()
+            view.release()
+            memory.close()
+            memory.unlink()
+        return self.firings
+
+    def get_marking_dict(self) -> dict:
+        """Return current marking as {place name: tokens}"""
+        return self.net.get_marking_dict(self.marking)
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -20,6 +20,7 @@ from src.token import(
 from src.node import (
     PetriNetNode, PlaceNode, TransitionNode, AwnNode,
 )
+from src.symbols import SymbolTable
 
 
 class Parser:
@@ -27,19 +28,23 @@ class Parser:
 
     def __init__(self) -> None:
         self.index = 0
-        self.tokens = []
+        self.tokens = iter(())
+        self.current_token = None
         self.places_list = []
         self.transitions_list = []
+        self.symbols = SymbolTable()
 
     def get_current_token(self) -> AnnotationToken:
         """Returns current token"""
-        return self.tokens[self.index] if self.index < len(self.tokens) else None
+        return self.current_token
 
     def eat(self, token_type: AnnotationTokenTypes) -> None:
         """Eat current token, if types matchs, advance otherwise raise exception"""
-        current_token_type = self.get_current_token().ttype
+        current_token = self.get_current_token()
+        current_token_type = current_token.ttype if current_token else None
         if current_token_type is token_type:
             self.index += 1
+            self.current_token = next(self.tokens, None)
         else:
             raise SyntaxError(f'Expected {token_type} but founded {current_token_type}')
 
@@ -54,6 +59,7 @@ class Parser:
 
         while True:
             node = self.build_trainsition_node()
+            self.symbols.define(node)
             self.transitions_list.append(node)
             if self.get_current_token().ttype is not AnnotationTokenTypes.COMMA:
                 break
@@ -78,6 +84,7 @@ class Parser:
 
         while True:
             node = self.build_place_node()
+            self.symbols.define(node)
             self.places_list.append(node)
             if self.get_current_token().ttype is not AnnotationTokenTypes.COMMA:
                 break
@@ -91,16 +98,16 @@ class Parser:
         self.eat(AnnotationTokenTypes.PLACE)
         return PlaceNode(name, 1)
 
-    def build_place_or_transition_node(self):
-        """Returns Place or Transition node"""
-        if self.get_current_token().ttype is AnnotationTokenTypes.TRANSITION:
-            return self.build_trainsition_node()
-        elif self.get_current_token().ttype is AnnotationTokenTypes.PLACE:
-            return self.build_place_node()
-        else:
-            raise SyntaxError(
-                f'Expected "transition" or "place" but founded "{self.get_current_token().tvalue}"'
-            )
+    def eat_place_or_transition_name(self) -> str:
+        """Eat Place or Transition token and return its name"""
+        token = self.get_current_token()
+        if token is not None and token.ttype in (
+                AnnotationTokenTypes.TRANSITION, AnnotationTokenTypes.PLACE):
+            self.eat(token.ttype)
+            return token.tvalue
+        raise SyntaxError(
+            f'Expected "transition" or "place" but founded "{token.tvalue if token else None}"'
+        )
 
     def assign_awn_nodes(self) -> None:
         """
@@ -120,8 +127,7 @@ class Parser:
 
     def get_refereced_transition_or_place(self) -> str:
         """Returns next transition or place node using reference name"""
-        next_node = self.build_place_or_transition_node()
-        return self.search_node_by_name(next_node.name)
+        return self.search_node_by_name(self.eat_place_or_transition_name())
 
     def assign_single_awn_node(self) -> AwnNode:
         """Build awn ast node"""
@@ -131,8 +137,6 @@ class Parser:
         # remember that nodes are repeated in "T"/"P" and in "A"
         #
         # Nodes are "input" and "output" from the view of the awn
-        #
-        # Maybe in a future could be implemented a symbols table for this
         self.eat(AnnotationTokenTypes.LBRACE)
         input_node = self.get_refereced_transition_or_place()
         self.eat(AnnotationTokenTypes.COMMA)
@@ -167,14 +171,7 @@ class Parser:
 
     def search_node_by_name(self, name:str):
         """Return transition or place node with same name"""
-        result = None
-        for node in (self.transitions_list + self.places_list):
-            if node.name == name:
-                result = node
-                break
-        if result is None:
-            raise Exception(f'{name} referenced before assignment')
-        return result
+        return self.symbols.lookup(name)
 
     def assign_place_starting_amounts(self) -> None:
         """Assign starting amounts to places in list"""
@@ -182,9 +179,6 @@ class Parser:
         self.eat(AnnotationTokenTypes.EQUAL)
         self.eat(AnnotationTokenTypes.LBRACE)
 
-        # Maybe in a future could be implemented a
-        # symbols table to assign these amounts
-
         while True:
             self.eat(AnnotationTokenTypes.MOMENT_ZERO)
             self.eat(AnnotationTokenTypes.LPAREN)
@@ -213,14 +207,22 @@ class Parser:
                 self.assign_awn_nodes()
             elif self.get_current_token().ttype is AnnotationTokenTypes.MOMENT_ZERO:
                 self.assign_place_starting_amounts()
-        return PetriNetNode(self.transitions_list)
+            else:
+                raise SyntaxError(
+                    f'Expected "P", "T", "A" or "m0" but founded "{self.get_current_token().tvalue}"'
+                )
+        return PetriNetNode(self.transitions_list, self.places_list, self.symbols)
 
-    def parse(self, tokens: list) -> PetriNetNode:
+    def parse(self, tokens) -> PetriNetNode:
         """
         Parse Petri nets TOKENS into PetriNetNode
+
+        TOKENS can be a list or any iterable, like Lexer.tokenize_stream,
+        tokens are consumed lazily one by one
         """
-        assert tokens
-        self.tokens = tokens
+        self.tokens = iter(tokens)
+        self.current_token = next(self.tokens, None)
+        assert self.current_token
         return self.build_petri_net_node()
 
 
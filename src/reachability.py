@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+#
+# Reachability module
+#
+
+
+"""Reachability module"""
+
+
+# Standard packages
+from array import array
+from collections import deque
+import json
+import sys
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.compilation import CompiledNet
+
+
+# First byte of markings with some place over 255 tokens
+WIDE_MARKING_PREFIX = b'\xff'
+
+# Dead markings kept as examples in results
+DEADLOCK_EXAMPLES = 10
+
+
+def pack_marking(marking: list) -> bytes:
+    """
+    Return compact bytes key of MARKING, one byte per place when every
+    place has less than 256 tokens, otherwise 8 bytes per place
+
+    Both encodings have different lengths, so keys never collide
+    """
+    try:
+        return bytes(marking)
+    except ValueError:
+        return WIDE_MARKING_PREFIX + array('q', marking).tobytes()
+
+
+def unpack_marking(key: bytes, places_count: int) -> list:
+    """Return marking packed in KEY by pack_marking"""
+    if len(key) == places_count:
+        return list(key)
+    return array('q', key[1:]).tolist()
+
+
+class ReachabilityResult:
+    """Statistics and, optionally, graph of an exploration"""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, net: CompiledNet) -> None:
+        self.net = net
+        self.states = 0
+        self.edges = 0
+        self.complete = False
+        self.stop_reason = None
+        self.deadlocks = 0
+        self.deadlock_examples = []
+        self.bounds = [0] * net.places_count
+        self.memory = 0
+        self.elapsed = 0.0
+        # Only filled when the explorer keeps the graph
+        self.state_keys = []
+        self.graph_edges = array('q')
+
+    def get_statistics(self) -> dict:
+        """Return JSON serializable statistics"""
+        return {
+            'states': self.states,
+            'edges': self.edges,
+            'complete': self.complete,
+            'stop_reason': self.stop_reason,
+            'deadlocks': self.deadlocks,
+            'deadlock_examples': [
+                self.net.get_marking_dict(marking) for marking in self.deadlock_examples
+            ],
+            'bounds': self.net.get_marking_dict(self.bounds),
+            'memory_bytes': self.memory,
+            'seconds': round(self.elapsed, 6),
+        }
+
+    def get_markings(self):
+        """Yield (state id, marking) of kept graph"""
+        places_count = self.net.places_count
+        for state, key in enumerate(self.state_keys):
+            yield state, unpack_marking(key, places_count)
+
+    def get_edges(self):
+        """Yield (source state, transition, target state) of kept graph"""
+        edges = self.graph_edges
+        for index in range(0, len(edges), 3):
+            yield edges[index], edges[index + 1], edges[index + 2]
+
+    def export_statistics(self, stream) -> None:
+        """Write statistics as JSON to STREAM"""
+        json.dump(self.get_statistics(), stream, indent=2)
+        stream.write('\n')
+
+    def export_json(self, stream) -> None:
+        """Write statistics and kept graph as JSON to STREAM"""
+        names = self.net.place_names
+        json.dump({
+            'statistics': self.get_statistics(),
+            'places': names,
+            'states': [marking for _, marking in self.get_markings()],
+            'edges': [
+                [source, self.net.get_transition_name(transition), target]
+                for source, transition, target in self.get_edges()
+            ],
+        }, stream)
+        stream.write('\n')
+
+    def export_dot(self, stream) -> None:
+        """Write kept graph in Graphviz DOT format to STREAM"""
+        stream.write('digraph reachability {\n')
+        for state, marking in self.get_markings():
+            label = ','.join(str(tokens) for tokens in marking)
+            stream.write(f'  s{state} [label="{label}"];\n')
+        for source, transition, target in self.get_edges():
+            name = self.net.get_transition_name(transition)
+            stream.write(f'  s{source} -> s{target} [label="{name}"];\n')
+        stream.write('}\n')
+
+
+class ReachabilityExplorer:
+    """
+    Explores every reachable marking of a CompiledNet
+
+    ORDER is 'bfs' or 'dfs', visited markings are kept packed as bytes
+    (see pack_marking) in a hash set, or a dict from key to state id
+    when KEEP_GRAPH, exploration stops after MAX_STATES states or when
+    the estimated memory goes over MAX_MEMORY bytes
+
+    PROGRESS is called with the result every PROGRESS_INTERVAL states
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            net: CompiledNet,
+            order: str='bfs',
+            max_states: int=None,
+            max_memory: int=None,
+            keep_graph: bool=False,
+            progress=None,
+            progress_interval: int=100_000
+            ) -> None:
+        if order not in ('bfs', 'dfs'):
+            raise Exception(f'Unknown exploration order {order}, expected "bfs" or "dfs"')
+        self.net = net
+        self.order = order
+        self.max_states = max_states
+        self.max_memory = max_memory
+        self.keep_graph = keep_graph
+        self.progress = progress
+        self.progress_interval = progress_interval
+        # Estimated bytes of visited keys
+        self.memory = 0
+        self.presets = [tuple(net.get_preset(t)) for t in range(net.transitions_count)]
+        self.changes = [net.get_changes(t) for t in range(net.transitions_count)]
+
+    def get_successors(self, marking: list):
+        """Yield (transition, successor marking) of MARKING"""
+        for transition, preset in enumerate(self.presets):
+            for place, weight in preset:
+                if marking[place] < weight:
+                    break
+            else:
+                successor = marking.copy()
+                for place, delta in self.changes[transition]:
+                    successor[place] += delta
+                yield transition, successor
+
+    def get_stop_reason(self, result: ReachabilityResult, visited) -> str:
+        """Return why exploration must stop now, or None"""
+        if self.max_states is not None and result.states >= self.max_states:
+            return 'max_states'
+        if self.max_memory is not None:
+            result.memory = self.memory + sys.getsizeof(visited)
+            if result.memory >= self.max_memory:
+                return 'max_memory'
+        return None
+
+    # pylint: disable=too-many-branches,too-many-locals
+    def explore(self, marking: list=None) -> ReachabilityResult:
+        """Explore markings reachable from MARKING, initial one by default"""
+        start = time.perf_counter()
+        result = ReachabilityResult(self.net)
+        places_count = self.net.places_count
+        initial = list(marking if marking is not None else self.net.initial_marking)
+        initial_key = pack_marking(initial)
+        # Key => state id when keeping graph, otherwise just keys
+        visited = {initial_key: 0} if self.keep_graph else {initial_key}
+        if self.keep_graph:
+            result.state_keys.append(initial_key)
+        self.memory = sys.getsizeof(initial_key)
+        frontier = deque([initial_key])
+        take = frontier.popleft if self.order == 'bfs' else frontier.pop
+        result.states = 1
+        bounds = result.bounds
+        result.stop_reason = self.get_stop_reason(result, visited)
+
+        while frontier and result.stop_reason is None:
+            key = take()
+            current = unpack_marking(key, places_count)
+            for place, tokens in enumerate(current):
+                if tokens > bounds[place]:
+                    bounds[place] = tokens
+            has_successors = False
+            for transition, successor in self.get_successors(current):
+                has_successors = True
+                result.edges += 1
+                successor_key = pack_marking(successor)
+                if successor_key not in visited:
+                    if self.keep_graph:
+                        visited[successor_key] = result.states
+                        result.state_keys.append(successor_key)
+                    else:
+                        visited.add(successor_key)
+                    self.memory += sys.getsizeof(successor_key)
+                    frontier.append(successor_key)
+                    result.states += 1
+                    if self.progress and result.states % self.progress_interval == 0:
+                        self.progress(result)
+                if self.keep_graph:
+                    result.graph_edges.extend(
+                        (visited[key], transition, visited[successor_key])
+                    )
+            if not has_successors:
+                result.deadlocks += 1
+                if len(result.deadlock_examples) < DEADLOCK_EXAMPLES:
+                    result.deadlock_examples.append(current)
+            result.stop_reason = self.get_stop_reason(result, visited)
+
+        result.complete = not frontier
+        if result.complete:
+            result.stop_reason = None
+        result.memory = self.memory + sys.getsizeof(visited)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
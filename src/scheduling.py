@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+#
+# Scheduling module
+#
+
+
+"""Scheduling module"""
+
+
+# Standard packages
+import queue
+import threading
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+## NOTE: this is empty for now
+
+
+class ThreadPoolScheduler:
+    """
+    Runs Petri net transitions on a fixed pool of worker threads
+
+    Transitions are queued when one of their input places receives
+    tokens, workers pull them from the ready queue and try to fire,
+    so the amount of threads does not depend on the net size
+    """
+
+    def __init__(self, transitions: list, workers: int=4) -> None:
+        assert workers > 0
+        self.transitions = transitions
+        self.workers_count = workers
+        self.workers = []
+        self.ready_queue = queue.SimpleQueue()
+        # Transitions waiting in ready queue, avoids queueing them twice,
+        # races only queue a transition twice which is harmless
+        self.queued = set()
+        self.stop_event = threading.Event()
+        for transition in transitions:
+            for place in transition.input_places:
+                place.add_listener(self.get_scheduler_callback(transition))
+
+    def get_scheduler_callback(self, transition):
+        """Return callback that schedules TRANSITION"""
+        return lambda: self.schedule(transition)
+
+    def schedule(self, transition) -> None:
+        """Put TRANSITION into ready queue unless it is already there"""
+        if transition in self.queued:
+            return
+        self.queued.add(transition)
+        self.ready_queue.put(transition)
+
+    def work(self) -> None:
+        """Worker loop, fire ready transitions until stopped"""
+        while not self.stop_event.is_set():
+            transition = self.ready_queue.get()
+            if transition is None:
+                # Put by stop, one per worker
+                break
+            self.queued.discard(transition)
+            # A fired transition may still be enabled
+            if transition.fire():
+                self.schedule(transition)
+
+    def start(self) -> None:
+        """Schedule every transition once and start workers"""
+        for transition in self.transitions:
+            self.schedule(transition)
+        self.workers = [
+            threading.Thread(target=self.work, daemon=True)
+            for _ in range(self.workers_count)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self) -> None:
+        """Stop workers and wait for them"""
+        self.stop_event.set()
+        for _ in self.workers:
+            self.ready_queue.put(None)
+        for worker in self.workers:
+            worker.join()
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+#
+# Simulation module
+#
+
+
+"""Simulation module"""
+
+
+# Standard packages
+import random
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.compilation import CompiledNet
+
+
+class RandomPolicy:
+    """Select uniformly among enabled transitions, reproducible with SEED"""
+
+    def __init__(self, seed=None) -> None:
+        self.random = random.Random(seed)
+
+    def select(self, enabled: list) -> int:
+        """Return transition to fire from non-empty ENABLED transitions"""
+        return enabled[int(self.random.random() * len(enabled))]
+
+
+class RoundRobinPolicy:
+    """Select the next enabled transition after the last one fired"""
+
+    def __init__(self) -> None:
+        self.last = -1
+
+    def select(self, enabled: list) -> int:
+        """Return transition to fire from non-empty ENABLED transitions"""
+        following = [transition for transition in enabled if transition > self.last]
+        self.last = min(following) if following else min(enabled)
+        return self.last
+
+
+class PriorityPolicy:
+    """
+    Select the enabled transition with highest priority
+
+    PRIORITIES maps transition index to priority, missing transitions
+    have priority 0, ties are broken by lowest index
+    """
+
+    def __init__(self, priorities: dict) -> None:
+        self.priorities = priorities
+
+    @classmethod
+    def from_names(cls, net: CompiledNet, priorities: dict):
+        """Return policy from PRIORITIES keyed by transition name"""
+        return cls({
+            net.get_transition_index(name): priority
+            for name, priority in priorities.items()
+        })
+
+    def select(self, enabled: list) -> int:
+        """Return transition to fire from non-empty ENABLED transitions"""
+        get = self.priorities.get
+        return max(enabled, key=lambda transition: (get(transition, 0), -transition))
+
+
+class TokenGameEngine:
+    """
+    Fires transitions of a CompiledNet one by one in a single thread
+
+    There are no threads, sleeps nor prints, every firing is chosen
+    by POLICY so runs are reproducible
+
+    Enabled transitions are kept in a live set, after a firing only
+    consumers of the changed places are checked again, so the cost of
+    a firing depends on its arcs instead of on the net size
+    """
+
+    def __init__(self, net: CompiledNet, policy=None, marking=None) -> None:
+        self.net = net
+        self.policy = policy if policy else RandomPolicy()
+        self.presets = [tuple(net.get_preset(t)) for t in range(net.transitions_count)]
+        self.changes = [net.get_changes(t) for t in range(net.transitions_count)]
+        self.dependents = [net.get_dependents(t) for t in range(net.transitions_count)]
+        self.firings = 0
+        self.firing_counts = [0] * net.transitions_count
+        # Enabled transitions, in no particular order, and their positions
+        self.enabled = []
+        self.enabled_positions = {}
+        self.marking = []
+        self.reset(marking)
+
+    def reset(self, marking=None) -> None:
+        """Set current marking to MARKING, initial one by default"""
+        self.marking = list(marking if marking is not None else self.net.initial_marking)
+        self.enabled = [
+            transition for transition in range(self.net.transitions_count)
+            if self.is_enabled(transition)
+        ]
+        self.enabled_positions = {
+            transition: position for position, transition in enumerate(self.enabled)
+        }
+
+    def is_enabled(self, transition: int) -> bool:
+        """Check that TRANSITION can fire on current marking"""
+        marking = self.marking
+        for place, weight in self.presets[transition]:
+            if marking[place] < weight:
+                return False
+        return True
+
+    def get_enabled_transitions(self) -> list:
+        """Return enabled transitions on current marking, sorted"""
+        return sorted(self.enabled)
+
+    def update_enabled(self, transition: int) -> None:
+        """Check again enabling of transitions depending on fired TRANSITION"""
+        marking = self.marking
+        presets = self.presets
+        enabled = self.enabled
+        positions = self.enabled_positions
+        for dependent in self.dependents[transition]:
+            for place, weight in presets[dependent]:
+                if marking[place] < weight:
+                    position = positions.pop(dependent, None)
+                    if position is not None:
+                        # Move last transition into the hole
+                        last = enabled.pop()
+                        if last != dependent:
+                            enabled[position] = last
+                            positions[last] = position
+                    break
+            else:
+                if dependent not in positions:
+                    positions[dependent] = len(enabled)
+                    enabled.append(dependent)
+
+    def fire(self, transition: int) -> None:
+        """Fire TRANSITION, raise exception if it is not enabled"""
+        if transition not in self.enabled_positions:
+            raise Exception(
+                f'{self.net.get_transition_name(transition)}: Resources not available'
+            )
+        for place, delta in self.changes[transition]:
+            self.marking[place] += delta
+        self.update_enabled(transition)
+        self.firings += 1
+        self.firing_counts[transition] += 1
+
+    def step(self):
+        """Fire one transition chosen by policy, return it or None on deadlock"""
+        if not self.enabled:
+            return None
+        transition = self.policy.select(self.enabled)
+        self.fire(transition)
+        return transition
+
+    def run(self, max_firings: int=None) -> int:
+        """
+        Fire up to MAX_FIRINGS transitions or until deadlock,
+        without MAX_FIRINGS live nets run forever, return amount fired
+        """
+        marking = self.marking
+        changes = self.changes
+        counts = self.firing_counts
+        enabled = self.enabled
+        update_enabled = self.update_enabled
+        select = self.policy.select
+        fired = 0
+        while enabled and (max_firings is None or fired < max_firings):
+            transition = select(enabled)
+            for place, delta in changes[transition]:
+                marking[place] += delta
+            update_enabled(transition)
+            counts[transition] += 1
+            fired += 1
+        self.firings += fired
+        return fired
+
+    def is_deadlocked(self) -> bool:
+        """Check that no transition is enabled on current marking"""
+        return not self.enabled
+
+    def get_marking_dict(self) -> dict:
+        """Return current marking as {place name: tokens}"""
+        return self.net.get_marking_dict(self.marking)
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+#
+# Symbols module
+#
+
+
+"""Symbols module"""
+
+
+# Standard packages
+## NOTE: this is empty for now
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+## NOTE: this is empty for now
+
+
+class SymbolTable:
+    """Index of Petri net nodes by name, used to resolve references"""
+
+    def __init__(self) -> None:
+        self.symbols = {}
+
+    def define(self, node) -> None:
+        """Add NODE to table, raise exception if its name is already declared"""
+        if node.name in self.symbols:
+            raise Exception(f'{node.name} declared more than once')
+        self.symbols[node.name] = node
+
+    def lookup(self, name: str):
+        """Return node named NAME, raise exception if it is not declared"""
+        node = self.symbols.get(name)
+        if node is None:
+            raise Exception(f'{name} referenced before assignment')
+        return node
+
+    def get(self, name: str, default=None):
+        """Return node named NAME or DEFAULT if it is not declared"""
+        return self.symbols.get(name, default)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.symbols
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
@@ -8,7 +8,8 @@
 
 
 # Standard packages
-from re import match as re_match
+from codecs import getincrementaldecoder
+from re import compile as re_compile
 
 # Installed packages
 ## NOTE: this is empty for now
@@ -19,192 +20,155 @@ from src.token import (
     )
 
 
+# Lexical rules, order matters: first matching rule wins
+#
+# Each rule is (group name, regex, token type, token value), rules
+# without token type are skipped and rules without token value use
+# the matched text
+LEXICAL_RULES = (
+    ('COMMENT', r'#[^\n]*\n?', None, None),
+    ('WHITESPACE', r' +', None, None),
+    ('NEWLINE', r'\n', None, None),
+    ('PLACES', r'P', AnnotationTokenTypes.PLACES, 'P'),
+    ('PLACE', r'p[0-9]+', AnnotationTokenTypes.PLACE, None),
+    ('TRANSITIONS', r'T', AnnotationTokenTypes.TRANSITIONS, 'T'),
+    ('TRANSITION', r't[0-9]+', AnnotationTokenTypes.TRANSITION, None),
+    ('AWN', r'A', AnnotationTokenTypes.AWN, 'A'),
+    ('MOMENT_ZERO', r'm0', AnnotationTokenTypes.MOMENT_ZERO, 'M0'),
+    ('LPAREN', r'\(', AnnotationTokenTypes.LPAREN, '('),
+    ('RPAREN', r'\)', AnnotationTokenTypes.RPAREN, '('),
+    ('LBRACE', r'\{', AnnotationTokenTypes.LBRACE, '{'),
+    ('RBRACE', r'\}', AnnotationTokenTypes.RBRACE, '}'),
+    ('EQUAL', r'=', AnnotationTokenTypes.EQUAL, '='),
+    ('NUMBER', r'[0-9]+', AnnotationTokenTypes.NUMBER, None),
+    ('COMMA', r',', AnnotationTokenTypes.COMMA, ','),
+)
+
+# Single master regex with one named group per rule
+MASTER_PATTERN = re_compile(
+    '|'.join(f'(?P<{name}>{regex})' for name, regex, _, _ in LEXICAL_RULES)
+)
+
+# Group name => (token type, token value)
+TOKEN_BUILDERS = {name: (ttype, tvalue) for name, _, ttype, tvalue in LEXICAL_RULES}
+
+# Default amount of chars or bytes read per chunk when streaming
+CHUNK_SIZE = 1024 ** 2
+
+
 class Lexer:
     """This is responsive of break Petri nets annotation into tokens"""
 
     def __init__(self) -> None:
         self.index = 0
         self.text = ''
+        # Position of text inside whole annotation, used when streaming
+        self.text_offset = 0
+        self.lines_before_text = 0
+        self.line_start_before_text = 0
 
-    def advance(self, number: int=1) -> None:
-        """Advance index NUMBER amount of chars"""
-        self.index += number
-
-    def advance_line(self) -> None:
-        """Advance index to next line"""
-        while not self.get_current_text().startswith('\n'):
-            self.advance()
-        self.advance()
+    def reset(self, text: str='') -> None:
+        """Start tokenizing TEXT from the beginning"""
+        self.index = 0
+        self.text = text
+        self.text_offset = 0
+        self.lines_before_text = 0
+        self.line_start_before_text = 0
 
     def get_current_text(self) -> str:
-        """Get current text left"""
-        if self.index < len(self.text):
-            return self.text[self.index:]
-        else:
-            return ''
-
-    def skip_whitespaces(self) -> None:
-        """Advance until no whitespaces are left"""
-        while self.get_current_text().startswith(' '):
-            self.advance(1)
-
-    def tokenize_number(self) -> AnnotationToken:
-        """Tokenize number"""
-        number = ''
-        while self.get_current_text()[0].isdigit():
-            number += self.get_current_text()[0]
-            self.advance()
-        number = int(number)
-        return AnnotationToken(AnnotationTokenTypes.NUMBER, number)
+        """Get current line left"""
+        end = self.text.find('\n', self.index)
+        return self.text[self.index:end if end >= 0 else len(self.text)]
+
+    def get_line_and_column(self, index: int) -> tuple:
+        """Return 1-based line and column of INDEX in text"""
+        line = self.lines_before_text + self.text.count('\n', 0, index) + 1
+        line_start = self.text.rfind('\n', 0, index) + 1
+        if line_start == 0:
+            line_start = self.line_start_before_text - self.text_offset
+        return line, index - line_start + 1
+
+    def raise_invalid_syntax(self) -> None:
+        """Raise syntax error at current index"""
+        line, column = self.get_line_and_column(self.index)
+        raise SyntaxError(
+            f'Invalid syntax at line {line}, column {column}! =>\n'
+            f'{self.get_current_text()}'
+        )
+
+    def discard_consumed_text(self) -> None:
+        """Drop already tokenized text, keeping track of lines"""
+        newlines = self.text.count('\n', 0, self.index)
+        if newlines:
+            self.lines_before_text += newlines
+            self.line_start_before_text = (
+                self.text_offset + self.text.rfind('\n', 0, self.index) + 1
+            )
+        self.text_offset += self.index
+        self.text = self.text[self.index:]
+        self.index = 0
+
+    def scan_tokens(self, final: bool=True):
+        """
+        Yield tokens from text at index in a single pass
+
+        Unless FINAL, stops before a token that could continue
+        in the text not read yet
+        """
+        text = self.text
+        match_at = MASTER_PATTERN.match
+        builders = TOKEN_BUILDERS
+        number_type = AnnotationTokenTypes.NUMBER
+        length = len(text)
+
+        while self.index < length:
+            match = match_at(text, self.index)
+            if match is None:
+                # Could be a 'm' or 'p' waiting for the rest of the token
+                if not final and length - self.index < 2:
+                    break
+                self.raise_invalid_syntax()
+            if not final and match.end() == length:
+                break
+            ttype, tvalue = builders[match.lastgroup]
+            self.index = match.end()
+            if ttype is None:
+                continue
+            if tvalue is None:
+                tvalue = match.group()
+                if ttype is number_type:
+                    tvalue = int(tvalue)
+            yield AnnotationToken(ttype, tvalue)
+
+    def generate_tokens(self, annotation: str):
+        """Yield Petri ANNOTATION tokens in a single pass"""
+        self.reset(annotation)
+        yield from self.scan_tokens()
 
     def tokenize(self, annotation: str) -> list:
         """Break Petri ANNOTATION into tokens"""
         assert annotation
-        self.text = annotation
-
-        result = []
-
-        while self.get_current_text():
-
-            # Skip comments
-            if self.get_current_text().startswith('#'):
-                self.advance_line()
-                continue
-
-            # Skip whitespaces
-            if self.get_current_text().startswith(' '):
-                self.skip_whitespaces()
-                continue
-
-            # Skip new lines
-            if self.get_current_text().startswith('\n'):
-                self.advance_line()
-                continue
-
-            # Tokenize PLACES
-            if self.get_current_text().startswith('P'):
-                result.append(
-                    AnnotationToken(
-                        AnnotationTokenTypes.PLACES,
-                        'P'
-                        )
-                    )
-                self.advance(1)
-                continue
-
-            # Tokenize PLACE
-            match = re_match(r'p[0-9]+', self.get_current_text())
-            if match:
-                result.append(
-                    AnnotationToken(AnnotationTokenTypes.PLACE, match.group())
-                )
-                self.advance(len(match.group()))
-                continue
-
-            # Tokenize TRANSITIONS
-            if self.get_current_text().startswith('T'):
-                result.append(
-                    AnnotationToken(
-                        AnnotationTokenTypes.TRANSITIONS,
-                        'T'
-                        )
-                    )
-                self.advance(1)
-                continue
-
-            # Tokenize TRANSITION
-            match = re_match(r't[0-9]+', self.get_current_text())
-            if match:
-                result.append(
-                    AnnotationToken(AnnotationTokenTypes.TRANSITION, match.group())
-                )
-                self.advance(len(match.group()))
-                continue
-
-            # Tokenize AWN
-            if self.get_current_text().startswith('A'):
-                result.append(
-                    AnnotationToken(
-                        AnnotationTokenTypes.AWN,
-                        'A'
-                        )
-                    )
-                self.advance(1)
-                continue
-
-            # Tokenize MOMENTS_ZERO
-            if self.get_current_text().startswith('m0'):
-                result.append(
-                    AnnotationToken(
-                        AnnotationTokenTypes.MOMENT_ZERO,
-                        'M0'
-                        )
-                    )
-                self.advance(2)
-                continue
-
-            # Tokenize LPAREN
-            if self.get_current_text().startswith('('):
-                result.append(AnnotationToken(
-                    AnnotationTokenTypes.LPAREN,
-                    '('
-                ))
-                self.advance(1)
-                continue
-
-            # Tokenize RPAREN
-            if self.get_current_text().startswith(')'):
-                result.append(AnnotationToken(
-                    AnnotationTokenTypes.RPAREN,
-                    '('
-                ))
-                self.advance(1)
-                continue
-
-            # Tokenize LBRACE
-            if self.get_current_text().startswith('{'):
-                result.append(AnnotationToken(
-                    AnnotationTokenTypes.LBRACE,
-                    '{'
-                ))
-                self.advance(1)
-                continue
-
-            # Tokenize RBRACE
-            if self.get_current_text().startswith('}'):
-                result.append(AnnotationToken(
-                    AnnotationTokenTypes.RBRACE,
-                    '}'
-                ))
-                self.advance(1)
-                continue
-
-            # Tokenize EQUAL
-            if self.get_current_text().startswith('='):
-                result.append(AnnotationToken(
-                    AnnotationTokenTypes.EQUAL,
-                    '='
-                ))
-                self.advance(1)
-                continue
-
-            # Tokenize NUMBER
-            if self.get_current_text()[0].isdigit():
-                result.append(self.tokenize_number())
-                continue
-
-            # Tokenize COMMA
-            if self.get_current_text().startswith(','):
-                result.append(AnnotationToken(
-                    AnnotationTokenTypes.COMMA,
-                    ','
-                ))
-                self.advance(1)
-                continue
-
-            raise Exception(f'Invalid syntax! =>\n{self.get_current_text()}')
-
-        return result
+        return list(self.generate_tokens(annotation))
+
+    def tokenize_stream(self, stream, chunk_size: int=CHUNK_SIZE):
+        """
+        Yield Petri annotation tokens reading STREAM by chunks
+
+        STREAM can be a text or binary file object or a mmap,
+        only the chunk being tokenized is kept in memory
+        """
+        self.reset()
+        decoder = getincrementaldecoder('utf-8')()
+        while True:
+            chunk = stream.read(chunk_size)
+            final = not chunk
+            if not isinstance(chunk, str):
+                chunk = decoder.decode(chunk, final)
+            self.discard_consumed_text()
+            self.text += chunk
+            yield from self.scan_tokens(final)
+            if final:
+                break
 
 
 if __name__ == '__main__':
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+#
+# Tracing module
+#
+
+
+"""Tracing module"""
+
+
+# Standard packages
+from array import array
+import itertools
+import json
+import mmap
+import struct
+import threading
+import time
+
+# Installed packages
+## NOTE: this is empty for now
+
+# Local packages
+from src.compilation import CompiledNet
+from src.simulation import TokenGameEngine
+
+
+# Trace record: timestamp in nanoseconds, transition index, thread id
+RECORD = struct.Struct('<qIQ')
+
+# Trace file header: magic, version, record size, first record, records,
+# places of the marking before the first record, stored right after it
+HEADER = struct.Struct('<4sHHqqq')
+MAGIC = b'PNTR'
+VERSION = 2
+
+
+class TraceRecorder:
+    """
+    Records transition firings into a preallocated ring buffer
+
+    Every record has a fixed size (see RECORD), recording is lock free
+    and safe from many threads, once CAPACITY records are kept the
+    oldest ones are overwritten, unless flushed before, CAPACITY is
+    rounded up to a power of two
+
+    Records should be read once firing threads are stopped
+    """
+
+    def __init__(self, capacity: int=1 << 20) -> None:
+        assert capacity > 0
+        self.capacity = 1 << (capacity - 1).bit_length()
+        self.buffer = bytearray(self.capacity * RECORD.size)
+        # Next record position, itertools.count is atomic under the GIL
+        self.positions = itertools.count()
+        # Position + 1 of the record in each slot, 0 while empty, set
+        # once the record is written, see get_count
+        self.stamps = array('q', bytes(8 * self.capacity))
+        # Records written to files by flush, the first one at position
+        # flushed_first
+        self.flushed = 0
+        self.flushed_first = None
+        self.record = self.build_record()
+
+    def build_record(self):
+        """
+        Return function recording firing of a transition index, with
+        everything it uses bound as locals since it runs on every firing
+        """
+        positions = self.positions
+        buffer = self.buffer
+        stamps = self.stamps
+        mask = self.capacity - 1
+        size = RECORD.size
+        pack_into = RECORD.pack_into
+        get_timestamp = time.perf_counter_ns
+        get_thread = threading.get_ident
+
+        def record(transition: int) -> None:
+            position = next(positions)
+            slot = position & mask
+            pack_into(buffer, slot * size, get_timestamp(), transition, get_thread())
+            stamps[slot] = position + 1
+        return record
+
+    def get_count(self) -> int:
+        """Return amount of records since creation, the newest written position + 1"""
+        return max(self.stamps)
+
+    def get_kept_range(self) -> tuple:
+        """Return (first, end) positions still kept in buffer"""
+        end = self.get_count()
+        return max(0, end - self.capacity), end
+
+    def get_records(self, start: int=0):
+        """Yield (timestamp, transition, thread) kept from position START"""
+        first, end = self.get_kept_range()
+        for position in range(max(first, start), end):
+            yield RECORD.unpack_from(self.buffer, (position % self.capacity) * RECORD.size)
+
+    def write_records(self, stream, start: int, end: int) -> None:
+        """Write raw records from position START to END into STREAM"""
+        view = memoryview(self.buffer)
+        while start < end:
+            offset = start % self.capacity
+            stop = min(end - start, self.capacity - offset) + offset
+            stream.write(view[offset * RECORD.size:stop * RECORD.size])
+            start += stop - offset
+
+    def get_first_marking(self, net: CompiledNet, marking) -> list:
+        """
+        Return marking of NET before the first kept record, undoing
+        kept firings from MARKING, the one reached after the last one
+        """
+        changes = [net.get_changes(transition) for transition in range(net.transitions_count)]
+        result = list(marking)
+        for _, transition, _ in self.get_records():
+            for place, delta in changes[transition]:
+                result[place] -= delta
+        return result
+
+    def save(self, path: str, marking=None) -> None:
+        """
+        Save kept records into binary trace file at PATH, with MARKING
+        before the first one, needed to replay once older records were
+        overwritten, see get_first_marking
+        """
+        first, end = self.get_kept_range()
+        marking = [] if marking is None else marking
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, first, end - first, len(marking)))
+            f.write(array('q', marking).tobytes())
+            self.write_records(f, first, end)
+
+    def get_written_end(self, start: int, end: int) -> int:
+        """Return position of the first record from START to END still being written"""
+        for position in range(start, end):
+            if self.stamps[position % self.capacity] != position + 1:
+                return position
+        return end
+
+    def flush(self, stream) -> int:
+        """
+        Append records not flushed yet to seekable binary STREAM, return
+        amount of records lost because they were overwritten
+
+        The first flush writes the header of save and every flush
+        updates its records count, so Trace reads flushed files too,
+        records lost after the first flush leave a gap in them
+        """
+        first, end = self.get_kept_range()
+        start = max(first, self.flushed)
+        end = self.get_written_end(start, end)
+        lost = start - self.flushed
+        if self.flushed_first is None:
+            self.flushed_first = start
+            stream.write(HEADER.pack(MAGIC, VERSION, RECORD.size, start, 0, 0))
+        self.write_records(stream, start, end)
+        self.flushed = end
+        position = stream.tell()
+        stream.seek(0)
+        stream.write(HEADER.pack(
+            MAGIC, VERSION, RECORD.size, self.flushed_first,
+            (position - HEADER.size) // RECORD.size, 0
+        ))
+        stream.seek(position)
+        return lost
+
+class Trace:
+    """
+    Firing trace loaded from a file written by TraceRecorder.save or
+    TraceRecorder.flush
+
+    Records are read from a memory map, FIRST is the amount of
+    firings overwritten before the first kept record and MARKING the
+    marking before it, None if it was not saved
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise Exception(f'{path}: not a trace file')
+            magic, version, record_size, self.first, self.count, places = \
+                HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+                raise Exception(f'{path}: not a trace file of version {VERSION}')
+            self.marking = array('q', f.read(8 * places)).tolist() if places else None
+            self.offset = HEADER.size + 8 * places
+            self.memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        """Yield (timestamp, transition, thread) records"""
+        end = self.offset + self.count * RECORD.size
+        view = memoryview(self.memory)[self.offset:end]
+        try:
+            yield from RECORD.iter_unpack(view)
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        """Close memory map"""
+        self.memory.close()
+
+    def export_ndjson(self, stream, net: CompiledNet=None) -> None:
+        """Write one JSON record per line into STREAM, naming transitions of NET"""
+        for timestamp, transition, thread in self:
+            stream.write(json.dumps({
+                'timestamp': timestamp,
+                'transition': net.get_transition_name(transition) if net else transition,
+                'thread': thread,
+            }))
+            stream.write('\n')
+
+    def replay(self, net: CompiledNet, marking=None):
+        """
+        Fire traced transitions of NET from MARKING, by default the
+        saved one or the initial one, yielding (record, marking) after
+        each firing
+
+        Raise exception if some firing is not possible, the trace
+        does not belong to this net or marking
+        """
+        if marking is None:
+            marking = self.marking
+        if self.first and marking is None:
+            raise Exception(
+                f'Trace lost its first {self.first} firings, the marking they reached is needed'
+            )
+        engine = TokenGameEngine(net, marking=marking)
+        for record in self:
+            engine.fire(record[1])
+            yield record, engine.marking
+
+
+if __name__ == '__main__':
+    print('Este modulo no debe ejecutarse desde consola')
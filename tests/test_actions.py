@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+#
+# Tests for actions.py module
+#
+
+
+"""Tests for actions.py module"""
+
+
+# Standard packages
+import time
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.actions import (
+    DelayAction, exponential_duration, uniform_duration,
+)
+from src.interpretation import Interpreter
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+class TestActions:
+    """Tests class for transition actions"""
+
+    def test_seeded_distributions(self):
+        """Distributions are reproducible and stay in range"""
+        first = uniform_duration(0.1, 0.2, seed=1)
+        second = uniform_duration(0.1, 0.2, seed=1)
+        samples = [first() for _ in range(100)]
+        assert samples == [second() for _ in range(100)]
+        assert all(0.1 <= sample <= 0.2 for sample in samples)
+        assert all(sample > 0 for sample in (exponential_duration(1, 2)() for _ in range(100)))
+
+    def test_delay_action(self):
+        """Delay action sleeps a duration sample"""
+        start = time.perf_counter()
+        DelayAction(0.05)(None)
+        assert time.perf_counter() - start >= 0.05
+
+    def test_interpreter_attaches_actions(self):
+        """Transitions get their own action or the default one"""
+        fired = []
+        interpreter = Interpreter(
+            actions={'t1': lambda transition: fired.append(transition.name)},
+            default_action=DelayAction(0)
+        )
+        with open('docs/examples/example_2.pn', encoding='UTF-8') as f:
+            interpreter.interpret(Parser().parse(Lexer().tokenize_stream(f)))
+        assert interpreter.search_by_name('t1').fire()
+        assert fired == ['t1']
+        assert isinstance(interpreter.search_by_name('t2').action, DelayAction)
+
+    def test_action_of_unknown_transition(self):
+        """Actions must be given for existing transitions"""
+        interpreter = Interpreter(actions={'p1': print})
+        with pytest.raises(Exception, match='p1, which is not a transition'):
+            interpreter.interpret(Parser().parse(Lexer().tokenize('P = {p1}\nT = {t1}')))
+        assert not interpreter.places_references
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
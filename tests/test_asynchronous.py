@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+#
+# Tests for asynchronous.py module
+#
+
+
+"""Tests for asynchronous.py module"""
+
+
+# Standard packages
+import asyncio
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.asynchronous import AsyncRunner
+from src.interpretation import Interpreter
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+def interpret_file(path: str) -> Interpreter:
+    """Return Interpreter after interpreting file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        tree = Parser().parse(Lexer().tokenize_stream(f))
+    interpreter = Interpreter()
+    interpreter.interpret(tree)
+    return interpreter
+
+
+class TestAsyncRunner:
+    """Tests class for AsyncRunner"""
+
+    def test_run_max_firings(self):
+        """Run stops after max firings keeping tokens"""
+        interpreter = interpret_file('docs/examples/example_2.pn')
+        runner = AsyncRunner(interpreter.transitions_references)
+        assert asyncio.run(runner.run(1000)) == 1000
+        assert not runner.deadlocked
+        places = [interpreter.search_by_name(name) for name in ('p1', 'p3', 'p5')]
+        assert sum(place.count() for place in places) == 5
+
+    def test_run_until_deadlock(self):
+        """Run finishes by itself when every transition is blocked"""
+        interpreter = interpret_file('docs/examples/example2_transitionL0L1.pn')
+        runner = AsyncRunner(interpreter.transitions_references)
+        fired = asyncio.run(runner.run())
+        assert runner.deadlocked
+        assert fired == runner.firings
+        assert not any(
+            transition.are_all_inputs_enabled()
+            for transition in interpreter.transitions_references
+        )
+
+    def test_stop_from_embedding_service(self):
+        """Simulation embedded in another service stops when asked"""
+        interpreter = interpret_file('docs/examples/example_1.pn')
+        runner = AsyncRunner(interpreter.transitions_references, firing_delay=0.001)
+
+        async def service():
+            simulation = asyncio.create_task(runner.run())
+            await asyncio.sleep(0.05)
+            runner.stop()
+            return await simulation
+
+        assert asyncio.run(service()) > 0
+
+    def test_coroutine_actions_are_awaited(self):
+        """Coroutine actions run while their transition holds resources"""
+        interpreter = interpret_file('docs/examples/example_2.pn')
+        fired = []
+
+        async def action(transition):
+            await asyncio.sleep(0)
+            fired.append(transition.name)
+
+        for transition in interpreter.transitions_references:
+            transition.action = action
+        runner = AsyncRunner(interpreter.transitions_references)
+        assert asyncio.run(runner.run(100)) == 100
+        assert len(fired) == 100
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+#
+# Tests for batching.py module
+#
+
+
+"""Tests for batching.py module"""
+
+
+# Standard packages
+import glob
+import random
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.compilation import Compiler
+from src.interpretation import Interpreter
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+numpy = pytest.importorskip('numpy')
+from src.batching import BatchEngine  # pylint: disable=wrong-import-position
+
+
+def parse_file(path: str):
+    """Return PetriNetNode parsed from file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        return Parser().parse(Lexer().tokenize_stream(f))
+
+
+class TestBatchEngine:
+    """Tests class for BatchEngine"""
+
+    @pytest.mark.parametrize('path', sorted(glob.glob('docs/examples/*.pn')))
+    def test_enabled_mask_matches_threaded_transitions(self, path):
+        """Enabled mask agrees with ThreadedTransition.are_all_inputs_enabled"""
+        engine = BatchEngine(Compiler().compile(parse_file(path)))
+        interpreter = Interpreter()
+        interpreter.interpret(parse_file(path))
+        generator = random.Random(path)
+        markings = [
+            [generator.randint(0, 4) for _ in interpreter.places_references]
+            for _ in range(50)
+        ]
+        mask = engine.get_enabled_mask(markings)
+        for row, marking in enumerate(markings):
+            for place, amount in zip(interpreter.places_references, marking):
+                place.consume(place.count())
+                place.create(amount)
+            expected = [
+                transition.are_all_inputs_enabled()
+                for transition in interpreter.transitions_references
+            ]
+            assert mask[row].tolist() == expected
+
+    def test_fire_rows(self):
+        """Each row fires its own transition, negative index skips the row"""
+        with open('docs/examples/producer_consumer.pn', encoding='UTF-8') as f:
+            net = Compiler().compile(Parser().parse(Lexer().tokenize(f.read())))
+        engine = BatchEngine(net)
+        markings = engine.get_initial_markings(3)
+        result = engine.fire(markings, [1, 3, -1])
+        assert result.tolist() == [
+            net.fire(net.initial_marking, 1),
+            net.fire(net.initial_marking, 3),
+            list(net.initial_marking),
+        ]
+        assert markings.tolist() == [list(net.initial_marking)] * 3
+
+    def test_fire_disabled_transition(self):
+        """Firing a disabled transition raises exception"""
+        with open('docs/examples/example1_transitionL0.pn', encoding='UTF-8') as f:
+            engine = BatchEngine(Compiler().compile(Parser().parse(Lexer().tokenize(f.read()))))
+        with pytest.raises(Exception, match='Resources not available'):
+            engine.fire(numpy.array([[1, 0]]), [0])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
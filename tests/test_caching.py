@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+#
+# Tests for caching.py module
+#
+
+
+"""Tests for caching.py module"""
+
+
+# Standard packages
+import os
+
+# Installed packages
+import pytest
+
+# Local packages
+from src import caching
+from src.caching import NetCache
+from src.compilation import Compiler
+from src.generation import generate_annotation, ring
+from src.simulation import RoundRobinPolicy, TokenGameEngine
+
+
+def read_example(name: str) -> str:
+    """Return annotation of example NAME"""
+    with open(f'docs/examples/{name}.pn', encoding='UTF-8') as f:
+        return f.read()
+
+
+def fail_compilation(annotation: str):
+    """Compilation that must not be reached"""
+    raise AssertionError(f'Compiled {len(annotation)} characters instead of loading')
+
+
+class TestNetCache:
+    """Tests class for NetCache"""
+
+    def test_loaded_net_equals_compiled_net(self, tmp_path):
+        """Cached nets keep names, marking and incidence"""
+        annotation = read_example('shared_resources')
+        compiled = caching.compile_annotation(annotation)
+        path = NetCache(str(tmp_path)).store(annotation, compiled)
+        loaded = caching.load_compiled_net(path)
+        assert loaded.place_names == compiled.place_names
+        assert loaded.transition_names == compiled.transition_names
+        assert list(loaded.initial_marking) == list(compiled.initial_marking)
+        for transition in range(compiled.transitions_count):
+            assert loaded.get_preset(transition) == compiled.get_preset(transition)
+            assert loaded.get_postset(transition) == compiled.get_postset(transition)
+            assert loaded.get_dependents(transition) == compiled.get_dependents(transition)
+        engines = [TokenGameEngine(net, RoundRobinPolicy()) for net in (compiled, loaded)]
+        assert [engine.run(100) for engine in engines] == [100, 100]
+        assert engines[0].marking == engines[1].marking
+
+    def test_hits_skip_parsing(self, tmp_path, monkeypatch):
+        """Second compilation of an annotation is loaded from cache"""
+        annotation = generate_annotation(ring(2000, 3))
+        cache = NetCache(str(tmp_path))
+        first = cache.compile(annotation)
+        monkeypatch.setattr(caching, 'compile_annotation', fail_compilation)
+        second = cache.compile(annotation)
+        assert second.places_count == first.places_count == 2000
+        assert isinstance(second.pre_places, memoryview)
+
+    def test_changes_are_compiled_again(self, tmp_path):
+        """Annotation and format version changes give new keys"""
+        annotation = read_example('example_basic')
+        changed = annotation.replace('m0(p1)=1', 'm0(p1)=4')
+        assert changed != annotation
+        cache = NetCache(str(tmp_path))
+        assert list(cache.compile(annotation).initial_marking)[0] == 1
+        assert list(cache.compile(changed).initial_marking)[0] == 4
+        assert len(cache.get_entries()) == 2
+        key = caching.get_key(annotation)
+        caching.FORMAT_VERSION += 1
+        try:
+            assert caching.get_key(annotation) != key
+        finally:
+            caching.FORMAT_VERSION -= 1
+
+    def test_broken_entries_are_dropped(self, tmp_path):
+        """Truncated files are misses, compiled and stored again"""
+        annotation = read_example('limited_net')
+        cache = NetCache(str(tmp_path))
+        path = cache.store(annotation, caching.compile_annotation(annotation))
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 1)
+        with pytest.raises(Exception, match='truncated'):
+            caching.load_compiled_net(path)
+        assert cache.load(annotation) is None
+        assert cache.compile(annotation).place_names == ['p1', 'p2', 'p3', 'p4']
+        assert caching.load_compiled_net(path).places_count == 4
+
+    def test_least_recently_used_are_evicted(self, tmp_path):
+        """Directory is kept under its size, evicting least recently used"""
+        annotations = [generate_annotation(ring(size)) for size in (100, 101, 102)]
+        sizes = []
+        cache = NetCache(str(tmp_path))
+        for timestamp, annotation in enumerate(annotations):
+            path = cache.store(annotation, caching.compile_annotation(annotation))
+            os.utime(path, ns=(timestamp, timestamp))
+            sizes.append(os.path.getsize(path))
+        # Loading the oldest one makes it the most recently used
+        assert cache.load(annotations[0]) is not None
+        cache.max_bytes = sizes[0] + sizes[2]
+        assert cache.evict() == [cache.get_path(caching.get_key(annotations[1]))]
+        assert cache.load(annotations[1]) is None
+        assert cache.load(annotations[2]) is not None
+
+    def test_to_petri_net_node(self, tmp_path):
+        """Cached nets are compiled back into equivalent ast"""
+        annotation = read_example('producer_consumer')
+        loaded = NetCache(str(tmp_path)).compile(annotation)
+        tree = loaded.to_petri_net_node()
+        assert tree.symbols.get('p1') is tree.places[0]
+        recompiled = Compiler().compile(tree)
+        assert recompiled.place_names == loaded.place_names
+        assert list(recompiled.initial_marking) == list(loaded.initial_marking)
+        for transition in range(loaded.transitions_count):
+            assert recompiled.get_preset(transition) == loaded.get_preset(transition)
+            assert recompiled.get_postset(transition) == loaded.get_postset(transition)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
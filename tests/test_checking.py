@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+#
+# Tests for checking.py module
+#
+
+
+"""Tests for checking.py module"""
+
+
+# Standard packages
+## NOTE: this is empty for now
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.caching import compile_annotation
+from src.checking import StubbornSetChecker, parse_target
+from src.generation import generate_annotation, producer_consumer
+from src.reachability import ReachabilityExplorer
+
+
+def compile_file(path: str):
+    """Return CompiledNet from file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        return compile_annotation(f.read())
+
+
+def replay(net, sequence: list) -> list:
+    """Return marking reached firing SEQUENCE from initial marking of NET"""
+    marking = list(net.initial_marking)
+    for transition in sequence:
+        assert net.is_enabled(marking, transition)
+        marking = net.fire(marking, transition)
+    return marking
+
+
+class TestStubbornSetChecker:
+    """Tests class for StubbornSetChecker"""
+
+    @pytest.mark.parametrize('reduction', [True, False])
+    def test_deadlock(self, reduction):
+        """Search stops at the first deadlock with the sequence reaching it"""
+        net = compile_file('docs/examples/limited_net.pn')
+        result = StubbornSetChecker(net, reduction=reduction).check()
+        assert result.found
+        assert result.get_sequence_names() == ['t1', 't3', 't4']
+        assert replay(net, result.sequence) == result.marking
+        assert result.get_statistics()['marking'] == {'p1': 0, 'p2': 0, 'p3': 0, 'p4': 1}
+
+    def test_no_deadlock(self):
+        """Live nets are searched completely"""
+        result = StubbornSetChecker(compile_file('docs/examples/shared_resources.pn')).check()
+        assert not result.found
+        assert result.complete
+        assert result.sequence == []
+
+    def test_reduction(self):
+        """Independent producers and consumers are not interleaved"""
+        net = compile_annotation(generate_annotation(producer_consumer(5, 5, buffers=5)))
+        explored = ReachabilityExplorer(net).explore()
+        reduced = StubbornSetChecker(net).check()
+        full = StubbornSetChecker(net, reduction=False).check()
+        assert reduced.complete and full.complete
+        assert not reduced.found and not full.found
+        assert full.states == explored.states == 32768
+        assert reduced.states * 1000 < explored.states
+
+    def test_target(self):
+        """Target markings are found with the sequence reaching them"""
+        net = compile_file('docs/examples/shared_resources.pn')
+        target = parse_target(net, 'p3=1, p6=1')
+        result = StubbornSetChecker(net, target).check()
+        assert result.found
+        marking = replay(net, result.sequence)
+        assert marking == result.marking
+        assert (marking[2], marking[5]) == (1, 1)
+
+    def test_target_with_cycles(self):
+        """Transitions postponed along cycles still fire, see proviso C3"""
+        net = compile_annotation(generate_annotation(producer_consumer(3, 3, buffers=3)))
+        # Every producer busy, reached only firing all of them
+        target = parse_target(net, 'p2=1, p4=1, p6=1')
+        result = StubbornSetChecker(net, target).check()
+        assert result.found
+        assert result.expanded > 0
+        marking = replay(net, result.sequence)
+        assert (marking[1], marking[3], marking[5]) == (1, 1, 1)
+
+    def test_unreachable_target(self):
+        """Unreachable targets are searched completely"""
+        net = compile_file('docs/examples/limited_net.pn')
+        result = StubbornSetChecker(net, parse_target(net, 'p1=2')).check()
+        assert not result.found
+        assert result.complete
+
+    def test_max_states(self):
+        """Infinite nets stop at the states limit"""
+        result = StubbornSetChecker(
+            compile_file('docs/examples/unlimited_producer_consumer.pn'), max_states=100
+        ).check()
+        assert not result.complete
+        assert result.stop_reason == 'max_states'
+        assert result.states == 100
+
+    @pytest.mark.parametrize('text', ['p9=1', 'p1=x'])
+    def test_invalid_target(self, text):
+        """Unknown places and tokens are rejected"""
+        with pytest.raises(Exception):
+            parse_target(compile_file('docs/examples/limited_net.pn'), text)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+#
+# Tests for compilation.py module
+#
+
+
+"""Tests for compilation.py module"""
+
+
+# Standard packages
+## NOTE: this is empty for now
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.compilation import Compiler
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+def compile_annotation(annotation: str):
+    """Return CompiledNet from ANNOTATION"""
+    return Compiler().compile(Parser().parse(Lexer().tokenize(annotation)))
+
+
+class TestCompiler:
+    """Tests class for Compiler"""
+
+    def test_compile_indexes_and_marking(self):
+        """Places and transitions are indexed following declaration order"""
+        net = compile_annotation(
+            'P = {p1, p2, p3}\nT = {t1}\nA = {{p1, t1}=2, {t1, p3}}\nm0 = {m0(p1)=5, m0(p3)=0}'
+        )
+        assert net.place_names == ['p1', 'p2', 'p3']
+        assert net.get_place_index('p3') == 2
+        assert net.get_transition_name(0) == 't1'
+        assert list(net.initial_marking) == [5, 1, 0]
+
+    def test_sparse_and_dense_incidence(self):
+        """Repeated awns are merged and dense rows match sparse rows"""
+        net = compile_annotation(
+            'P = {p1, p2}\nT = {t1}\nA = {{p1, t1}, {p1, t1}=2, {t1, p2}=3, {t1, p1}}'
+        )
+        assert net.get_preset(0) == [(0, 3)]
+        assert net.get_postset(0) == [(0, 1), (1, 3)]
+        assert [list(row) for row in net.get_dense_pre()] == [[3, 0]]
+        assert [list(row) for row in net.get_dense_incidence()] == [[-2, 3]]
+
+    def test_fire(self):
+        """Firing enabled transitions moves tokens"""
+        with open('docs/examples/example1_transitionL0.pn', encoding='UTF-8') as f:
+            net = compile_annotation(f.read())
+        assert net.get_enabled_transitions(net.initial_marking) == []
+        assert net.fire([3, 0], 0) == [0, 1]
+
+    def test_consumers_and_dependents(self):
+        """Places index the transitions consuming them"""
+        with open('docs/examples/shared_resources.pn', encoding='UTF-8') as f:
+            net = compile_annotation(f.read())
+        assert net.get_consumers(net.get_place_index('p4')) == [1, 4]
+        assert net.get_consumers(net.get_place_index('p1')) == [0]
+        assert net.get_dependents(net.get_transition_index('t3')) == (0, 1, 2, 4)
+
+    def test_to_numpy(self):
+        """Dense matrices can be exported as numpy arrays"""
+        pytest.importorskip('numpy')
+        net = compile_annotation('P = {p1, p2}\nT = {t1}\nA = {{p1, t1}=2, {t1, p2}}')
+        pre, post, marking = net.to_numpy()
+        assert pre.tolist() == [[2, 0]]
+        assert post.tolist() == [[0, 1]]
+        assert marking.tolist() == [1, 1]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
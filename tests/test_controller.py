@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+#
+# Tests for controller.py module
+#
+
+
+"""Tests for controller.py module"""
+
+
+# Standard packages
+import threading
+
+# Installed packages
+import pytest
+
+# Local packages
+from src import controller
+from src.controller import RunController
+from src.parsing import Parser
+from src.tokenization import Lexer
+import src.interpretation as interpretation
+
+
+# Every firing sequence ends moving all tokens into p3
+DRAINING_NET = (
+    'P = {p1, p2, p3}\n'
+    'T = {t1, t2}\n'
+    'A = {{p1, t1}, {t1, p2}, {p2, t2}, {t2, p3}}\n'
+    'm0 = {m0(p1)=50, m0(p2)=0, m0(p3)=0}\n'
+)
+
+
+def interpret_annotation(annotation: str) -> tuple:
+    """Return (interpreter, threads) of ANNOTATION"""
+    interpreter = interpretation.Interpreter()
+    return interpreter, interpreter.interpret(Parser().parse(Lexer().tokenize(annotation)))
+
+
+def interpret_example(name: str) -> tuple:
+    """Return (interpreter, threads) of example NAME"""
+    with open(f'docs/examples/{name}.pn', encoding='UTF-8') as f:
+        return interpret_annotation(f.read())
+
+
+class TestRunController:
+    """Tests class for RunController"""
+
+    @pytest.mark.parametrize('workers', [None, 3])
+    def test_run_until_firings(self, workers):
+        """Runs stop after the given firings, joining every thread"""
+        interpreter, threads = interpret_example('shared_resources')
+        # Live net, so it is never taken for a deadlock
+        result = RunController(
+            interpreter, workers, max_firings=20_000, until_deadlock=True
+        ).run(threads)
+        assert result.reason == controller.FIRINGS
+        assert result.firings >= 20_000
+        assert sum(result.firing_counts.values()) == result.firings
+        # Tokens of the two cycles sharing p4 are kept
+        marking = result.marking
+        assert marking['p1'] + marking['p2'] + marking['p3'] == 1
+        assert marking['p5'] + marking['p6'] + marking['p7'] == 1
+        assert not any(thread.is_alive() for thread in threads)
+        assert threading.active_count() == 1
+
+    @pytest.mark.parametrize('workers', [None, 2])
+    def test_run_until_deadlock(self, workers):
+        """Runs stop once no transition can fire"""
+        interpreter, threads = interpret_annotation(DRAINING_NET)
+        result = RunController(interpreter, workers, until_deadlock=True).run(threads)
+        assert result.reason == controller.DEADLOCK
+        assert result.marking == {'p1': 0, 'p2': 0, 'p3': 50}
+        assert result.firing_counts == {'t1': 50, 't2': 50}
+        assert threading.active_count() == 1
+
+    def test_deadlock_reports_blocked_transitions(self):
+        """Deadlocked runs tell which places block each transition"""
+        with open('docs/examples/shared_resources.pn', encoding='UTF-8') as f:
+            annotation = f.read().replace('m0(p4)=1', 'm0(p4)=0')
+        interpreter, threads = interpret_annotation(annotation)
+        result = RunController(interpreter, 2, until_deadlock=True).run(threads)
+        assert result.reason == controller.DEADLOCK
+        assert result.firings == 2
+        assert result.blocked['t2'] == result.blocked['t5'] == ['p4']
+        assert result.get_statistics()['blocked'] == result.blocked
+
+    def test_dead_net_is_detected_at_start(self):
+        """Nets without enabled transitions stop without firing"""
+        interpreter, threads = interpret_example('example1_transitionL0')
+        result = RunController(interpreter, until_deadlock=True).run(threads)
+        assert result.reason == controller.DEADLOCK
+        assert result.firings == 0
+
+    def test_run_for_seconds(self):
+        """Blocked transitions are woken up when time runs out"""
+        interpreter, threads = interpret_example('example1_transitionL0')
+        result = RunController(interpreter, seconds=0.2).run(threads)
+        assert result.reason == controller.SECONDS
+        assert result.elapsed >= 0.2
+        assert result.get_statistics()['firings_per_second'] == 0
+        assert threading.active_count() == 1
+
+    def test_interrupted_runs_stop(self, monkeypatch):
+        """Ctrl+C while waiting stops and joins threads"""
+        interpreter, threads = interpret_example('shared_resources')
+        run_controller = RunController(interpreter)
+
+        def interrupt(timeout=None):
+            raise KeyboardInterrupt
+        monkeypatch.setattr(run_controller.done, 'wait', interrupt)
+        result = run_controller.run(threads)
+        assert result.reason == controller.INTERRUPTED
+        assert not any(thread.is_alive() for thread in threads)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
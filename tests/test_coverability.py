@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+#
+# Tests for coverability.py module
+#
+
+
+"""Tests for coverability.py module"""
+
+
+# Standard packages
+## NOTE: this is empty for now
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.compilation import Compiler
+from src.coverability import OMEGA, CoverabilityExplorer
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+def compile_file(path: str):
+    """Return CompiledNet from file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        return Compiler().compile(Parser().parse(Lexer().tokenize_stream(f)))
+
+
+class TestCoverabilityExplorer:
+    """Tests class for CoverabilityExplorer"""
+
+    @pytest.mark.parametrize('path, unbounded', [
+        ('docs/examples/unlimited_producer_consumer.pn', ['p5']),
+        ('docs/examples/producer_consumer.pn', ['p3']),
+        ('docs/examples/example_1.pn', ['p1', 'p4']),
+        ('docs/examples/limited_producer_consumer.pn', []),
+        ('docs/examples/shared_resources.pn', []),
+    ])
+    def test_unbounded_places(self, path, unbounded):
+        """Places growing without limit are accelerated to omega"""
+        result = CoverabilityExplorer(compile_file(path)).explore()
+        assert result.complete
+        assert result.get_unbounded_places() == unbounded
+        assert result.is_bounded() == (not unbounded)
+
+    def test_bounds(self):
+        """Bounded places keep their maximum tokens"""
+        result = CoverabilityExplorer(
+            compile_file('docs/examples/unlimited_producer_consumer.pn')
+        ).explore()
+        assert result.get_bounds() == [1, 1, 1, 1, OMEGA]
+        assert result.get_statistics()['bounds']['p5'] == 'omega'
+
+    def test_pruned_markings(self):
+        """Only maximal markings are kept"""
+        result = CoverabilityExplorer(compile_file('docs/examples/example_2.pn')).explore()
+        for marking in result.markings:
+            others = [other for other in result.markings if other != marking]
+            assert not any(
+                all(tokens <= other_tokens for tokens, other_tokens in zip(marking, other))
+                for other in others
+            )
+
+    def test_max_nodes(self):
+        """Exploration stops after max nodes"""
+        result = CoverabilityExplorer(
+            compile_file('docs/examples/example_2.pn'), max_nodes=5
+        ).explore()
+        assert not result.complete
+        assert result.nodes == 5
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
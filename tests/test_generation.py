@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+# Tests for generation.py module
+#
+
+
+"""Tests for generation.py module"""
+
+
+# Standard packages
+import io
+
+# Installed packages
+import pytest
+
+# Local packages
+from src import generation
+from src.compilation import Compiler
+from src.coverability import CoverabilityExplorer
+from src.parsing import Parser
+from src.simulation import RandomPolicy, TokenGameEngine
+from src.tokenization import Lexer
+
+
+def compile_net(net: generation.GeneratedNet):
+    """Return CompiledNet of generated NET, tokenized as a stream"""
+    stream = io.StringIO()
+    generation.write_annotation(stream, net)
+    stream.seek(0)
+    return Compiler().compile(Parser().parse(Lexer().tokenize_stream(stream)))
+
+
+class TestGeneration:
+    """Tests class for generated nets"""
+
+    @pytest.mark.parametrize('net, places, transitions', [
+        (generation.ring(10, 3), 10, 10),
+        (generation.fork_join(3, 4), 13, 11),
+        (generation.pipeline(5, 2, 3), 10, 6),
+        (generation.producer_consumer(3, 2, 4, 2), 14, 10),
+    ])
+    def test_topologies_are_live_and_bounded(self, net, places, transitions):
+        """Generated topologies parse, never deadlock and stay bounded"""
+        compiled = compile_net(net)
+        assert compiled.places_count == places == net.places
+        assert compiled.transitions_count == transitions == net.transitions
+        assert TokenGameEngine(compiled, RandomPolicy(0)).run(2000) == 2000
+        assert CoverabilityExplorer(compiled).explore().is_bounded()
+
+    def test_bounded_buffers(self):
+        """Items plus free slots of a buffer keep its capacity"""
+        compiled = compile_net(generation.producer_consumer(2, 2, capacity=3))
+        engine = TokenGameEngine(compiled, RandomPolicy(1))
+        items, free = compiled.get_place_index('p9'), compiled.get_place_index('p10')
+        for _ in range(500):
+            engine.step()
+            assert engine.marking[items] + engine.marking[free] == 3
+
+    def test_random_net_is_reproducible(self):
+        """Same seed gives the same annotation, weights included"""
+        first = generation.random_net(30, 20, max_weight=3, max_tokens=2, seed=7)
+        second = generation.random_net(30, 20, max_weight=3, max_tokens=2, seed=7)
+        annotation = generation.generate_annotation(first)
+        assert annotation == generation.generate_annotation(second)
+        assert annotation != generation.generate_annotation(generation.random_net(30, 20, seed=8))
+        compiled = compile_net(first)
+        assert all(len(compiled.get_preset(t)) == 2 for t in range(20))
+        assert max(compiled.pre_weights) <= 3
+
+    @pytest.mark.parametrize('size', [512, 1024, 1025, 2048])
+    def test_batch_boundaries(self, size):
+        """Sets with a multiple of write batch items are still valid"""
+        compiled = compile_net(generation.ring(size))
+        assert compiled.places_count == compiled.transitions_count == size
+        assert len(compiled.pre_places) + len(compiled.post_places) == 2 * size
+
+    def test_empty_sets_are_rejected(self):
+        """Nets without places can not be annotated"""
+        with pytest.raises(Exception, match='Cannot write P without items'):
+            generation.generate_annotation(generation.ring(0))
+
+    def test_marking_is_explicit(self):
+        """Every place gets an explicit amount of tokens"""
+        compiled = compile_net(generation.ring(4, 2))
+        assert list(compiled.initial_marking) == [1, 1, 0, 0]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
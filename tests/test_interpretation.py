@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+#
+# Tests for interpretation.py module
+#
+
+
+"""Tests for interpretation.py module"""
+
+
+# Standard packages
+import itertools
+import threading
+import time
+
+# Installed packages
+import pytest
+
+# Local packages
+import src.interpretation as interpretation
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+# Transitions share input places and keep total amount of tokens
+SHARED_PLACES_NET = (
+    'P = {p1, p2, p3}\n'
+    'T = {t1, t2, t3, t4, t5}\n'
+    'A = {{p1, t1}, {t1, p2}, {p2, t2}, {t2, p3}, {p3, t3}, {t3, p1},\n'
+    '     {p1, t4}, {p2, t4}, {t4, p3}=2, {p3, t5}=2, {t5, p1}, {t5, p2}}\n'
+    'm0 = {m0(p1)=3, m0(p2)=3, m0(p3)=3}\n'
+)
+
+# Total firings made by all transition threads in stress test
+STRESS_FIRINGS = 1_000_000
+
+# Seconds stress threads wait before checking their stop event again
+WAKEUP_TIMEOUT = 0.1
+
+
+def interpret_annotation(annotation: str, traced_tokens: bool=False) -> tuple:
+    """Return (interpreter, threads) from ANNOTATION"""
+    interpreter = interpretation.Interpreter(traced_tokens)
+    return interpreter, interpreter.interpret(Parser().parse(Lexer().tokenize(annotation)))
+
+
+def interpret_file(path: str, traced_tokens: bool=False) -> tuple:
+    """Return (interpreter, threads) from file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        tree = Parser().parse(Lexer().tokenize_stream(f))
+    interpreter = interpretation.Interpreter(traced_tokens)
+    return interpreter, interpreter.interpret(tree)
+
+
+def fire_without_critical_section(transition, counter, stop, fired: list) -> None:
+    """Fire TRANSITION until STOP, counting firings in COUNTER and FIRED"""
+    count = 0
+    while not stop.is_set():
+        transition.wakeup.clear()
+        resources = transition.acquire_all_resources()
+        if resources is None:
+            transition.wakeup.wait(WAKEUP_TIMEOUT)
+        else:
+            transition.pass_all_resources(resources)
+            count += 1
+            if next(counter) >= STRESS_FIRINGS:
+                stop.set()
+    fired.append(count)
+
+
+class TestInterpreter:
+    """Tests class for Interpreter"""
+
+    def test_produce_wakes_up_consumers(self):
+        """Producing tokens sets wakeup of transitions consuming from the place"""
+        interpreter, _ = interpret_file('docs/examples/example_1.pn')
+        place = interpreter.search_by_name('p1')
+        consumer = interpreter.search_by_name('t2')
+        other = interpreter.search_by_name('t3')
+        place.produce(1)
+        assert consumer.wakeup.is_set()
+        assert not other.wakeup.is_set()
+
+    def test_counter_places(self):
+        """Uncoloured places only keep a counter"""
+        place = interpretation.ThreadedPlace('p1', 1_000_000)
+        assert place.consume(999_999) == []
+        place.produce(3)
+        assert place.count() == 4
+        with pytest.raises(Exception, match='Resources not available'):
+            place.consume(5)
+
+    def test_traced_places_keep_token_identities(self):
+        """Traced places pass the same tokens through transitions"""
+        interpreter, _ = interpret_file('docs/examples/example_basic.pn', True)
+        input_place = interpreter.search_by_name('p1')
+        output_place = interpreter.search_by_name('p2')
+        token = input_place.tokens_stack[0]
+        transition = interpreter.search_by_name('t1')
+        transition.pass_all_resources(transition.acquire_all_resources())
+        assert input_place.count() == 0
+        assert output_place.count() == 2
+        assert output_place.tokens_stack[0] is token
+        assert isinstance(output_place.tokens_stack[1], interpretation.ResourceToken)
+
+    @pytest.mark.parametrize('tokens, enabled', [(1, False), (2, True)])
+    def test_repeated_input_awns(self, tokens, enabled):
+        """Awns repeated from the same place need the sum of their weights"""
+        interpreter, _ = interpret_annotation(
+            'P = {p1, p2}\nT = {t1}\nA = {{p1, t1}, {p1, t1}, {t1, p2}}\n'
+            f'm0 = {{m0(p1)={tokens}, m0(p2)=0}}\n'
+        )
+        transition = interpreter.search_by_name('t1')
+        assert transition.are_all_inputs_enabled() == enabled
+        assert transition.fire() == enabled
+        assert interpreter.search_by_name('p1').count() == (0 if enabled else 1)
+
+    def test_traced_tokens_reach_one_place(self):
+        """Every output place receives its own tokens"""
+        interpreter, _ = interpret_annotation(
+            'P = {p1, p2, p3}\nT = {t1}\nA = {{p1, t1}=2, {t1, p2}, {t1, p3}=2}\n'
+            'm0 = {m0(p1)=2, m0(p2)=0, m0(p3)=0}\n',
+            True
+        )
+        first, second = interpreter.search_by_name('p1').tokens_stack
+        assert interpreter.search_by_name('t1').fire()
+        assert list(interpreter.search_by_name('p2').tokens_stack) == [first]
+        tokens = interpreter.search_by_name('p3').tokens_stack
+        assert tokens[0] is second
+        assert tokens[1] not in (first, second)
+
+    def test_deadlocked_net_does_not_spin(self):
+        """Blocked transitions wait instead of burning CPU"""
+        interpreter, threads = interpret_file('docs/examples/example1_transitionL0.pn')
+        start = time.process_time()
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)
+        interpreter.stop()
+        for thread in threads:
+            thread.join(1)
+            assert not thread.is_alive()
+        assert time.process_time() - start < 0.1
+
+    def test_concurrent_firings_keep_tokens(self):
+        """Transitions sharing places fire atomically and conserve tokens"""
+        interpreter = interpretation.Interpreter()
+        interpreter.interpret(Parser().parse(Lexer().tokenize(SHARED_PLACES_NET)))
+        counter = itertools.count(1)
+        stop = threading.Event()
+        fired = []
+        threads = [
+            threading.Thread(
+                target=fire_without_critical_section,
+                args=(transition, counter, stop, fired)
+            )
+            for transition in interpreter.transitions_references
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(fired) == len(threads)
+        assert sum(fired) >= STRESS_FIRINGS
+        assert all(fired)
+        assert sum(place.count() for place in interpreter.places_references) == 9
+
+
+
+def interpret_shared_resources(free_resources: int) -> tuple:
+    """Return (interpreter, threads) of shared resources net with FREE_RESOURCES in p4"""
+    with open('docs/examples/shared_resources.pn', encoding='UTF-8') as f:
+        annotation = f.read().replace('m0(p4)=1', f'm0(p4)={free_resources}')
+    interpreter = interpretation.Interpreter(detector=interpretation.QuiescenceDetector())
+    return interpreter, interpreter.interpret(Parser().parse(Lexer().tokenize(annotation)))
+
+
+class TestQuiescenceDetector:
+    """Tests class for QuiescenceDetector"""
+
+    def test_dead_marking_is_reported(self):
+        """Cycles waiting for the missing shared resource stop both"""
+        interpreter, threads = interpret_shared_resources(0)
+        detector = interpreter.detector
+        reports = []
+        detector.add_listener(reports.append)
+        for thread in threads:
+            thread.start()
+        try:
+            assert detector.quiescent.wait(5)
+        finally:
+            interpreter.stop()
+            for thread in threads:
+                thread.join()
+        assert len(reports) == 1
+        quiescence = reports[0]
+        assert quiescence is detector.quiescence
+        assert quiescence.marking == {
+            'p1': 0, 'p2': 1, 'p3': 0, 'p4': 0, 'p5': 0, 'p6': 1, 'p7': 0
+        }
+        assert quiescence.blocked == {
+            't1': ['p1'], 't2': ['p4'], 't3': ['p3'],
+            't4': ['p5'], 't5': ['p4'], 't6': ['p7'],
+        }
+
+    def test_live_net_is_not_quiescent(self):
+        """Counters follow the marking while transitions keep firing"""
+        interpreter, threads = interpret_shared_resources(1)
+        detector = interpreter.detector
+        for thread in threads:
+            thread.start()
+        time.sleep(0.3)
+        interpreter.stop()
+        for thread in threads:
+            thread.join()
+        assert detector.quiescence is None
+        assert detector.in_flight == 0
+        enabled = [
+            transition.are_all_inputs_enabled()
+            for transition in interpreter.transitions_references
+        ]
+        assert detector.enabled == sum(enabled) > 0
+        assert [not missing for missing in detector.missing] == enabled
+
+    def test_dead_initial_marking(self):
+        """Nets that can not fire at all are quiescent once bound"""
+        interpreter, _ = interpret_file('docs/examples/example1_transitionL0.pn')
+        detector = interpretation.QuiescenceDetector()
+        detector.bind(interpreter.transitions_references, interpreter.places_references)
+        assert detector.quiescent.is_set()
+        reports = []
+        detector.add_listener(reports.append)
+        assert reports == [detector.quiescence]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
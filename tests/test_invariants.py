@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+#
+# Tests for invariants.py module
+#
+
+
+"""Tests for invariants.py module"""
+
+
+# Standard packages
+## NOTE: this is empty for now
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.compilation import Compiler
+from src.coverability import CoverabilityExplorer
+from src.generation import generate_annotation, producer_consumer, ring
+from src.invariants import InvariantsAnalyzer, get_counter_typecode, get_semiflows
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+def compile_annotation(annotation: str):
+    """Return CompiledNet from ANNOTATION"""
+    return Compiler().compile(Parser().parse(Lexer().tokenize(annotation)))
+
+
+def compile_example(name: str):
+    """Return CompiledNet of example NAME"""
+    with open(f'docs/examples/{name}.pn', encoding='UTF-8') as f:
+        return compile_annotation(f.read())
+
+
+def is_p_semiflow(net, semiflow: dict) -> bool:
+    """Check that SEMIFLOW weighted tokens never change firing transitions of NET"""
+    return all(
+        sum(semiflow.get(place, 0) * delta for place, delta in net.get_changes(transition)) == 0
+        for transition in range(net.transitions_count)
+    )
+
+
+class TestInvariantsAnalyzer:
+    """Tests class for InvariantsAnalyzer"""
+
+    @pytest.mark.parametrize('name', [
+        'shared_resources', 'limited_producer_consumer', 'producer_consumer', 'example_basic',
+    ])
+    def test_semiflows_and_bounds(self, name):
+        """P-semiflows keep weighted tokens and bound every place they cover"""
+        net = compile_example(name)
+        result = InvariantsAnalyzer(net).analyze()
+        assert result.p_semiflows
+        assert all(is_p_semiflow(net, semiflow) for semiflow in result.p_semiflows)
+        # Bounds are never below what is reachable, missing if unbounded
+        covered = CoverabilityExplorer(net).explore().get_bounds()
+        for bound, tokens in zip(result.get_bounds(), covered):
+            assert bound is None or bound >= tokens
+
+    def test_shared_resources(self):
+        """Both cycles and the shared resource keep their tokens"""
+        result = InvariantsAnalyzer(compile_example('shared_resources')).analyze()
+        statistics = result.get_statistics()
+        assert statistics['p_semiflows'] == [
+            {'p1': 1, 'p2': 1, 'p3': 1},
+            {'p3': 1, 'p4': 1, 'p7': 1},
+            {'p5': 1, 'p6': 1, 'p7': 1},
+        ]
+        assert statistics['t_semiflows'] == [
+            {'t1': 1, 't2': 1, 't3': 1}, {'t4': 1, 't5': 1, 't6': 1},
+        ]
+        assert result.is_conservative() and result.is_consistent()
+        assert result.get_bounds() == [1] * 7
+        assert result.get_counter_typecode() == 'B'
+
+    def test_exact_weights(self):
+        """Weights are kept as exact integers"""
+        net = compile_annotation(
+            'P = {p1, p2}\nT = {t1, t2}\n'
+            'A = {{p1, t1}=3, {t1, p2}=5, {p2, t2}=5, {t2, p1}=3}\n'
+            'm0 = {m0(p1)=300000, m0(p2)=0}'
+        )
+        result = InvariantsAnalyzer(net).analyze()
+        assert result.p_semiflows == [{0: 5, 1: 3}]
+        assert result.t_semiflows == [{0: 1, 1: 1}]
+        assert result.get_bounds() == [300_000, 500_000]
+        assert result.get_counter_typecode() == 'I'
+
+    def test_uncovered_places_are_unbounded(self):
+        """Places growing without limit are never covered"""
+        net = compile_example('unlimited_producer_consumer')
+        result = InvariantsAnalyzer(net).analyze()
+        unbounded = CoverabilityExplorer(net).explore().get_unbounded_places()
+        bounds = result.get_statistics()['bounds']
+        assert unbounded == ['p5']
+        assert bounds['p5'] is None
+        assert not result.is_conservative()
+        assert result.get_counter_typecode() is None
+
+    def test_large_nets(self):
+        """Nets with thousands of places are analyzed"""
+        net = compile_annotation(generate_annotation(ring(2000, 7)))
+        result = InvariantsAnalyzer(net).analyze()
+        assert result.p_semiflows == [dict.fromkeys(range(2000), 1)]
+        assert result.t_semiflows == [dict.fromkeys(range(2000), 1)]
+        assert set(result.get_bounds()) == {7}
+        net = compile_annotation(generate_annotation(producer_consumer(100, 100, 4, 25)))
+        result = InvariantsAnalyzer(net).analyze()
+        # Every agent cycle and every buffer
+        assert len(result.p_semiflows) == 200 + 25
+        assert result.is_conservative()
+        assert max(result.get_bounds()) == 4
+
+    def test_max_rows(self):
+        """Computations growing beyond MAX_ROWS are stopped"""
+        net = compile_annotation(generate_annotation(producer_consumer(10, 10, 1, 1)))
+        with pytest.raises(Exception, match='more than 5 rows'):
+            InvariantsAnalyzer(net, max_rows=5).analyze()
+
+
+class TestSemiflows:
+    """Tests class for get_semiflows and get_counter_typecode"""
+
+    def test_minimal_supports(self):
+        """Only semiflows with minimal support are returned"""
+        # Rows 0 and 1 cancel each other, as rows 2 and 3, and 0 + 1 + 2 + 3 too
+        rows = [{0: 1}, {0: -1}, {1: 2}, {1: -2}, {}]
+        assert get_semiflows(rows) == [{0: 1, 1: 1}, {2: 1, 3: 1}, {4: 1}]
+
+    def test_counter_typecode(self):
+        """Smallest unsigned typecode holding every bound"""
+        assert get_counter_typecode([0, 255]) == 'B'
+        assert get_counter_typecode([256]) == 'H'
+        assert get_counter_typecode([1 << 40]) == 'Q'
+        assert get_counter_typecode([1 << 64]) is None
+        assert get_counter_typecode([1, None]) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
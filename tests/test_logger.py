@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+#
+# Tests for logger.py module
+#
+
+
+"""Tests for logger.py module"""
+
+
+# Standard packages
+import io
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.interpretation import Interpreter
+from src.logger import DETAILED, FIRINGS, QUIET, FiringLogger
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+def fire_example(logger: FiringLogger) -> None:
+    """Fire every transition of example_basic once logging to LOGGER"""
+    interpreter = Interpreter(logger=logger)
+    with open('docs/examples/example_basic.pn', encoding='UTF-8') as f:
+        interpreter.interpret(Parser().parse(Lexer().tokenize_stream(f)))
+    logger.start()
+    for transition in interpreter.transitions_references:
+        transition.fire()
+    logger.stop()
+
+
+class TestFiringLogger:
+    """Tests class for FiringLogger"""
+
+    @pytest.mark.parametrize('verbosity, expected', [
+        (QUIET, ''),
+        (FIRINGS, 'fired: t1\n'),
+    ])
+    def test_verbosity(self, verbosity, expected):
+        """Verbosity chooses what is written"""
+        stream = io.StringIO()
+        fire_example(FiringLogger(verbosity, stream))
+        assert stream.getvalue() == expected
+
+    def test_detailed_firings(self):
+        """Detailed records name moved tokens"""
+        stream = io.StringIO()
+        fire_example(FiringLogger(DETAILED, stream))
+        assert 'p1 releases 1 tokens' in stream.getvalue()
+        assert 'p2 received 2 tokens' in stream.getvalue()
+
+    def test_stop_writes_pending_records(self):
+        """Every logged record is written before stop returns"""
+        stream = io.StringIO()
+        logger = FiringLogger(FIRINGS, stream)
+        transition = type('Transition', (), {'name': 't1'})()
+        for _ in range(5000):
+            logger.log(transition)
+        logger.start()
+        logger.stop()
+        assert stream.getvalue().count('fired: t1\n') == 5000
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+#
+# Tests for metrics.py module
+#
+
+
+"""Tests for metrics.py module"""
+
+
+# Standard packages
+import itertools
+import json
+import threading
+import time
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.interpretation import Interpreter
+from src.metrics import MetricsCollector, MetricsDumper
+from src.parsing import Parser
+from src.scheduling import ThreadPoolScheduler
+from src.tokenization import Lexer
+
+
+def interpret_file(path: str, metrics: MetricsCollector, action=None) -> Interpreter:
+    """Return Interpreter collecting METRICS after interpreting file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        tree = Parser().parse(Lexer().tokenize_stream(f))
+    interpreter = Interpreter(default_action=action, metrics=metrics)
+    interpreter.interpret(tree)
+    return interpreter
+
+
+class TestMetricsCollector:
+    """Tests class for MetricsCollector"""
+
+    def test_threads_counters_are_aggregated(self):
+        """Snapshot sums firings counted by every worker thread"""
+        counter = itertools.count()
+        metrics = MetricsCollector()
+        interpreter = interpret_file(
+            'docs/examples/example_2.pn', metrics, lambda transition: next(counter)
+        )
+        scheduler = ThreadPoolScheduler(interpreter.transitions_references, 3)
+        scheduler.start()
+        time.sleep(0.2)
+        scheduler.stop()
+        snapshot = metrics.snapshot()
+        firings = sum(stats['firings'] for stats in snapshot['transitions'].values())
+        assert firings == next(counter) > 0
+        assert snapshot['transitions']['t2']['latency_ns']['count'] > 0
+        assert snapshot['places']['p1']['tokens'] == interpreter.search_by_name('p1').count()
+
+    def test_lock_wait(self):
+        """Waiting for a taken place lock is measured"""
+        metrics = MetricsCollector()
+        interpreter = interpret_file('docs/examples/example_basic.pn', metrics)
+        place = interpreter.search_by_name('p2')
+        place.lock.acquire()
+        producer = threading.Thread(target=place.produce, args=(1,))
+        producer.start()
+        time.sleep(0.05)
+        place.lock.release()
+        producer.join()
+        stats = metrics.snapshot()['places']['p2']
+        assert stats['contentions'] == 1
+        assert stats['lock_wait_ns'] >= 10_000_000
+
+    def test_latency_summary(self):
+        """Percentiles are upper bounds of histogram buckets"""
+        histogram = [0] * 10
+        histogram[3] = 90
+        histogram[8] = 10
+        summary = MetricsCollector.get_latency_summary(histogram)
+        assert summary['count'] == 100
+        assert (summary['p50'], summary['p90'], summary['p99']) == (8, 8, 256)
+        assert summary['histogram'] == {'8': 90, '256': 10}
+
+    def test_dumper(self, tmp_path):
+        """Dumper appends snapshots as JSON lines"""
+        metrics = MetricsCollector()
+        interpreter = interpret_file('docs/examples/example_basic.pn', metrics)
+        dumper = MetricsDumper(metrics, tmp_path / 'metrics.jsonl', 0.01)
+        dumper.start()
+        time.sleep(0.05)
+        interpreter.search_by_name('t1').fire()
+        dumper.stop()
+        with open(tmp_path / 'metrics.jsonl', encoding='UTF-8') as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) >= 2
+        assert lines[-1]['transitions']['t1']['firings'] == 1
+        assert lines[-1]['places']['p2']['tokens'] == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
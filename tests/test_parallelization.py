@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+#
+# Tests for parallelization.py module
+#
+
+
+"""Tests for parallelization.py module"""
+
+
+# Standard packages
+## NOTE: this is empty for now
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.compilation import Compiler
+from src.parallelization import ProcessPoolRunner
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+def compile_file(path: str):
+    """Return CompiledNet from file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        return Compiler().compile(Parser().parse(Lexer().tokenize_stream(f)))
+
+
+class TestProcessPoolRunner:
+    """Tests class for ProcessPoolRunner"""
+
+    def test_run_max_firings(self):
+        """Processes share the marking and keep tokens"""
+        runner = ProcessPoolRunner(compile_file('docs/examples/example_2.pn'), 2, stripes=2)
+        assert runner.run(max_firings=500, stop_on_deadlock=False) >= 500
+        marking = runner.get_marking_dict()
+        # p1 + p3 + p5 is kept by every firing of example 2
+        assert marking['p1'] + marking['p3'] + marking['p5'] == 5
+
+    def test_run_until_deadlock(self):
+        """Coordinator stops workers when nothing is enabled nor firing"""
+        runner = ProcessPoolRunner(compile_file('docs/examples/example_basic.pn'), 2)
+        assert runner.run() == 1
+        assert runner.deadlocked
+        assert runner.marking == [0, 2]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#
+# Tests for parsing.py module
+#
+
+
+"""Tests for parsing.py module"""
+
+
+# Standard packages
+import io
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.node import PetriNetNode, PlaceNode, TransitionNode
+from src.parsing import Parser
+from src.tokenization import Lexer
+
+
+class TestParser:
+    """Tests class for Parser"""
+
+    def test_parse_petri_net(self):
+        """Parse transitions, awns, weights and starting amounts"""
+        tree = Parser().parse(Lexer().tokenize(
+            'P = {p1, p2}\nT = {t1}\nA = {{p1, t1}=3, {t1, p2}}\nm0 = {m0(p1)=4}'
+        ))
+        transition = tree.transitions[0]
+        assert transition.name == 't1'
+        assert [(awn.name, awn.weight) for awn in transition.input_awns] == [('p1->t1', 3)]
+        assert [(awn.name, awn.weight) for awn in transition.output_awns] == [('t1->p2', 1)]
+        assert transition.input_awns[0].input.starting_amount == 4
+        assert transition.output_awns[0].output.starting_amount == 1
+
+    def test_parse_token_stream_lazily(self):
+        """Parse tokens coming from a generator"""
+        with open('docs/examples/example_2.pn', encoding='UTF-8') as f:
+            tree = Parser().parse(Lexer().tokenize_stream(f, 16))
+        assert [transition.name for transition in tree.transitions] == ['t1', 't2', 't3', 't4']
+
+    def test_unexpected_token(self):
+        """Unexpected statements raise SyntaxError instead of looping"""
+        with pytest.raises(SyntaxError):
+            Parser().parse(Lexer().tokenize_stream(io.StringIO('P = {p1}\n}')))
+
+    def test_duplicated_declaration(self):
+        """Places or transitions declared twice raise exception"""
+        with pytest.raises(Exception, match='p1 declared more than once'):
+            Parser().parse(Lexer().tokenize('P = {p1, p2, p1}'))
+
+    def test_reference_before_assignment(self):
+        """Awns referencing undeclared nodes raise exception"""
+        with pytest.raises(Exception, match='t2 referenced before assignment'):
+            Parser().parse(Lexer().tokenize('P = {p1}\nT = {t1}\nA = {{p1, t2}}'))
+
+    def test_symbols_table(self):
+        """Parsed net keeps every declared node indexed by name"""
+        tree = Parser().parse(Lexer().tokenize('P = {p1, p2}\nT = {t1}'))
+        assert [place.name for place in tree.places] == ['p1', 'p2']
+        assert tree.symbols.lookup('t1') is tree.transitions[0]
+
+    def test_symbols_of_built_tree(self):
+        """Trees built without parsing index their nodes too"""
+        place, transition = PlaceNode('p1'), TransitionNode('t1')
+        tree = PetriNetNode([transition], [place])
+        assert tree.symbols.lookup('p1') is place
+        assert tree.symbols.lookup('t1') is transition
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
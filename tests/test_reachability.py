@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+#
+# Tests for reachability.py module
+#
+
+
+"""Tests for reachability.py module"""
+
+
+# Standard packages
+import io
+import json
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.compilation import Compiler
+from src.parsing import Parser
+from src.reachability import (
+    ReachabilityExplorer, pack_marking, unpack_marking,
+)
+from src.tokenization import Lexer
+
+
+def compile_file(path: str):
+    """Return CompiledNet from file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        return Compiler().compile(Parser().parse(Lexer().tokenize_stream(f)))
+
+
+class TestReachabilityExplorer:
+    """Tests class for ReachabilityExplorer"""
+
+    @pytest.mark.parametrize('marking', [[0, 3, 255], [0, 256, 1], []])
+    def test_pack_marking(self, marking):
+        """Packed markings can be unpacked back"""
+        assert unpack_marking(pack_marking(marking), len(marking)) == marking
+
+    @pytest.mark.parametrize('order', ['bfs', 'dfs'])
+    def test_explore_finite_net(self, order):
+        """Every reachable marking is visited once"""
+        result = ReachabilityExplorer(
+            compile_file('docs/examples/shared_resources.pn'), order
+        ).explore()
+        assert result.complete
+        assert result.states == 8
+        assert result.edges == 14
+        assert result.deadlocks == 0
+        assert max(result.bounds) == 1
+
+    def test_explore_deadlocks(self):
+        """Dead markings are counted and reported"""
+        result = ReachabilityExplorer(compile_file('docs/examples/limited_net.pn')).explore()
+        assert result.complete
+        assert result.deadlocks == 1
+        assert result.get_statistics()['deadlock_examples'] == [
+            {'p1': 0, 'p2': 0, 'p3': 0, 'p4': 1}
+        ]
+
+    def test_limits_and_progress(self):
+        """Infinite nets stop at limits reporting progress"""
+        reports = []
+        result = ReachabilityExplorer(
+            compile_file('docs/examples/unlimited_producer_consumer.pn'),
+            max_states=300,
+            progress=lambda result: reports.append(result.states),
+            progress_interval=100
+        ).explore()
+        assert not result.complete
+        assert result.stop_reason == 'max_states'
+        assert reports == [100, 200, 300]
+
+    def test_export_graph(self):
+        """Kept graph is exported with every state and edge"""
+        result = ReachabilityExplorer(
+            compile_file('docs/examples/example_basic.pn'), keep_graph=True
+        ).explore()
+        stream = io.StringIO()
+        result.export_json(stream)
+        graph = json.loads(stream.getvalue())
+        assert graph['states'] == [[1, 0], [0, 2]]
+        assert graph['edges'] == [[0, 't1', 1]]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
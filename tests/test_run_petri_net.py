@@ -8,19 +8,52 @@
 
 
 # Standard packages
-## NOTE: this is empty for now
+import json
 
 # Installed packages
 import pytest
 
 # Local packages
-## NOTE: this is empty for now
+import run_petri_net
+from src.logger import QUIET
+from src.tracing import Trace
 
 
 class TestRunPetriNet:
     """Tests class for run_petri_net"""
 
-    ## TODO: WORK-IN-PROGRESS
+    def test_run_until_deadlock(self, tmp_path):
+        """Headless runs return the final marking"""
+        trace_path = str(tmp_path / 'run.trace')
+        with open('docs/examples/example_basic.pn', encoding='UTF-8') as f:
+            result = run_petri_net.run_petri_net(
+                f, delay=0, verbosity=QUIET, trace_path=trace_path, until_deadlock=True
+            )
+        assert result.reason == 'deadlock'
+        assert result.marking == {'p1': 0, 'p2': 2}
+        assert result.firing_counts == {'t1': 1}
+        assert json.loads(json.dumps(result.get_statistics()))['firings'] == result.firings
+        with open('docs/examples/example_basic.pn', encoding='UTF-8') as f:
+            net = run_petri_net.compile_petri_net(f)
+        trace = Trace(trace_path)
+        assert trace.marking == [1, 0]
+        assert [marking for _, marking in trace.replay(net)] == [[0, 2]]
+        trace.close()
+
+    def test_check(self, capsys):
+        """Checks print the firing sequence reaching a deadlock"""
+        with open('docs/examples/limited_net.pn', encoding='UTF-8') as f:
+            run_petri_net.check_petri_net(f)
+        statistics = json.loads(capsys.readouterr().out)
+        assert statistics['found']
+        assert statistics['sequence'] == ['t1', 't3', 't4']
+
+    def test_arguments(self):
+        """Bounds are given as flags"""
+        args = run_petri_net.parse_arguments(
+            ['net.pn', '--firings', '10', '--seconds', '1.5', '--until-deadlock']
+        )
+        assert (args.firings, args.seconds, args.until_deadlock) == (10, 1.5, True)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+#
+# Tests for scheduling.py module
+#
+
+
+"""Tests for scheduling.py module"""
+
+
+# Standard packages
+import itertools
+import time
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.parsing import Parser
+from src.scheduling import ThreadPoolScheduler
+from src.tokenization import Lexer
+import src.interpretation as interpretation
+
+
+class TestThreadPoolScheduler:
+    """Tests class for ThreadPoolScheduler"""
+
+    def test_pool_fires_transitions(self, monkeypatch):
+        """A fixed pool of workers fires every transition and keeps tokens"""
+        counter = itertools.count()
+        monkeypatch.setattr(
+            interpretation.ThreadedTransition, 'critical_section',
+            lambda self: next(counter)
+        )
+        with open('docs/examples/example_2.pn', encoding='UTF-8') as f:
+            tree = Parser().parse(Lexer().tokenize_stream(f))
+        interpreter = interpretation.Interpreter()
+        interpreter.interpret(tree)
+        scheduler = ThreadPoolScheduler(interpreter.transitions_references, 3)
+        scheduler.start()
+        time.sleep(0.2)
+        scheduler.stop()
+        assert len(scheduler.workers) == 3
+        assert next(counter) > 100
+        places = [interpreter.search_by_name(name) for name in ('p1', 'p3', 'p5')]
+        # p1 + p3 + p5 is kept by every firing of example 2
+        assert sum(place.count() for place in places) == 5
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+#
+# Tests for simulation.py module
+#
+
+
+"""Tests for simulation.py module"""
+
+
+# Standard packages
+## NOTE: this is empty for now
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.compilation import Compiler
+from src.parsing import Parser
+from src.simulation import (
+    PriorityPolicy, RandomPolicy, RoundRobinPolicy, TokenGameEngine,
+)
+from src.tokenization import Lexer
+
+
+def compile_file(path: str):
+    """Return CompiledNet from file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        return Compiler().compile(Parser().parse(Lexer().tokenize_stream(f)))
+
+
+class TestTokenGameEngine:
+    """Tests class for TokenGameEngine"""
+
+    def test_seeded_runs_are_reproducible(self):
+        """Same seed gives same firings and marking"""
+        net = compile_file('docs/examples/shared_resources.pn')
+        first = TokenGameEngine(net, RandomPolicy(7))
+        second = TokenGameEngine(net, RandomPolicy(7))
+        assert first.run(1000) == second.run(1000) == 1000
+        assert first.marking == second.marking
+        assert first.firing_counts == second.firing_counts
+
+    def test_run_until_deadlock(self):
+        """Run stops when no transition is enabled"""
+        engine = TokenGameEngine(compile_file('docs/examples/example_basic.pn'))
+        assert engine.run() == 1
+        assert engine.is_deadlocked()
+        assert engine.get_marking_dict() == {'p1': 0, 'p2': 2}
+
+    def test_enabled_set_is_kept_updated(self):
+        """Live enabled set matches a full check after every firing"""
+        net = compile_file('docs/examples/example_2.pn')
+        engine = TokenGameEngine(net, RandomPolicy(3))
+        for _ in range(200):
+            assert engine.get_enabled_transitions() == net.get_enabled_transitions(engine.marking)
+            engine.step()
+        engine.reset()
+        assert engine.marking == list(net.initial_marking)
+        assert engine.get_enabled_transitions() == net.get_enabled_transitions(engine.marking)
+
+    def test_round_robin_policy(self):
+        """Round robin cycles over enabled transitions"""
+        policy = RoundRobinPolicy()
+        assert [policy.select([0, 2, 3]) for _ in range(4)] == [0, 2, 3, 0]
+
+    def test_priority_policy(self):
+        """Priority policy prefers highest priority then lowest index"""
+        net = compile_file('docs/examples/example_2.pn')
+        policy = PriorityPolicy.from_names(net, {'t3': 5, 't4': 5})
+        assert policy.select([0, 1, 2, 3]) == 2
+        assert policy.select([0, 1]) == 0
+
+    def test_fire_disabled_transition(self):
+        """Firing a disabled transition raises exception"""
+        engine = TokenGameEngine(compile_file('docs/examples/example1_transitionL0.pn'))
+        with pytest.raises(Exception, match='t1: Resources not available'):
+            engine.fire(0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
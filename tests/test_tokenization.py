@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+#
+# Tests for tokenization.py module
+#
+
+
+"""Tests for tokenization.py module"""
+
+
+# Standard packages
+import io
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.token import AnnotationTokenTypes
+from src.tokenization import Lexer
+
+
+class TestLexer:
+    """Tests class for Lexer"""
+
+    def test_tokenize_annotation(self):
+        """Tokenize every kind of token skipping comments and whitespaces"""
+        tokens = Lexer().tokenize('# net\nP = {p1}\nA = {{p1, t12}=3}\nm0 = {m0(p1)=2}')
+        assert [(token.ttype, token.tvalue) for token in tokens] == [
+            (AnnotationTokenTypes.PLACES, 'P'),
+            (AnnotationTokenTypes.EQUAL, '='),
+            (AnnotationTokenTypes.LBRACE, '{'),
+            (AnnotationTokenTypes.PLACE, 'p1'),
+            (AnnotationTokenTypes.RBRACE, '}'),
+            (AnnotationTokenTypes.AWN, 'A'),
+            (AnnotationTokenTypes.EQUAL, '='),
+            (AnnotationTokenTypes.LBRACE, '{'),
+            (AnnotationTokenTypes.LBRACE, '{'),
+            (AnnotationTokenTypes.PLACE, 'p1'),
+            (AnnotationTokenTypes.COMMA, ','),
+            (AnnotationTokenTypes.TRANSITION, 't12'),
+            (AnnotationTokenTypes.RBRACE, '}'),
+            (AnnotationTokenTypes.EQUAL, '='),
+            (AnnotationTokenTypes.NUMBER, 3),
+            (AnnotationTokenTypes.RBRACE, '}'),
+            (AnnotationTokenTypes.MOMENT_ZERO, 'M0'),
+            (AnnotationTokenTypes.EQUAL, '='),
+            (AnnotationTokenTypes.LBRACE, '{'),
+            (AnnotationTokenTypes.MOMENT_ZERO, 'M0'),
+            (AnnotationTokenTypes.LPAREN, '('),
+            (AnnotationTokenTypes.PLACE, 'p1'),
+            (AnnotationTokenTypes.RPAREN, '('),
+            (AnnotationTokenTypes.EQUAL, '='),
+            (AnnotationTokenTypes.NUMBER, 2),
+            (AnnotationTokenTypes.RBRACE, '}'),
+        ]
+
+    def test_comment_at_end_of_annotation(self):
+        """Comments without trailing new line are skipped"""
+        tokens = Lexer().tokenize('T = {t1} # last line')
+        assert [token.ttype for token in tokens][-1] is AnnotationTokenTypes.RBRACE
+
+    def test_invalid_syntax_reports_line_and_column(self):
+        """Invalid chars raise SyntaxError with its position"""
+        with pytest.raises(SyntaxError, match='line 2, column 9'):
+            Lexer().tokenize('P = {p1}\nT = {t1 x}')
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 5, 1024])
+    def test_tokenize_stream_matches_tokenize(self, chunk_size):
+        """Streaming by chunks yields the same tokens as tokenizing whole text"""
+        with open('docs/examples/producer_consumer.pn', encoding='UTF-8') as f:
+            annotation = f.read()
+        expected = [(t.ttype, t.tvalue) for t in Lexer().tokenize(annotation)]
+        for stream in (io.StringIO(annotation), io.BytesIO(annotation.encode())):
+            tokens = Lexer().tokenize_stream(stream, chunk_size)
+            assert [(t.ttype, t.tvalue) for t in tokens] == expected
+
+    def test_tokenize_stream_reports_line_and_column(self):
+        """Streaming errors report position inside the whole annotation"""
+        stream = io.StringIO('P = {p1}\nT = {t1 x}')
+        with pytest.raises(SyntaxError, match='line 2, column 9'):
+            list(Lexer().tokenize_stream(stream, 3))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+#
+# Tests for tracing.py module
+#
+
+
+"""Tests for tracing.py module"""
+
+
+# Standard packages
+import io
+import json
+import threading
+
+# Installed packages
+import pytest
+
+# Local packages
+from src.compilation import Compiler
+from src.interpretation import Interpreter
+from src.parsing import Parser
+from src.scheduling import ThreadPoolScheduler
+from src.tokenization import Lexer
+from src.tracing import HEADER, RECORD, Trace, TraceRecorder
+
+
+def parse_file(path: str):
+    """Return Petri net ast from file at PATH"""
+    with open(path, encoding='UTF-8') as f:
+        return Parser().parse(Lexer().tokenize_stream(f))
+
+
+class TestTraceRecorder:
+    """Tests class for TraceRecorder and Trace"""
+
+    def test_replay_threaded_run(self, tmp_path):
+        """Replaying a trace reproduces the marking of a threaded run"""
+        tree = parse_file('docs/examples/example_2.pn')
+        recorder = TraceRecorder()
+        interpreter = Interpreter(recorder=recorder)
+        interpreter.interpret(tree)
+        scheduler = ThreadPoolScheduler(interpreter.transitions_references, 3)
+        scheduler.start()
+        threading.Event().wait(0.2)
+        scheduler.stop()
+        recorder.save(tmp_path / 'run.trace')
+        trace = Trace(tmp_path / 'run.trace')
+        assert len(trace) == recorder.get_count() > 0
+        net = Compiler().compile(tree)
+        for _, marking in trace.replay(net):
+            pass
+        assert marking == [place.count() for place in interpreter.places_references]
+        trace.close()
+
+    def test_replay_overwritten_run(self, tmp_path):
+        """Runs longer than the recorder replay from the saved marking"""
+        tree = parse_file('docs/examples/example_2.pn')
+        net = Compiler().compile(tree)
+        recorder = TraceRecorder(4)
+        interpreter = Interpreter(recorder=recorder)
+        interpreter.interpret(tree)
+        scheduler = ThreadPoolScheduler(interpreter.transitions_references, 3)
+        scheduler.start()
+        threading.Event().wait(0.2)
+        scheduler.stop()
+        final = [place.count() for place in interpreter.places_references]
+        recorder.save(tmp_path / 'run.trace', recorder.get_first_marking(net, final))
+        trace = Trace(tmp_path / 'run.trace')
+        assert trace.first > 0 and len(trace) == 4
+        for _, marking in trace.replay(net):
+            pass
+        assert marking == final
+        trace.close()
+
+    def test_ring_buffer_keeps_last_records(self, tmp_path):
+        """Oldest records are overwritten once capacity is reached"""
+        recorder = TraceRecorder(3)
+        assert recorder.capacity == 4
+        for transition in range(10):
+            recorder.record(transition)
+        assert [record[1] for record in recorder.get_records()] == [6, 7, 8, 9]
+        recorder.save(tmp_path / 'ring.trace')
+        trace = Trace(tmp_path / 'ring.trace')
+        assert trace.first == 6
+        with pytest.raises(Exception, match='lost its first 6 firings'):
+            next(trace.replay(None))
+        trace.close()
+
+    def test_count(self):
+        """Counting records does not skip positions"""
+        recorder = TraceRecorder(4)
+        assert recorder.get_count() == 0
+        for transition in range(3):
+            recorder.record(transition)
+        assert recorder.get_count() == 3
+        recorder.record(3)
+        assert recorder.get_count() == 4
+        assert [record[1] for record in recorder.get_records()] == [0, 1, 2, 3]
+
+    def test_flush(self):
+        """Flush appends new records and counts lost ones"""
+        recorder = TraceRecorder(4)
+        stream = io.BytesIO()
+        for transition in range(3):
+            recorder.record(transition)
+        assert recorder.flush(stream) == 0
+        for transition in range(6):
+            recorder.record(transition)
+        assert recorder.flush(stream) == 2
+        records = [record[1] for record in RECORD.iter_unpack(stream.getvalue()[HEADER.size:])]
+        assert records == [0, 1, 2, 2, 3, 4, 5]
+
+    def test_flushed_file(self, tmp_path):
+        """Flushed files are read as saved ones"""
+        recorder = TraceRecorder(4)
+        for transition in range(6):
+            recorder.record(transition)
+        with open(tmp_path / 'flushed.trace', 'wb') as f:
+            assert recorder.flush(f) == 2
+            recorder.record(6)
+            assert recorder.flush(f) == 0
+        trace = Trace(tmp_path / 'flushed.trace')
+        assert (trace.first, len(trace)) == (2, 5)
+        assert [record[1] for record in trace] == [2, 3, 4, 5, 6]
+        trace.close()
+
+    def test_flush_skips_records_being_written(self):
+        """Records still being written are flushed later"""
+        recorder = TraceRecorder(4)
+        for transition in range(3):
+            recorder.record(transition)
+        # Second record reserved but not written yet
+        recorder.stamps[1] = 0
+        stream = io.BytesIO()
+        recorder.flush(stream)
+        assert len(stream.getvalue()) == HEADER.size + RECORD.size
+        recorder.stamps[1] = 2
+        recorder.flush(stream)
+        records = [record[1] for record in RECORD.iter_unpack(stream.getvalue()[HEADER.size:])]
+        assert records == [0, 1, 2]
+
+    def test_export_ndjson(self, tmp_path):
+        """Records are exported as JSON lines naming transitions"""
+        tree = parse_file('docs/examples/example_basic.pn')
+        recorder = TraceRecorder()
+        interpreter = Interpreter(recorder=recorder)
+        interpreter.interpret(tree)
+        interpreter.search_by_name('t1').fire()
+        recorder.save(tmp_path / 'basic.trace')
+        trace = Trace(tmp_path / 'basic.trace')
+        stream = io.StringIO()
+        trace.export_ndjson(stream, Compiler().compile(tree))
+        trace.close()
+        record = json.loads(stream.getvalue())
+        assert record['transition'] == 't1'
+        assert record['thread'] == threading.get_ident()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])